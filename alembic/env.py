@@ -5,6 +5,9 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from app.database import Base, SQLALCHEMY_DATABASE_URL
+import app.models.models  # noqa: F401 - 모델을 Base.metadata 에 등록
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -14,11 +17,20 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# 접속 정보는 alembic.ini 대신 애플리케이션과 같은 환경 변수(.env)에서 읽음
+if SQLALCHEMY_DATABASE_URL:
+    config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL.replace("%", "%%"))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
+
+
+def include_name(name, type_, parent_names):
+    # 마이그레이션에서 직접 관리하는 SQLite FTS5 검색 테이블은 autogenerate 비교에서 제외
+    if type_ == "table" and name.startswith("products_fts"):
+        return False
+    return True
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -42,6 +54,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -65,7 +78,11 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            # SQLite 는 ALTER 제약이 있어 batch 모드로 테이블 재생성
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
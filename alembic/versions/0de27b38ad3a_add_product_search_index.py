@@ -0,0 +1,66 @@
+"""add product search index
+
+Revision ID: 0de27b38ad3a
+Revises: 7397e302d4a5
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0de27b38ad3a'
+down_revision: Union[str, None] = '7397e302d4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+
+    if dialect == 'postgresql':
+        op.create_index(
+            'ix_products_search',
+            'products',
+            [sa.text("to_tsvector('simple', name || ' ' || description)")],
+            postgresql_using='gin',
+        )
+    elif dialect == 'sqlite':
+        # products 를 content 로 사용하는 FTS5 색인 + 동기화 트리거
+        op.execute(
+            "CREATE VIRTUAL TABLE products_fts USING fts5("
+            "name, description, content='products', content_rowid='product_id')"
+        )
+        op.execute(
+            "CREATE TRIGGER products_fts_ai AFTER INSERT ON products BEGIN "
+            "INSERT INTO products_fts(rowid, name, description) "
+            "VALUES (new.product_id, new.name, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER products_fts_ad AFTER DELETE ON products BEGIN "
+            "INSERT INTO products_fts(products_fts, rowid, name, description) "
+            "VALUES ('delete', old.product_id, old.name, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER products_fts_au AFTER UPDATE ON products BEGIN "
+            "INSERT INTO products_fts(products_fts, rowid, name, description) "
+            "VALUES ('delete', old.product_id, old.name, old.description); "
+            "INSERT INTO products_fts(rowid, name, description) "
+            "VALUES (new.product_id, new.name, new.description); END"
+        )
+        op.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+
+    if dialect == 'postgresql':
+        op.drop_index('ix_products_search', table_name='products')
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS products_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS products_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS products_fts_ai")
+        op.execute("DROP TABLE IF EXISTS products_fts")
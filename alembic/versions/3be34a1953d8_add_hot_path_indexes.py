@@ -0,0 +1,53 @@
+"""add hot path indexes
+
+Revision ID: 3be34a1953d8
+Revises: caabccb4ff34
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3be34a1953d8'
+down_revision: Union[str, None] = 'caabccb4ff34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 물류사 지정 전(Received) 배송은 tracking_number 가 없으므로 NULL 허용
+    with op.batch_alter_table('deliveryinfo') as batch_op:
+        batch_op.alter_column('tracking_number', existing_type=sa.String(), nullable=True)
+
+    op.create_index('ix_address_city_town_village', 'address', ['city', 'town', 'village'])
+    op.create_index('ix_users_login_id', 'users', ['login_id'], unique=True)
+    op.create_index('ix_users_role_address_id', 'users', ['role', 'address_id'])
+    op.create_index('ix_products_user_id', 'products', ['user_id'])
+    op.create_index('ix_orders_customer_id', 'orders', ['customer_id'])
+    op.create_index('ix_orders_product_id', 'orders', ['product_id'])
+    op.create_index('ix_deliveryinfo_order_id', 'deliveryinfo', ['order_id'])
+    op.create_index('ix_deliveryinfo_logistic_id', 'deliveryinfo', ['logistic_id'])
+    op.create_index('ix_deliveryinfo_tracking_number', 'deliveryinfo', ['tracking_number'], unique=True)
+    op.create_index('ix_driverdeliveryinfo_driver_id', 'driverdeliveryinfo', ['driver_id'])
+    op.create_index('ix_driverdeliveryinfo_delivery_id', 'driverdeliveryinfo', ['delivery_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_driverdeliveryinfo_delivery_id', table_name='driverdeliveryinfo')
+    op.drop_index('ix_driverdeliveryinfo_driver_id', table_name='driverdeliveryinfo')
+    op.drop_index('ix_deliveryinfo_tracking_number', table_name='deliveryinfo')
+    op.drop_index('ix_deliveryinfo_logistic_id', table_name='deliveryinfo')
+    op.drop_index('ix_deliveryinfo_order_id', table_name='deliveryinfo')
+    op.drop_index('ix_orders_product_id', table_name='orders')
+    op.drop_index('ix_orders_customer_id', table_name='orders')
+    op.drop_index('ix_products_user_id', table_name='products')
+    op.drop_index('ix_users_role_address_id', table_name='users')
+    op.drop_index('ix_users_login_id', table_name='users')
+    op.drop_index('ix_address_city_town_village', table_name='address')
+
+    with op.batch_alter_table('deliveryinfo') as batch_op:
+        batch_op.alter_column('tracking_number', existing_type=sa.String(), nullable=False)
@@ -0,0 +1,28 @@
+"""add deliveryinfo version
+
+Revision ID: 51156a7041db
+Revises: 0de27b38ad3a
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '51156a7041db'
+down_revision: Union[str, None] = '0de27b38ad3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 행은 server_default 로 version = 1 에서 시작
+    op.add_column('deliveryinfo', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('deliveryinfo') as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,33 @@
+"""add tracking number counter
+
+Revision ID: 7397e302d4a5
+Revises: 3be34a1953d8
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7397e302d4a5'
+down_revision: Union[str, None] = '3be34a1953d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    counter = op.create_table(
+        'tracking_number_counter',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('next_serial', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # 기존 6자리 난수 번호와 겹치지 않는 7자리 일련번호부터 발급
+    op.bulk_insert(counter, [{'id': 1, 'next_serial': 1000000}])
+
+
+def downgrade() -> None:
+    op.drop_table('tracking_number_counter')
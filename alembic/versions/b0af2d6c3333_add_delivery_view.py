@@ -0,0 +1,73 @@
+"""add delivery view
+
+Revision ID: b0af2d6c3333
+Revises: ac96b642b417
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b0af2d6c3333'
+down_revision: Union[str, None] = 'ac96b642b417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'delivery_view',
+        sa.Column('delivery_id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('seller_id', sa.Integer(), nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('logistic_id', sa.Integer(), nullable=True),
+        sa.Column('driver_id', sa.Integer(), nullable=True),
+        sa.Column('tracking_number', sa.String(), nullable=True),
+        sa.Column('delivery_status', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('product_name', sa.String(), nullable=False),
+        sa.Column('product_description', sa.String(), nullable=False),
+        sa.Column('product_price', sa.Integer(), nullable=False),
+        sa.Column('customer_name', sa.String(), nullable=False),
+        sa.Column('customer_phone', sa.String(length=15), nullable=False),
+        sa.Column('address_id', sa.Integer(), nullable=False),
+        sa.Column('city', sa.String(), nullable=True),
+        sa.Column('town', sa.String(), nullable=True),
+        sa.Column('village', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('delivery_id'),
+    )
+
+    # 기존 배송 정보 backfill (인덱스는 적재 후 생성)
+    op.execute(
+        "INSERT INTO delivery_view ("
+        "delivery_id, order_id, seller_id, customer_id, logistic_id, driver_id, tracking_number, "
+        "delivery_status, version, product_id, product_name, product_description, product_price, "
+        "customer_name, customer_phone, address_id, city, town, village) "
+        "SELECT d.delivery_id, d.order_id, p.user_id, o.customer_id, d.logistic_id, d.driver_id, d.tracking_number, "
+        "d.delivery_status, d.version, p.product_id, p.name, p.description, p.price, "
+        "u.name, u.phone_number, d.delivery_address, a.city, a.town, a.village "
+        "FROM deliveryinfo d "
+        "JOIN orders o ON o.order_id = d.order_id "
+        "JOIN products p ON p.product_id = o.product_id "
+        "JOIN users u ON u.user_id = o.customer_id "
+        "LEFT OUTER JOIN address a ON a.address_id = d.delivery_address"
+    )
+
+    op.create_index('ix_delivery_view_driver', 'delivery_view', ['driver_id', 'delivery_status', 'delivery_id'])
+    op.create_index('ix_delivery_view_logistic_city', 'delivery_view', ['logistic_id', 'city', 'delivery_id'])
+    op.create_index('ix_delivery_view_logistic_summary', 'delivery_view', ['logistic_id', 'city', 'delivery_status'])
+    op.create_index('ix_delivery_view_seller', 'delivery_view', ['seller_id', 'order_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_delivery_view_seller', table_name='delivery_view')
+    op.drop_index('ix_delivery_view_logistic_summary', table_name='delivery_view')
+    op.drop_index('ix_delivery_view_logistic_city', table_name='delivery_view')
+    op.drop_index('ix_delivery_view_driver', table_name='delivery_view')
+    op.drop_table('delivery_view')
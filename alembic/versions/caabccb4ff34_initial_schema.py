@@ -0,0 +1,116 @@
+"""initial schema
+
+기존 운영 DB 에는 이미 테이블이 있으므로 `alembic stamp caabccb4ff34` 후 upgrade 한다.
+
+Revision ID: caabccb4ff34
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'caabccb4ff34'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'address',
+        sa.Column('address_id', sa.Integer(), nullable=False),
+        sa.Column('city', sa.String(), nullable=False),
+        sa.Column('town', sa.String(), nullable=False),
+        sa.Column('village', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('address_id'),
+    )
+    op.create_index('ix_address_address_id', 'address', ['address_id'])
+
+    op.create_table(
+        'users',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('phone_number', sa.String(length=15), nullable=False),
+        sa.Column('role', sa.String(), nullable=False),
+        sa.Column('address_id', sa.Integer(), nullable=False),
+        sa.Column('login_id', sa.String(), nullable=False),
+        sa.Column('password', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['address_id'], ['address.address_id']),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index('ix_users_user_id', 'users', ['user_id'])
+
+    op.create_table(
+        'products',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=False),
+        sa.Column('price', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    op.create_index('ix_products_product_id', 'products', ['product_id'])
+
+    op.create_table(
+        'orders',
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('logistic_id', sa.Integer(), nullable=True),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('address_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['address_id'], ['address.address_id']),
+        sa.ForeignKeyConstraint(['customer_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['logistic_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['product_id'], ['products.product_id']),
+        sa.PrimaryKeyConstraint('order_id'),
+    )
+    op.create_index('ix_orders_order_id', 'orders', ['order_id'])
+
+    op.create_table(
+        'deliveryinfo',
+        sa.Column('delivery_id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('driver_id', sa.Integer(), nullable=True),
+        sa.Column('logistic_id', sa.Integer(), nullable=True),
+        sa.Column('tracking_number', sa.String(), nullable=False),
+        sa.Column('delivery_status', sa.String(), nullable=False),
+        sa.Column('delivery_address', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['delivery_address'], ['address.address_id']),
+        sa.ForeignKeyConstraint(['driver_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['logistic_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.order_id']),
+        sa.PrimaryKeyConstraint('delivery_id'),
+    )
+    op.create_index('ix_deliveryinfo_delivery_id', 'deliveryinfo', ['delivery_id'])
+
+    op.create_table(
+        'driverdeliveryinfo',
+        sa.Column('driver_id', sa.Integer(), nullable=False),
+        sa.Column('delivery_id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['delivery_id'], ['deliveryinfo.delivery_id']),
+        sa.ForeignKeyConstraint(['driver_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_driverdeliveryinfo_id', 'driverdeliveryinfo', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_driverdeliveryinfo_id', table_name='driverdeliveryinfo')
+    op.drop_table('driverdeliveryinfo')
+    op.drop_index('ix_deliveryinfo_delivery_id', table_name='deliveryinfo')
+    op.drop_table('deliveryinfo')
+    op.drop_index('ix_orders_order_id', table_name='orders')
+    op.drop_table('orders')
+    op.drop_index('ix_products_product_id', table_name='products')
+    op.drop_table('products')
+    op.drop_index('ix_users_user_id', table_name='users')
+    op.drop_table('users')
+    op.drop_index('ix_address_address_id', table_name='address')
+    op.drop_table('address')
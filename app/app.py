@@ -1,9 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
+from app.log import RequestLoggingMiddleware, setup_logging
+from app.outbox import OUTBOX_WORKER_ENABLED, outbox_worker
+from app.query_stats import QueryStatsMiddleware
 
-app = FastAPI()
+# JSON 구조화 로그 (큐 + 백그라운드 스레드로 출력)
+setup_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 아웃박스 워커를 API 프로세스 안에서 실행 (전용 프로세스로 돌릴 때는 OUTBOX_WORKER_ENABLED=false)
+    if OUTBOX_WORKER_ENABLED:
+        outbox_worker.start()
+    yield
+    await outbox_worker.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # React 빌드된 정적 파일 서빙
 app.mount("/static", StaticFiles(directory="build/static"), name="static")
@@ -24,4 +41,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # 허용할 HTTP 메서드 (GET, POST 등)
     allow_headers=["*"],  # 허용할 HTTP 헤더
-)
\ No newline at end of file
+)
+
+# 요청 id 부여 + 요청 로그 (샘플링)
+app.add_middleware(RequestLoggingMiddleware)
+
+# 요청별 SQL 실행 횟수 / DB 시간 계측 (Server-Timing 헤더 + /metrics)
+app.add_middleware(QueryStatsMiddleware)
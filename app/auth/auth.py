@@ -1,11 +1,19 @@
+import logging
+from typing import Optional
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordBearer
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool
+from app.cache import TTLCache
+from app.auth.password import password_pool, pwd_context
 from app.models.models import User
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.orm import Session, joinedload, object_session
+from app.database import SessionLocal, db_threadpool_slot
 from datetime import datetime, timedelta
+import os
+
+logger = logging.getLogger(__name__)
 
 # HTTPBearer를 사용하여 토큰 인증
 security = HTTPBearer()
@@ -17,41 +25,136 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# 토큰에서 user_id 추출
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+# 검증된 user_id -> role 캐시 (TTL 동안 DB 조회 생략)
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", "10000"))
+# true 이면 서명된 토큰의 클레임만 신뢰하고 DB 조회를 하지 않음
+AUTH_TRUST_TOKEN_CLAIMS = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() in ("1", "true", "yes")
+
+validated_users = TTLCache(maxsize=AUTH_CACHE_MAX_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+
+
+def invalidate_user(user_id: int):
+    validated_users.pop(user_id)
+
+
+def mark_user_changed(session: Session, user_id: int):
+    # commit 이후에 캐시에서 제거 (commit 전에 지우면 다른 요청이 이전 role 을 다시 캐시할 수 있음)
+    session.info.setdefault("auth_users_changed", set()).add(user_id)
+
+
+# ORM 으로 수정/삭제된 사용자는 자동으로 표시 (벌크 UPDATE/DELETE 는 mark_user_changed 를 직접 호출)
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_user_changed(session, target.user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_users_on_commit(session):
+    for user_id in session.info.pop("auth_users_changed", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_user_changes(session):
+    session.info.pop("auth_users_changed", None)
+
+
+# 토큰 서명 검증 및 클레임 추출 (DB 세션 불필요)
+def get_token_claims(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     try:
         # JWT 디코드
         payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("user_id")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
-        
-        # DB에서 user_id 확인
-        user = db.query(User).filter(User.user_id == user_id).first()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
-        
-        return user_id
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
 
-    
+    if payload.get("user_id") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials"
+        )
+    return payload
+
+
+# DB 에서 사용자 role 조회 (캐시 miss 시에만 호출, 세션은 조회 직후 반환)
+def _load_user_role(user_id: int) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        user = db.query(User.role).filter(User.user_id == user_id).first()
+        return user.role if user else None
+    finally:
+        db.close()
+
+
+# 토큰의 사용자가 아직 존재하고 role 이 같은지 확인 (검증 결과는 TTL 동안 캐시)
+async def validate_token_user(claims: dict) -> int:
+    user_id: int = claims["user_id"]
+
+    # 서명 검증만으로 인증 (DB 커넥션 불필요)
+    if AUTH_TRUST_TOKEN_CLAIMS:
+        return user_id
+
+    token_role = claims.get("role")
+
+    # 최근 검증된 사용자는 DB 조회 생략
+    cached_role = validated_users.get(user_id)
+    if cached_role is not None and (token_role is None or token_role == cached_role):
+        return user_id
+
+    # DB에서 user_id 확인
+    async with db_threadpool_slot():
+        role = await run_in_threadpool(_load_user_role, user_id)
+    if role is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+
+    # 토큰 발급 이후 role 이 바뀐 경우 재로그인 필요
+    if token_role is not None and token_role != role:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token role is outdated"
+        )
+
+    validated_users.set(user_id, role)
+    return user_id
+
 
-# 비밀번호 해싱 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 토큰에서 user_id 추출
+async def get_current_user(claims: dict = Depends(get_token_claims)) -> int:
+    return await validate_token_user(claims)
 
-# 비밀번호 해싱
-def get_password_hash(password):
-    return pwd_context.hash(password)
+
+# 토큰의 role 클레임으로 권한 확인 후 사용자 검증 (권한이 없는 요청은 DB 조회 없이 거절)
+def require_role(*roles: str):
+    async def role_guard(claims: dict = Depends(get_token_claims)) -> int:
+        role = claims.get("role")
+        if role is None:
+            # role 클레임이 없는 이전 토큰
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has no role claim, please log in again"
+            )
+        if role not in roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient role for this operation"
+            )
+        return await validate_token_user(claims)
+
+    return role_guard
+
+
+# 비밀번호 해싱 (bcrypt 연산은 전용 워커 풀에서 수행)
+async def get_password_hash(password):
+    return await password_pool.hash(password)
 
 # 비밀번호 검증
 def verify_password(plain_password, hashed_password):
@@ -59,9 +162,25 @@ def verify_password(plain_password, hashed_password):
 
 
 
-# 사용자 조회
+# 사용자 조회 (토큰 클레임에 필요한 주소 정보까지 함께 로드)
 def get_user(db: Session, login_id: str):
-    return db.query(User).filter(User.login_id == login_id).first()
+    return (
+        db.query(User)
+        .options(joinedload(User.user_address))
+        .filter(User.login_id == login_id)
+        .first()
+    )
+
+# 토큰에 담을 사용자 클레임
+def build_user_claims(user: User) -> dict:
+    claims = {
+        "user_id": user.user_id,
+        "role": user.role,
+        "address_id": user.address_id
+    }
+    if user.user_address is not None:
+        claims["city"] = user.user_address.city
+    return claims
 
 # JWT 생성
 def create_access_token(data: dict):
@@ -70,9 +189,29 @@ def create_access_token(data: dict):
     to_encode.update({"exp": expire})  # 만료 시간 추가
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# 로그인 시 cost 가 바뀐 비밀번호 해시 갱신
+def update_password_hash(db: Session, user_id: int, hashed_password: str):
+    try:
+        db.query(User).filter(User.user_id == user_id).update({User.password: hashed_password})
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to update password hash")
+
 # 사용자 인증
-def authenticate_user(db: Session, login_id: str, password: str):
-    user = get_user(db, login_id)
-    if not user or not verify_password(password, user.password):
+async def authenticate_user(db: Session, login_id: str, password: str):
+    user = await run_in_threadpool(get_user, db, login_id)
+    if not user:
         return None
+
+    # bcrypt 검증 동안 DB 커넥션을 점유하지 않도록 세션 반환 (로드된 user 는 그대로 사용 가능)
+    await run_in_threadpool(db.close)
+
+    verified, new_hash = await password_pool.verify_and_update(password, user.password)
+    if not verified:
+        return None
+
+    # 설정된 bcrypt cost 와 다른 해시는 로그인 성공 시 재해싱
+    if new_hash:
+        await run_in_threadpool(update_password_hash, db, user.user_id, new_hash)
     return user
\ No newline at end of file
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+# bcrypt cost factor: 값이 바뀌면 기존 해시는 로그인 시점에 새 cost 로 재해싱된다
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# 비밀번호 연산 전용 워커 풀 설정
+PASSWORD_POOL_KIND = os.getenv("PASSWORD_POOL_KIND", "thread")  # thread | process
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_POOL_MAX_PENDING = int(os.getenv("PASSWORD_POOL_MAX_PENDING", str(PASSWORD_POOL_WORKERS * 8)))
+
+# 비밀번호 해싱 설정 (min/max 를 고정하여 cost 가 다른 해시는 needs_update 대상이 됨)
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS
+)
+
+
+# 프로세스 풀에서도 pickle 가능하도록 모듈 레벨 함수로 정의
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, hashed_password)
+
+
+class PasswordPoolBusy(Exception):
+    """비밀번호 워커 풀의 대기열이 가득 찬 경우"""
+
+
+class PasswordHasherPool:
+    """bcrypt 연산을 요청 처리 스레드 밖의 전용 풀에서 수행
+
+    대기 중인 작업 수가 max_pending 을 넘으면 큐에 쌓지 않고 PasswordPoolBusy 를 발생시킨다.
+    """
+
+    def __init__(self, kind: str, workers: int, max_pending: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        # import 시점이 아닌 첫 사용 시점에 생성 (프로세스 풀의 불필요한 fork 방지)
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password")
+        return self._executor
+
+    def _release(self, _: Future):
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, fn, *args) -> "asyncio.Future":
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordPoolBusy()
+            self._pending += 1
+            executor = self._get_executor()
+
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._submit(_verify_and_update, password, hashed_password)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+password_pool = PasswordHasherPool(PASSWORD_POOL_KIND, PASSWORD_POOL_WORKERS, PASSWORD_POOL_MAX_PENDING)
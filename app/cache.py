@@ -0,0 +1,129 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """크기 제한(LRU)과 만료 시간(TTL)을 가진 스레드 안전 인메모리 캐시
+
+    프로세스 단위 캐시이므로 다른 워커의 변경은 TTL 이 지나야 반영된다.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(ABC):
+    """직렬화된 bytes 값을 저장하는 캐시 백엔드 인터페이스
+
+    여러 워커가 같은 캐시를 보려면 공유 백엔드(redis)를 사용한다.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float):
+        ...
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """프로세스 로컬 백엔드 (기본값, 공유 백엔드의 테스트용 대역으로도 사용)"""
+
+    def __init__(self, maxsize: int = 1024):
+        self._values = TTLCache(maxsize=maxsize, ttl=0)
+        # 카운터(버전)는 만료/LRU 제거 대상이 아니므로 별도로 보관
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._values.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._values.set(key, value, ttl=ttl)
+
+    def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            return value
+
+
+class RedisCacheBackend(CacheBackend):
+    """redis 공유 백엔드 (redis 패키지는 선택 의존성이므로 생성 시점에 import)"""
+
+    def __init__(self, url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self._client.set(key, value, px=max(int(ttl * 1000), 1))
+
+    def get_counter(self, key: str) -> int:
+        value = self._client.get(key)
+        return int(value) if value is not None else 0
+
+    def incr(self, key: str) -> int:
+        return int(self._client.incr(key))
+
+
+def create_cache_backend(kind: str, url: Optional[str] = None) -> CacheBackend:
+    if kind == "redis":
+        if not url:
+            raise ValueError("CACHE_URL is required for the redis cache backend")
+        return RedisCacheBackend(url)
+    if kind == "memory":
+        return InMemoryCacheBackend()
+    raise ValueError(f"Unknown cache backend: {kind}")
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import Integer, event, func, literal_column, or_, text
+from sqlalchemy.orm import Session, object_session
+
+from app.cache import create_cache_backend
+from app.metrics import Counter
+from app.models.models import Product
+
+# 상품 목록 응답 캐시 설정
+CATALOG_CACHE_ENABLED = os.getenv("CATALOG_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # memory | redis
+CACHE_URL = os.getenv("CACHE_URL")
+
+CATALOG_VERSION_KEY = "catalog:version"
+
+catalog_cache = create_cache_backend(CACHE_BACKEND, CACHE_URL)
+
+CATALOG_CACHE_REQUESTS = Counter(
+    "catalog_cache_requests_total",
+    "Product catalog response cache lookups",
+    ("result",)
+)
+
+
+def catalog_version() -> int:
+    return catalog_cache.get_counter(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version() -> int:
+    # 벌크 UPDATE/외부 적재 등 ORM 이벤트를 거치지 않는 변경 후에는 직접 호출
+    return catalog_cache.incr(CATALOG_VERSION_KEY)
+
+
+# 상품 변경은 flush 시점에 표시해 두고 commit 이 끝난 뒤 버전을 올림
+# (commit 전에 올리면 다른 요청이 이전 데이터를 새 버전으로 캐시할 수 있음)
+@event.listens_for(Product, "after_insert")
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+def _mark_catalog_dirty(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info["catalog_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_catalog_version_on_commit(session):
+    if session.info.pop("catalog_dirty", False):
+        bump_catalog_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_catalog_dirty(session):
+    session.info.pop("catalog_dirty", None)
+
+
+def serialize_catalog(payload: dict) -> Tuple[bytes, str]:
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # 강한 ETag: 응답 본문의 해시 (워커/재시작과 무관하게 같은 내용이면 같은 값)
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return body, etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # If-None-Match 는 약한 비교를 사용
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def get_cached_catalog(key: str, build: Callable) -> Optional[Tuple[bytes, str]]:
+    """key 에 해당하는 (본문, ETag) 를 캐시에서 찾고, 없으면 build() 로 생성하여 저장
+
+    build 가 None 을 반환하면 (예: 상품 없음) 캐시하지 않고 None 을 반환한다.
+    """
+    if not CATALOG_CACHE_ENABLED:
+        payload = await build()
+        return serialize_catalog(payload) if payload is not None else None
+
+    cache_key = f"catalog:{catalog_version()}:{key}"
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        CATALOG_CACHE_REQUESTS.inc(result="hit")
+        etag, body = cached.split(b"\n", 1)
+        return body, etag.decode()
+
+    CATALOG_CACHE_REQUESTS.inc(result="miss")
+    payload = await build()
+    if payload is None:
+        return None
+    body, etag = serialize_catalog(payload)
+    catalog_cache.set(cache_key, etag.encode() + b"\n" + body, ttl=CATALOG_CACHE_TTL_SECONDS)
+    return body, etag
+
+
+# ix_products_search 인덱스 식과 동일해야 PostgreSQL 이 GIN 인덱스를 사용함
+PRODUCT_SEARCH_DOCUMENT = func.to_tsvector(
+    literal_column("'simple'"),
+    Product.name.op("||")(literal_column("' '")).op("||")(Product.description)
+)
+
+# SQLite FTS5 검색 테이블(products_fts) 존재 여부 (프로세스 당 한 번 확인)
+_sqlite_fts_available: Optional[bool] = None
+
+
+async def sqlite_fts_available(db) -> bool:
+    global _sqlite_fts_available
+    if _sqlite_fts_available is None:
+        result = await db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'")
+        )
+        _sqlite_fts_available = result.first() is not None
+    return _sqlite_fts_available
+
+
+def product_search_condition(q: str, dialect_name: str, fts_available: bool = False):
+    """상품명/설명 검색 조건
+
+    PostgreSQL 은 tsvector GIN 인덱스, SQLite 는 FTS5 테이블을 사용하고
+    둘 다 사용할 수 없으면 LIKE 부분 일치로 처리한다.
+    """
+    if dialect_name == "postgresql":
+        return PRODUCT_SEARCH_DOCUMENT.op("@@")(func.plainto_tsquery(literal_column("'simple'"), q))
+
+    if dialect_name == "sqlite" and fts_available:
+        # 각 단어를 따옴표로 감싸 FTS5 쿼리 문법(AND/OR/NEAR, * 등)으로 해석되지 않게 함
+        match = " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+        return Product.product_id.in_(
+            text("SELECT rowid FROM products_fts WHERE products_fts MATCH :fts_query")
+            .bindparams(fts_query=match)
+            .columns(rowid=Integer)
+        )
+
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{escaped}%"
+    return or_(
+        Product.name.ilike(pattern, escape="\\"),
+        Product.description.ilike(pattern, escape="\\")
+    )
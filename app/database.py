@@ -1,22 +1,236 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+from typing import Any
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+from app.metrics import Counter, Gauge, Histogram
+import asyncio
 import os
+import time
+import weakref
 
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL")
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# asyncio 모드: true 이면 async 라우터가 AsyncSession(asyncpg / aiosqlite)을 사용
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "false").lower() in ("1", "true", "yes")
+
+# 비동기 드라이버 (URL 에 드라이버가 명시되지 않은 경우 사용)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    return str(parsed.set(drivername=ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)))
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+# 커넥션 풀 설정 (워커 수 x (pool_size + max_overflow) 가 Postgres max_connections 를 넘지 않도록 조정)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", "true")
+
+# 이벤트 루프에서 스레드풀로 넘기는 DB 작업(ThreadedSession, 사용자 검증)이 동시에 점유하는 커넥션 상한
+# 스레드가 모두 커넥션을 기다리며 막히면 커넥션을 쥔 채 스레드를 기다리는 요청과 교착되므로 루프에서 대기시키고,
+# 스레드 안에서 끝나는 sync 라우트 몫으로 최소 1개는 남긴다 (SQLite 기본 풀도 5 + 10)
+DB_THREADPOOL_SLOTS = max(DB_POOL_SIZE + DB_MAX_OVERFLOW - 1, 1)
+
+# 커넥션 풀 메트릭
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled connection", ["pool"]
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Connection checkouts that hit pool_timeout", ["pool"]
+)
+
+
+class _TimedCheckoutMixin:
+    metrics_label = ""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(pool=self.metrics_label)
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start, pool=self.metrics_label)
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def _engine_options(url: str, poolclass) -> dict:
+    # SQLite 는 드라이버 기본 풀 사용 (pool_size 등 미지원)
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **_engine_options(SQLALCHEMY_DATABASE_URL, TimedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = None
+AsyncSessionLocal = None
+if DATABASE_ASYNC:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    SQLALCHEMY_ASYNC_DATABASE_URL = os.getenv("SQLALCHEMY_ASYNC_DATABASE_URL") or _to_async_url(SQLALCHEMY_DATABASE_URL)
+    async_engine = create_async_engine(
+        SQLALCHEMY_ASYNC_DATABASE_URL,
+        **_engine_options(SQLALCHEMY_ASYNC_DATABASE_URL, TimedAsyncAdaptedQueuePool)
+    )
+    AsyncSessionLocal = sessionmaker(
+        bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
 Base = declarative_base()
 
+
+def _pool_stats(pool_engine) -> dict:
+    pool = pool_engine.pool
+    return {
+        "size": pool.size() if hasattr(pool, "size") else 0,
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+        "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+    }
+
+
+def _collect_pool_stat(stat: str):
+    def collect() -> dict:
+        engines = {"sync": engine}
+        if async_engine is not None:
+            engines["async"] = async_engine.sync_engine
+        return {(label,): _pool_stats(pool_engine)[stat] for label, pool_engine in engines.items()}
+    return collect
+
+
+Gauge("db_pool_size", "Configured pool size", ["pool"], callback=_collect_pool_stat("size"))
+Gauge("db_pool_checked_out", "Connections currently checked out", ["pool"], callback=_collect_pool_stat("checked_out"))
+Gauge("db_pool_overflow", "Overflow connections currently open", ["pool"], callback=_collect_pool_stat("overflow"))
+
+
+# 이벤트 루프 별 DB_THREADPOOL_SLOTS 세마포어 (asyncio 객체는 생성한 루프에서만 사용 가능)
+_threadpool_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _threadpool_slot() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slots = _threadpool_slots.get(loop)
+    if slots is None:
+        slots = _threadpool_slots[loop] = asyncio.Semaphore(DB_THREADPOOL_SLOTS)
+    return slots
+
+
+@asynccontextmanager
+async def db_threadpool_slot():
+    """스레드풀에서 커넥션을 사용하는 동안 점유하는 슬롯 (빈 슬롯이 없으면 이벤트 루프에서 대기)"""
+    async with _threadpool_slot():
+        yield
+
+
+class ThreadedSession:
+    """동기 Session 을 AsyncSession 과 같은 await 인터페이스로 감싼 어댑터
+
+    DATABASE_ASYNC 가 꺼져 있을 때 async 라우터가 같은 코드로 동작하도록 각 호출을 스레드풀에서 실행한다.
+    트랜잭션 중에는 await 사이에도 커넥션을 쥐고 있으므로 첫 호출부터 close 까지 DB 슬롯 하나를 점유한다.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+        self._slot = None
+
+    async def _run(self, fn, *args):
+        if self._slot is None:
+            slot = _threadpool_slot()
+            await slot.acquire()
+            self._slot = slot
+        return await run_in_threadpool(fn, *args)
+
+    def _execute_buffered(self, statement, params=None):
+        # AsyncSession 과 동일하게 결과를 미리 버퍼링하여 이벤트 루프에서 커서 I/O 가 일어나지 않도록 함
+        return self.sync_session.execute(statement, params).freeze()()
+
+    async def execute(self, statement, params=None):
+        return await self._run(self._execute_buffered, statement, params)
+
+    async def scalar(self, statement, params=None):
+        return await self._run(self.sync_session.scalar, statement, params)
+
+    async def scalars(self, statement, params=None):
+        result = await self.execute(statement, params)
+        return result.scalars()
+
+    async def get(self, entity, ident):
+        return await self._run(self.sync_session.get, entity, ident)
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    async def flush(self):
+        await self._run(self.sync_session.flush)
+
+    async def commit(self):
+        await self._run(self.sync_session.commit)
+
+    async def rollback(self):
+        await self._run(self.sync_session.rollback)
+
+    async def close(self):
+        try:
+            await run_in_threadpool(self.sync_session.close)
+        finally:
+            if self._slot is not None:
+                self._slot.release()
+                self._slot = None
+
+
+# async 라우터의 세션 타입 (AsyncSession 또는 ThreadedSession)
+AsyncDBSession = Any
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
-        print("DB Connection Success")
-    except:
-        db.close()
\ No newline at end of file
+    finally:
+        # 성공/실패와 관계없이 세션을 닫아 커넥션을 풀에 반환
+        db.close()
+
+
+async def get_async_db():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = ThreadedSession(SessionLocal())
+        try:
+            yield db
+        finally:
+            await db.close()
@@ -0,0 +1,150 @@
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.delivery_view import sync_delivery_view
+from app.events import publish_delivery_changes
+from app.models.models import DeliveryInfo
+from app.outbox import enqueue_events, outbox_handler, outbox_worker
+from app.tracking import mark_tracking_status_changed
+
+# 배송 상태 값
+RECEIVED = "Received"      # 주문 생성
+PROCESSING = "Processing"  # 물류사 지정 + 운송장 발급
+SHIPPED = "Shipped"        # 운전자 배정
+DELIVERED = "Delivered"    # 배송 완료
+
+# 허용되는 상태 전이 (현재 상태 -> 다음 상태)
+TRANSITIONS: Dict[str, str] = {
+    RECEIVED: PROCESSING,
+    PROCESSING: SHIPPED,
+    SHIPPED: DELIVERED,
+}
+
+
+def _check_transition(from_status: str, to_status: str):
+    if TRANSITIONS.get(from_status) != to_status:
+        raise ValueError(f"Invalid delivery status transition: {from_status} -> {to_status}")
+
+
+DELIVERY_STATUS_CHANGED = "delivery_status_changed"
+
+
+def _record_changes(db: Session, rows, to_status: str):
+    # 목록 조회용 delivery_view 를 같은 트랜잭션에서 갱신
+    sync_delivery_view(db, [row.delivery_id for row in rows])
+    # commit 후 운송장 상태 캐시 무효화 예약
+    mark_tracking_status_changed(db, [row.tracking_number for row in rows])
+    # 변경 이벤트는 같은 트랜잭션에 아웃박스로 기록 (발행은 워커가 commit 이후 수행)
+    enqueue_events(db, DELIVERY_STATUS_CHANGED, [
+        (
+            f"delivery:{row.delivery_id}:v{row.version}",
+            {
+                "delivery_id": row.delivery_id,
+                "delivery_status": to_status,
+                "tracking_number": row.tracking_number,
+                "version": row.version
+            }
+        )
+        for row in rows
+    ])
+    db.info["delivery_status_changed"] = True
+
+
+def transition_deliveries(
+    db: Session,
+    delivery_ids: Iterable[int],
+    from_status: str,
+    to_status: str,
+    *conditions,
+    **values
+) -> List[int]:
+    """from_status 인 배송만 to_status 로 바꾸는 조건부 UPDATE 한 번 (행 잠금 없음)
+
+    conditions 는 추가 WHERE 조건, values 는 함께 변경할 컬럼이다.
+    실제로 전이된 delivery_id 목록을 반환하며, 커밋은 호출한 쪽에서 commit_transitions 로 수행한다.
+    """
+    _check_transition(from_status, to_status)
+    delivery_ids = list(delivery_ids)
+    if not delivery_ids:
+        return []
+
+    rows = db.execute(
+        update(DeliveryInfo)
+        .where(
+            DeliveryInfo.delivery_id.in_(delivery_ids),
+            DeliveryInfo.delivery_status == from_status,
+            *conditions
+        )
+        .values(delivery_status=to_status, version=DeliveryInfo.version + 1, **values)
+        .returning(DeliveryInfo.delivery_id, DeliveryInfo.tracking_number, DeliveryInfo.version)
+        .execution_options(synchronize_session=False)
+    ).all()
+
+    _record_changes(db, rows, to_status)
+    return [row.delivery_id for row in rows]
+
+
+def transition_delivery(
+    db: Session,
+    delivery_id: int,
+    from_status: str,
+    to_status: str,
+    *conditions,
+    expected_version: Optional[int] = None,
+    **values
+) -> int:
+    """단일 배송 상태 전이. 다른 요청이 먼저 바꿨으면 409 를 발생시키고, 성공 시 새 version 을 반환"""
+    _check_transition(from_status, to_status)
+    if expected_version is not None:
+        conditions = conditions + (DeliveryInfo.version == expected_version,)
+
+    row = db.execute(
+        update(DeliveryInfo)
+        .where(
+            DeliveryInfo.delivery_id == delivery_id,
+            DeliveryInfo.delivery_status == from_status,
+            *conditions
+        )
+        .values(delivery_status=to_status, version=DeliveryInfo.version + 1, **values)
+        .returning(DeliveryInfo.delivery_id, DeliveryInfo.tracking_number, DeliveryInfo.version)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Delivery {delivery_id} was modified concurrently or is no longer {from_status}"
+        )
+
+    _record_changes(db, [row], to_status)
+    return row.version
+
+
+def ensure_status(delivery_status: str, expected: str):
+    # 조건부 UPDATE 전에 명백히 잘못된 요청을 빠르게 거절 (최종 판정은 UPDATE 의 WHERE 절)
+    if delivery_status != expected:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Delivery status is {delivery_status}, expected {expected}"
+        )
+
+
+def commit_transitions(db: Session):
+    """commit 후 아웃박스 워커를 깨워 변경 이벤트를 바로 발행하게 함"""
+    changed = db.info.pop("delivery_status_changed", False)
+    db.commit()
+    if changed:
+        outbox_worker.notify()
+
+
+@outbox_handler(DELIVERY_STATUS_CHANGED)
+def _publish_delivery_status_changed(db: Session, payload: dict):
+    publish_delivery_changes(db, [payload])
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_delivery_status_changes(session):
+    session.info.pop("delivery_status_changed", None)
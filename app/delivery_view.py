@@ -0,0 +1,144 @@
+import json
+import sys
+from typing import Iterable
+
+from sqlalchemy import delete, func, insert, or_, select, update
+
+from app.models.models import Address, DeliveryInfo, DeliveryView, Order, Product, User
+
+# delivery_view 컬럼 (_source_select 와 같은 순서)
+VIEW_COLUMNS = tuple(column.name for column in DeliveryView.__table__.columns)
+
+# deliveryinfo 에서 바뀌는 컬럼 (상태 전이 시 동기화 대상)
+DELIVERY_COLUMNS = ("logistic_id", "driver_id", "tracking_number", "delivery_status", "version")
+
+# 정합성 검사 결과에 포함할 delivery_id 샘플 수
+CHECK_SAMPLE_SIZE = 100
+
+
+def _source_select():
+    # delivery_view 한 행을 만드는 live join (적재 / 정합성 검사에 공통 사용)
+    return (
+        select(
+            DeliveryInfo.delivery_id,
+            DeliveryInfo.order_id,
+            Product.user_id.label("seller_id"),
+            Order.customer_id,
+            DeliveryInfo.logistic_id,
+            DeliveryInfo.driver_id,
+            DeliveryInfo.tracking_number,
+            DeliveryInfo.delivery_status,
+            DeliveryInfo.version,
+            Product.product_id,
+            Product.name.label("product_name"),
+            Product.description.label("product_description"),
+            Product.price.label("product_price"),
+            User.name.label("customer_name"),
+            User.phone_number.label("customer_phone"),
+            DeliveryInfo.delivery_address.label("address_id"),
+            Address.city,
+            Address.town,
+            Address.village
+        )
+        .join(Order, Order.order_id == DeliveryInfo.order_id)
+        .join(Product, Product.product_id == Order.product_id)
+        .join(User, User.user_id == Order.customer_id)
+        .outerjoin(Address, Address.address_id == DeliveryInfo.delivery_address)
+    )
+
+
+def add_delivery_view_rows(db, order_ids: Iterable[int]):
+    """새 주문의 배송 정보를 INSERT ... SELECT 한 번으로 delivery_view 에 추가 (주문과 같은 트랜잭션)"""
+    order_ids = list(order_ids)
+    if order_ids:
+        db.execute(insert(DeliveryView).from_select(
+            VIEW_COLUMNS, _source_select().where(DeliveryInfo.order_id.in_(order_ids))
+        ))
+
+
+def sync_delivery_view(db, delivery_ids: Iterable[int]):
+    """상태 전이로 바뀐 deliveryinfo 컬럼을 UPDATE ... FROM 한 번으로 delivery_view 에 반영"""
+    delivery_ids = list(delivery_ids)
+    if delivery_ids:
+        db.execute(
+            update(DeliveryView)
+            .where(DeliveryView.delivery_id == DeliveryInfo.delivery_id, DeliveryInfo.delivery_id.in_(delivery_ids))
+            .values({column: getattr(DeliveryInfo, column) for column in DELIVERY_COLUMNS})
+            .execution_options(synchronize_session=False)
+        )
+
+
+def rebuild_delivery_view(db) -> int:
+    """delivery_view 전체를 live join 결과로 다시 적재하고 행 수를 반환 (커밋은 호출한 쪽에서 수행)"""
+    db.execute(delete(DeliveryView))
+    db.execute(insert(DeliveryView).from_select(VIEW_COLUMNS, _source_select()))
+    return db.execute(select(func.count()).select_from(DeliveryView)).scalar()
+
+
+def check_delivery_view(db, sample_size: int = CHECK_SAMPLE_SIZE) -> dict:
+    """delivery_view 와 live join 결과를 비교
+
+    missing: live join 에는 있지만 view 에 없는 배송
+    extra: view 에만 있는 배송
+    mismatched: 양쪽에 있지만 컬럼 값이 다른 배송
+    각 항목은 건수와 delivery_id 샘플을 담는다.
+    """
+    source = _source_select().subquery()
+    view = DeliveryView.__table__
+
+    checks = {
+        "missing": (
+            select(source.c.delivery_id)
+            .outerjoin(view, view.c.delivery_id == source.c.delivery_id)
+            .where(view.c.delivery_id.is_(None))
+        ),
+        "extra": (
+            select(view.c.delivery_id)
+            .outerjoin(source, source.c.delivery_id == view.c.delivery_id)
+            .where(source.c.delivery_id.is_(None))
+        ),
+        "mismatched": (
+            select(view.c.delivery_id)
+            .join(source, source.c.delivery_id == view.c.delivery_id)
+            .where(or_(*(view.c[column].is_distinct_from(source.c[column]) for column in VIEW_COLUMNS)))
+        ),
+    }
+
+    result = {"consistent": True}
+    for name, query in checks.items():
+        query = query.subquery()
+        count = db.execute(select(func.count()).select_from(query)).scalar()
+        sample = db.execute(select(query.c.delivery_id).order_by(query.c.delivery_id).limit(sample_size)).scalars().all()
+        result[name] = {"count": count, "delivery_ids": sample}
+        if count:
+            result["consistent"] = False
+    return result
+
+
+def main(argv=None):
+    # python -m app.delivery_view check | rebuild
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "check"
+    if command not in ("check", "rebuild"):
+        sys.exit("usage: python -m app.delivery_view [check|rebuild]")
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if command == "rebuild":
+            rows = rebuild_delivery_view(db)
+            db.commit()
+            print(json.dumps({"rebuilt": rows}))
+            return
+
+        result = check_delivery_view(db)
+        print(json.dumps(result, indent=2))
+        if not result["consistent"]:
+            sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
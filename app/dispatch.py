@@ -0,0 +1,42 @@
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def plan_dispatch(
+    deliveries: Iterable[Tuple[int, str]],
+    drivers: Iterable[Tuple[int, str]],
+    loads: Dict[int, int],
+    max_load: Optional[int] = None
+) -> Tuple[Dict[int, int], List[int]]:
+    """미배정 배송을 같은 도시의 driver 중 현재 배송 건수가 가장 적은 driver 에게 배정
+
+    deliveries: (delivery_id, city), drivers: (driver_id, city), loads: driver_id -> 진행 중인 배송 수.
+    도시별 (load, driver_id) 최소 힙을 만들어 배송 1건당 O(log K) 로 배정한다.
+    (delivery_id -> driver_id 배정 결과, 배정하지 못한 delivery_id 목록) 을 반환한다.
+    """
+    heaps: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    for driver_id, city in drivers:
+        heaps[city].append((loads.get(driver_id, 0), driver_id))
+    for heap in heaps.values():
+        heapq.heapify(heap)
+
+    assignments: Dict[int, int] = {}
+    unassigned: List[int] = []
+    for delivery_id, city in deliveries:
+        heap = heaps.get(city)
+        if not heap:
+            # 해당 도시에 driver 가 없음
+            unassigned.append(delivery_id)
+            continue
+
+        load, driver_id = heap[0]
+        if max_load is not None and load >= max_load:
+            # 도시의 모든 driver 가 상한에 도달
+            unassigned.append(delivery_id)
+            continue
+
+        assignments[delivery_id] = driver_id
+        heapq.heapreplace(heap, (load + 1, driver_id))
+
+    return assignments, unassigned
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.database import SQLALCHEMY_DATABASE_URL, engine
+from app.metrics import Counter, Gauge
+from app.models.models import DeliveryInfo, Order, Product
+
+# 배송 상태 변경 이벤트 설정
+EVENTS_BROKER = os.getenv("EVENTS_BROKER", "memory")  # memory | postgres
+EVENTS_PG_CHANNEL = os.getenv("EVENTS_PG_CHANNEL", "delivery_events")
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))  # 구독자 당 대기 이벤트 상한
+
+EVENTS_PUBLISHED = Counter("delivery_events_published_total", "Delivery status events published")
+EVENTS_DROPPED_SUBSCRIBERS = Counter(
+    "delivery_events_dropped_subscribers_total", "SSE subscribers disconnected because their queue was full"
+)
+
+
+class EventHub:
+    """user_id 별 구독 큐로 이벤트를 전달하는 프로세스 내 asyncio pub/sub
+
+    구독/해제는 이벤트 루프에서만, publish 는 어느 스레드에서나 호출할 수 있다.
+    """
+
+    def __init__(self, queue_size: int = EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int):
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def publish(self, event: dict):
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self._subscribers:
+            return
+        # 요청 처리 스레드(threadpool)에서도 안전하도록 이벤트 루프에서 전달
+        loop.call_soon_threadsafe(self.dispatch, event)
+
+    def dispatch(self, event: dict):
+        # 이벤트 루프에서 실행: 해당 주문의 고객과 판매자에게만 전달
+        recipients = {event.get("customer_id"), event.get("seller_id")}
+        for user_id in recipients:
+            for queue in list(self._subscribers.get(user_id, ())):
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # 처리가 밀린 구독자는 연결을 끊고 재접속 시 현재 상태를 다시 조회하게 함
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(None)
+                    EVENTS_DROPPED_SUBSCRIBERS.inc()
+
+
+class InProcessBroker:
+    """같은 프로세스의 구독자에게만 전달 (단일 워커 / 개발 환경)"""
+
+    def __init__(self, hub: EventHub):
+        self.hub = hub
+
+    def has_listeners(self) -> bool:
+        return self.hub.has_subscribers()
+
+    def publish(self, events: List[dict]):
+        for event in events:
+            self.hub.publish(event)
+
+    async def start(self):
+        pass
+
+
+class PostgresNotifyBroker:
+    """Postgres LISTEN/NOTIFY 로 모든 워커의 구독자에게 전달
+
+    LISTEN 은 asyncpg(선택 의존성) 전용 커넥션으로 첫 구독 시점에 시작한다.
+    """
+
+    def __init__(self, hub: EventHub, channel: str = EVENTS_PG_CHANNEL):
+        self.hub = hub
+        self.channel = channel
+        self._connection = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def has_listeners(self) -> bool:
+        # 다른 워커의 구독 여부는 알 수 없으므로 항상 발행
+        return True
+
+    def publish(self, events: List[dict]):
+        with engine.begin() as connection:
+            for event in events:
+                connection.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self.channel, "payload": json.dumps(event)}
+                )
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.hub.dispatch(json.loads(payload))
+
+    async def start(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+            import asyncpg
+
+            dsn = make_url(SQLALCHEMY_DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+            self._connection = await asyncpg.connect(dsn)
+            await self._connection.add_listener(self.channel, self._on_notify)
+
+
+def create_broker(kind: str, hub: EventHub):
+    if kind == "postgres":
+        return PostgresNotifyBroker(hub)
+    if kind == "memory":
+        return InProcessBroker(hub)
+    raise ValueError(f"Unknown events broker: {kind}")
+
+
+event_hub = EventHub()
+delivery_events = create_broker(EVENTS_BROKER, event_hub)
+
+Gauge(
+    "delivery_events_subscribers",
+    "Open delivery event (SSE) subscriptions in this process",
+    callback=lambda: {(): event_hub.subscriber_count}
+)
+
+
+def publish_delivery_changes(db: Session, changes: List[dict]):
+    """배송 상태 변경({delivery_id, delivery_status, tracking_number})을 주문의 고객/판매자에게 발행
+
+    구독자가 없으면 수신자 조회 쿼리도 실행하지 않는다.
+    """
+    if not changes or not delivery_events.has_listeners():
+        return
+
+    # 수신자(고객/판매자)는 상태 변경과 무관하게 고정이므로 발행 시점에 조회
+    recipients = {
+        row.delivery_id: row
+        for row in db.query(
+            DeliveryInfo.delivery_id,
+            DeliveryInfo.order_id,
+            Order.customer_id,
+            Product.user_id.label("seller_id")
+        )
+        .join(Order, Order.order_id == DeliveryInfo.order_id)
+        .join(Product, Product.product_id == Order.product_id)
+        .filter(DeliveryInfo.delivery_id.in_([change["delivery_id"] for change in changes]))
+        .all()
+    }
+
+    events = []
+    for change in changes:
+        row = recipients.get(change["delivery_id"])
+        if row is None:
+            continue
+        events.append({
+            "delivery_id": change["delivery_id"],
+            "order_id": row.order_id,
+            "tracking_number": change.get("tracking_number"),
+            "delivery_status": change["delivery_status"],
+            "customer_id": row.customer_id,
+            "seller_id": row.seller_id
+        })
+    delivery_events.publish(events)
+    EVENTS_PUBLISHED.inc(len(events))
@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+import os
+from typing import Callable, Iterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session
+
+from app.database import SessionLocal
+
+# 한 번에 DB 커서에서 가져오고 응답으로 내보내는 행 수
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _iter_rows(build_query: Callable[[Session], Query], batch_size: int) -> Iterator:
+    # 스트리밍은 핸들러가 반환된 뒤에 진행되므로 요청 세션과 별도의 세션을 사용
+    db = SessionLocal()
+    try:
+        # yield_per: 서버 사이드 커서로 batch_size 단위씩 읽어 메모리 사용량을 일정하게 유지
+        for row in build_query(db).yield_per(batch_size):
+            yield row
+    finally:
+        db.close()
+
+
+def _encode_rows(rows: Iterator, columns: Sequence[str], fmt: str, batch_size: int) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(columns)
+
+    pending = 0
+    for row in rows:
+        values = [getattr(row, column) for column in columns]
+        if writer:
+            writer.writerow(values)
+        else:
+            buffer.write(json.dumps(dict(zip(columns, values)), ensure_ascii=False))
+            buffer.write("\n")
+
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    remainder = buffer.getvalue()
+    if remainder:
+        yield remainder.encode("utf-8")
+
+
+def stream_export(
+    build_query: Callable[[Session], Query],
+    columns: Sequence[str],
+    fmt: str,
+    filename: str,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> StreamingResponse:
+    """build_query 의 결과를 NDJSON/CSV 로 배치 단위 스트리밍
+
+    build_query 는 세션을 받아 columns 와 같은 이름의 컬럼을 가진 Query 를 반환해야 한다.
+    """
+    rows = _iter_rows(build_query, batch_size)
+    return StreamingResponse(
+        _encode_rows(rows, columns, fmt, batch_size),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    )
@@ -0,0 +1,201 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.metrics import Counter
+
+# 로깅 설정
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# 성공(5xx 가 아닌) 요청 로그 샘플링 비율 (에러 / 느린 요청은 항상 기록)
+LOG_SUCCESS_SAMPLE_RATE = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", "0.01"))
+# route 별 샘플링 비율: "GET /customers/product_list=0.001,POST /customers/buy=1"
+LOG_ROUTE_SAMPLE_RATES = os.getenv("LOG_ROUTE_SAMPLE_RATES", "")
+LOG_SLOW_REQUEST_MS = float(os.getenv("LOG_SLOW_REQUEST_MS", "1000"))
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+LOG_RECORDS_DROPPED = Counter("log_records_dropped_total", "Log records dropped because the log queue was full")
+
+# LogRecord 기본 속성 (그 외 extra 로 전달된 값만 JSON 필드로 출력)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+# 현재 요청 정보 (request_id, method, path)
+_request_context: ContextVar[Optional[Dict[str, str]]] = ContextVar("request_context", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    context = _request_context.get()
+    return context["request_id"] if context else None
+
+
+def _parse_route_sample_rates(value: str) -> Dict[str, float]:
+    rates = {}
+    for item in value.split(","):
+        route, sep, rate = item.rpartition("=")
+        if sep and route.strip():
+            rates[route.strip()] = float(rate)
+    return rates
+
+
+ROUTE_SAMPLE_RATES = _parse_route_sample_rates(LOG_ROUTE_SAMPLE_RATES)
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 로그 (요청 처리 중이면 request_id / method / path 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        context = getattr(record, "request_context", None)
+        if context:
+            entry.update(context)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key != "request_context":
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+_traceback_formatter = logging.Formatter()
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """요청 스레드에서는 큐에 넣기만 하는 핸들러
+
+    큐에 maxsize 건 이상 쌓여 있으면 INFO 이하 레코드는 기다리지 않고 버린다.
+    WARNING 이상은 한도와 관계없이 넣으므로 에러 로그는 유실되지 않는다.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, maxsize: int):
+        super().__init__(log_queue)
+        self.maxsize = maxsize
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 요청 정보(ContextVar) / 메시지 인자 / traceback 은 요청 스레드에서 확정하여 넘김
+        # (app 로거의 유일한 핸들러이므로 레코드를 복사하지 않고 그대로 수정)
+        record.request_context = _request_context.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if record.levelno < logging.WARNING and self.queue.qsize() >= self.maxsize:
+            LOG_RECORDS_DROPPED.inc()
+            return
+        self.queue.put(record)
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging():
+    """app.* 로거를 큐 + 백그라운드 리스너 스레드(stdout JSON 출력)로 구성"""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    # 한도 확인은 핸들러에서 하므로 잠금 비용이 적은 SimpleQueue 사용
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)  # 종료 시 남은 로그 출력
+
+    app_logger = logging.getLogger("app")
+    app_logger.handlers = [NonBlockingQueueHandler(log_queue, LOG_QUEUE_SIZE)]
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.propagate = False
+
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return f"{scope['method']} {path}" if path else "unmatched"
+
+
+request_logger = logging.getLogger("app.request")
+
+
+class RequestLoggingMiddleware:
+    """요청 id 부여 + 요청 완료 로그를 남기는 ASGI 미들웨어
+
+    X-Request-ID 헤더가 있으면 그대로 사용하고 없으면 생성하여 응답 헤더로 돌려준다.
+    5xx / 느린 요청은 모두 기록하고, 나머지는 route 별 비율로 샘플링한다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._incoming_request_id(scope) or uuid.uuid4().hex
+        token = _request_context.set({"request_id": request_id, "method": scope["method"], "path": scope["path"]})
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            self._log(scope, status_code, (time.perf_counter() - start) * 1000)
+            _request_context.reset(token)
+
+    @staticmethod
+    def _incoming_request_id(scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                # 로그 오염 방지를 위해 길이 제한
+                return value.decode("latin-1")[:64] or None
+        return None
+
+    def _log(self, scope, status_code: int, duration_ms: float):
+        route = route_label(scope)
+        if status_code >= 500:
+            level = logging.ERROR
+        elif duration_ms >= LOG_SLOW_REQUEST_MS:
+            level = logging.WARNING
+        else:
+            if random.random() >= ROUTE_SAMPLE_RATES.get(route, LOG_SUCCESS_SAMPLE_RATE):
+                return
+            level = logging.INFO
+
+        if request_logger.isEnabledFor(level):
+            request_logger.log(level, "request", extra={
+                "route": route,
+                "status": status_code,
+                "duration_ms": round(duration_ms, 2)
+            })
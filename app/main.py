@@ -1,12 +1,14 @@
 from fastapi import FastAPI
 from app.app import app
-from app.routers import users, customers, seller, logistic, driver
+from app.routers import users, customers, seller, logistic, driver, metrics, events
 
 app.include_router(users.router)
 app.include_router(customers.router)
 app.include_router(seller.router)
 app.include_router(logistic.router)
 app.include_router(driver.router)
+app.include_router(metrics.router)
+app.include_router(events.router)
 
 @app.get("/")
 def root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Column, ForeignKey
+from sqlalchemy import JSON, BigInteger, DateTime, Integer, String, Column, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -15,6 +15,10 @@ class Address(Base):
     address_order = relationship("Order", back_populates="order_address")  # Order와의 관계 설정
     address_info = relationship("DeliveryInfo", back_populates="info_address")
 
+    __table_args__ = (
+        Index("ix_address_city_town_village", "city", "town", "village"),  # 주소 중복 확인 / 도시별 조회
+    )
+
 # User 테이블 정의
 class User(Base):
     __tablename__ = 'users'
@@ -24,7 +28,7 @@ class User(Base):
     phone_number = Column(String(15), nullable=False)
     role = Column(String, nullable=False)
     address_id = Column(Integer, ForeignKey("address.address_id"), nullable=False)  # 테이블 이름 수정
-    login_id = Column(String, nullable=False)
+    login_id = Column(String, nullable=False, unique=True, index=True)
     password = Column(String, nullable=False)
 
     user_address = relationship("Address", foreign_keys=[address_id], back_populates="address_user")  # Address와의 관계 설정
@@ -37,14 +41,18 @@ class User(Base):
     user_infologistic = relationship("DeliveryInfo", foreign_keys="DeliveryInfo.logistic_id", back_populates="infologistic_user")
     user_driver = relationship("DriverDeliveryInfo", back_populates="driver_user")
 
+    __table_args__ = (
+        Index("ix_users_role_address_id", "role", "address_id"),  # role 단독 조회도 선두 컬럼으로 처리
+    )
+
 # Order 테이블 정의
 class Order(Base):
     __tablename__ = 'orders'
 
     order_id = Column(Integer, primary_key=True, index=True)
-    customer_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    customer_id = Column(Integer, ForeignKey("users.user_id"), nullable=False, index=True)
     logistic_id = Column(Integer, ForeignKey("users.user_id"))
-    product_id = Column(Integer, ForeignKey("products.product_id"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.product_id"), nullable=False, index=True)
     address_id = Column(Integer, ForeignKey("address.address_id"), nullable=False)  # 주소 ID로 수정
 
     order_customer = relationship("User", foreign_keys=[customer_id], back_populates="customer_order")
@@ -58,7 +66,7 @@ class Product(Base):
     __tablename__ = 'products'
 
     product_id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.user_id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     description = Column(String, nullable=False)
     price = Column(Integer, nullable=False)
@@ -66,16 +74,26 @@ class Product(Base):
     product_user = relationship("User", foreign_keys=[user_id], back_populates="user_product")  # User와의 관계 설정
     product_order = relationship("Order", back_populates="order_product")
 
+    __table_args__ = (
+        # 상품명/설명 검색용 GIN 인덱스 (PostgreSQL 전용, SQLite 는 마이그레이션에서 FTS5 테이블 생성)
+        Index(
+            "ix_products_search",
+            text("to_tsvector('simple', name || ' ' || description)"),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+
 class DeliveryInfo(Base):
     __tablename__ = 'deliveryinfo'
 
     delivery_id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.order_id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.order_id"), nullable=False, index=True)
     driver_id = Column(Integer, ForeignKey("users.user_id"))
-    logistic_id = Column(Integer, ForeignKey("users.user_id"))
-    tracking_number = Column(String, nullable=False)
+    logistic_id = Column(Integer, ForeignKey("users.user_id"), index=True)
+    tracking_number = Column(String, unique=True, index=True)  # 물류사 지정 전에는 NULL
     delivery_status = Column(String, nullable=False)
     delivery_address = Column(Integer, ForeignKey("address.address_id"), nullable=False)
+    version = Column(Integer, nullable=False, server_default="1")  # 상태 전이마다 증가 (낙관적 동시성 제어)
 
     info_order = relationship("Order", foreign_keys=[order_id], back_populates="order_info")
     infodriver_user = relationship("User", foreign_keys=[driver_id], back_populates="user_infodriver")
@@ -88,9 +106,70 @@ class DeliveryInfo(Base):
 class DriverDeliveryInfo(Base):
     __tablename__ = "driverdeliveryinfo"
 
-    driver_id = Column(Integer, ForeignKey("users.user_id"), nullable=False)
-    delivery_id = Column(Integer, ForeignKey("deliveryinfo.delivery_id"), nullable=False)
+    driver_id = Column(Integer, ForeignKey("users.user_id"), nullable=False, index=True)
+    delivery_id = Column(Integer, ForeignKey("deliveryinfo.delivery_id"), nullable=False, index=True)
     id = Column(Integer, primary_key=True, index=True)
 
     driver_user = relationship("User", foreign_keys=[driver_id], back_populates="user_driver")
-    driver_interface = relationship("DeliveryInfo", foreign_keys=[delivery_id], back_populates="interface_driver")
\ No newline at end of file
+    driver_interface = relationship("DeliveryInfo", foreign_keys=[delivery_id], back_populates="interface_driver")
+
+
+# tracking number 블록 할당용 카운터 (단일 행)
+class TrackingNumberCounter(Base):
+    __tablename__ = "tracking_number_counter"
+
+    id = Column(Integer, primary_key=True)
+    next_serial = Column(BigInteger, nullable=False)  # 아직 어떤 워커에도 할당되지 않은 첫 번째 일련번호
+
+
+# 트랜잭션 아웃박스: 상태 변경과 같은 트랜잭션에 기록하고 백그라운드 워커가 처리
+class OutboxEvent(Base):
+    __tablename__ = "outbox"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    event_type = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    idempotency_key = Column(String, nullable=False, unique=True)  # 같은 이벤트의 중복 기록 방지
+    status = Column(String, nullable=False, server_default="pending")  # pending | done | failed
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(String)
+    created_at = Column(DateTime, nullable=False)
+    available_at = Column(DateTime, nullable=False)  # 재시도 대기(backoff) 중이면 미래 시각
+    processed_at = Column(DateTime)
+
+    __table_args__ = (
+        Index("ix_outbox_status_available_at", "status", "available_at"),  # 워커의 처리 대상 조회
+    )
+
+
+# 목록 조회용 비정규화 읽기 모델: deliveryinfo ⋈ orders ⋈ products/users ⋈ address 를 배송 1건당 1행으로 유지
+# (쓰기 경로에서 같은 트랜잭션으로 갱신, app/delivery_view.py 참고)
+class DeliveryView(Base):
+    __tablename__ = "delivery_view"
+
+    delivery_id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, nullable=False)
+    seller_id = Column(Integer, nullable=False)
+    customer_id = Column(Integer, nullable=False)
+    logistic_id = Column(Integer)
+    driver_id = Column(Integer)
+    tracking_number = Column(String)
+    delivery_status = Column(String, nullable=False)
+    version = Column(Integer, nullable=False)
+    product_id = Column(Integer, nullable=False)
+    product_name = Column(String, nullable=False)
+    product_description = Column(String, nullable=False)
+    product_price = Column(Integer, nullable=False)
+    customer_name = Column(String, nullable=False)
+    customer_phone = Column(String(15), nullable=False)
+    address_id = Column(Integer, nullable=False)
+    city = Column(String)
+    town = Column(String)
+    village = Column(String)
+
+    __table_args__ = (
+        Index("ix_delivery_view_driver", "driver_id", "delivery_status", "delivery_id"),  # 운전자 배송 목록
+        Index("ix_delivery_view_logistic_city", "logistic_id", "city", "delivery_id"),  # 물류사 도시별 목록
+        Index("ix_delivery_view_logistic_summary", "logistic_id", "city", "delivery_status"),  # 도시 / 상태별 집계 (covering)
+        Index("ix_delivery_view_seller", "seller_id", "order_id"),  # 판매자 주문 목록
+    )
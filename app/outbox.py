@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.database import SessionLocal
+from app.metrics import Counter, Histogram
+from app.models.models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+# 아웃박스 워커 설정
+OUTBOX_WORKER_ENABLED = os.getenv("OUTBOX_WORKER_ENABLED", "true").lower() in ("1", "true", "yes")
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1.0"))  # 깨우는 신호가 없을 때의 조회 간격
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "10"))
+OUTBOX_BACKOFF_BASE = float(os.getenv("OUTBOX_BACKOFF_BASE", "1.0"))
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "300"))
+# 처리 완료(done) 이벤트 보관 기간과 정리 주기 (failed 이벤트는 확인용으로 남김)
+OUTBOX_RETENTION_HOURS = float(os.getenv("OUTBOX_RETENTION_HOURS", "24"))
+OUTBOX_PRUNE_INTERVAL = float(os.getenv("OUTBOX_PRUNE_INTERVAL", "300"))
+OUTBOX_PRUNE_BATCH_SIZE = int(os.getenv("OUTBOX_PRUNE_BATCH_SIZE", "10000"))
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+OUTBOX_PROCESSED = Counter(
+    "outbox_events_processed_total", "Outbox events handled by the worker", ("event_type", "result")
+)
+OUTBOX_PRUNED = Counter("outbox_events_pruned_total", "Done outbox events deleted after the retention period")
+OUTBOX_LAG_SECONDS = Histogram(
+    "outbox_event_lag_seconds", "Time from outbox insert to successful handling", ("event_type",)
+)
+
+# event_type -> handler(db, payload) (at-least-once 로 호출되므로 handler 는 멱등이어야 함)
+_handlers: Dict[str, Callable[[Session, dict], None]] = {}
+
+
+def outbox_handler(event_type: str):
+    def register(handler: Callable[[Session, dict], None]):
+        _handlers[event_type] = handler
+        return handler
+    return register
+
+
+def enqueue_events(db: Session, event_type: str, events: Iterable[Tuple[str, dict]]):
+    """(idempotency_key, payload) 목록을 요청과 같은 트랜잭션에 multi-row INSERT 한 번으로 기록"""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "event_type": event_type,
+            "payload": payload,
+            "idempotency_key": idempotency_key,
+            "created_at": now,
+            "available_at": now
+        }
+        for idempotency_key, payload in events
+    ]
+    if rows:
+        db.execute(insert(OutboxEvent).values(rows))
+
+
+def _backoff_seconds(attempts: int) -> float:
+    return min(OUTBOX_BACKOFF_BASE * (2 ** (attempts - 1)), OUTBOX_BACKOFF_MAX)
+
+
+def drain_outbox(batch_size: int = OUTBOX_BATCH_SIZE) -> int:
+    """처리 대상 이벤트를 한 배치 처리하고 처리한 건수를 반환
+
+    PostgreSQL 에서는 FOR UPDATE SKIP LOCKED 로 여러 워커가 같은 행을 나눠 갖지 않는다.
+    실패한 이벤트는 지수 backoff 후 재시도하고, 최대 횟수를 넘으면 failed 로 남긴다.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        events = (
+            db.query(OutboxEvent)
+            .filter(OutboxEvent.status == PENDING, OutboxEvent.available_at <= now)
+            .order_by(OutboxEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for event in events:
+            handler = _handlers.get(event.event_type)
+            try:
+                if handler is None:
+                    raise LookupError(f"No outbox handler for {event.event_type}")
+                # 이벤트마다 savepoint: 한 이벤트의 실패가 같은 배치의 다른 이벤트에 영향을 주지 않음
+                with db.begin_nested():
+                    handler(db, event.payload)
+            except Exception as e:
+                event.attempts += 1
+                event.last_error = str(e)[:500]
+                if event.attempts >= OUTBOX_MAX_ATTEMPTS:
+                    event.status = FAILED
+                    event.processed_at = datetime.utcnow()
+                    OUTBOX_PROCESSED.inc(event_type=event.event_type, result="failed")
+                else:
+                    event.available_at = datetime.utcnow() + timedelta(seconds=_backoff_seconds(event.attempts))
+                    OUTBOX_PROCESSED.inc(event_type=event.event_type, result="retry")
+                logger.exception("Outbox event failed", extra={
+                    "event_type": event.event_type,
+                    "idempotency_key": event.idempotency_key,
+                    "attempts": event.attempts
+                })
+                continue
+
+            event.status = DONE
+            event.processed_at = datetime.utcnow()
+            OUTBOX_PROCESSED.inc(event_type=event.event_type, result="done")
+            OUTBOX_LAG_SECONDS.observe((event.processed_at - event.created_at).total_seconds(), event_type=event.event_type)
+
+        db.commit()
+        return len(events)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def prune_outbox(
+    retention_hours: float = OUTBOX_RETENTION_HOURS,
+    batch_size: int = OUTBOX_PRUNE_BATCH_SIZE
+) -> int:
+    """보관 기간이 지난 done 이벤트를 batch_size 건씩 나눠 삭제하고 삭제한 건수를 반환
+
+    배치마다 commit 하여 한 번에 큰 DELETE 로 테이블을 오래 잠그지 않는다.
+    """
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+    expired = (
+        select(OutboxEvent.id)
+        .where(OutboxEvent.status == DONE, OutboxEvent.processed_at < cutoff)
+        .limit(batch_size)
+    )
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            # DELETE ... LIMIT 은 DB 마다 지원이 달라 삭제할 id 를 먼저 조회
+            ids = db.execute(expired).scalars().all()
+            if not ids:
+                break
+            db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(ids)))
+            db.commit()
+            total += len(ids)
+            if len(ids) < batch_size:
+                break
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    if total:
+        OUTBOX_PRUNED.inc(total)
+    return total
+
+
+class OutboxWorker:
+    """아웃박스를 배치 단위로 처리하는 asyncio 백그라운드 작업
+
+    commit 직후 notify() 로 깨우면 바로 처리하고, 신호가 없으면 poll_interval 마다 조회한다.
+    prune_interval 마다 보관 기간이 지난 done 이벤트를 정리한다.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_interval: float = OUTBOX_POLL_INTERVAL,
+        prune_interval: float = OUTBOX_PRUNE_INTERVAL
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.prune_interval = prune_interval
+        self._last_prune = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self):
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def notify(self):
+        # 요청 처리 스레드에서도 호출 가능
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    async def _prune_if_due(self):
+        now = time.monotonic()
+        if now - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = now
+        try:
+            await run_in_threadpool(prune_outbox)
+        except Exception:
+            logger.exception("Outbox prune failed")
+
+    async def _run(self):
+        while True:
+            await self._prune_if_due()
+            # 처리 도중 들어온 신호를 놓치지 않도록 조회 전에 초기화
+            self._wakeup.clear()
+            try:
+                processed = await run_in_threadpool(drain_outbox, self.batch_size)
+            except Exception:
+                logger.exception("Outbox drain failed")
+                processed = 0
+
+            # 배치가 가득 찼으면 남은 이벤트를 바로 이어서 처리
+            if processed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+outbox_worker = OutboxWorker()
+
+
+def run_worker_forever():
+    # API 프로세스와 분리된 전용 워커 프로세스로 실행할 때 사용 (python -m app.outbox)
+    import app.delivery_status  # noqa: F401 - handler 등록
+    from app.log import setup_logging
+
+    setup_logging()
+    last_prune = 0.0
+    while True:
+        if time.monotonic() - last_prune >= OUTBOX_PRUNE_INTERVAL:
+            last_prune = time.monotonic()
+            try:
+                prune_outbox()
+            except Exception:
+                logger.exception("Outbox prune failed")
+        if drain_outbox() < OUTBOX_BATCH_SIZE:
+            time.sleep(OUTBOX_POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    # handler 가 등록되는 app.outbox 모듈의 함수로 실행 (__main__ 사본이 아닌)
+    from app.outbox import run_worker_forever as run_registered_worker
+
+    run_registered_worker()
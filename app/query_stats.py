@@ -0,0 +1,129 @@
+import logging
+import os
+import re
+import time
+from collections import Counter as CounterDict
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.log import route_label
+from app.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# 요청 단위 SQL 계측 설정
+SQL_STATS_ENABLED = os.getenv("SQL_STATS_ENABLED", "true").lower() in ("1", "true", "yes")
+# 한 요청에서 같은 문장 템플릿이 이 횟수를 넘으면 N+1 의심 경고 (0 이면 끔)
+SQL_REPEAT_WARN_THRESHOLD = int(os.getenv("SQL_REPEAT_WARN_THRESHOLD", "10"))
+
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per request", ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+)
+REQUEST_DB_SECONDS = Histogram("http_request_db_seconds", "Time spent in SQL per request", ("route",))
+REQUEST_SECONDS = Histogram("http_request_duration_seconds", "Request handling time", ("route",))
+REPEATED_STATEMENT_WARNINGS = Counter(
+    "db_repeated_statement_warnings_total", "Requests that repeated one SQL template above the threshold", ("route",)
+)
+
+_PARAM = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+_PARAM_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+_REPEATED_GROUPS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    # 파라미터 개수(IN 목록, multi-row VALUES)와 숫자 리터럴 차이를 무시한 문장 템플릿
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _PARAM_LIST.sub("(...)", normalized)
+    normalized = _REPEATED_GROUPS.sub("(...)", normalized)
+    return _NUMBER.sub("N", normalized)
+
+
+class RequestQueryStats:
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.statements = CounterDict()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.db_seconds += elapsed
+        self.statements[fingerprint(statement)] += 1
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.count} queries", '
+            f"app;dur={total_seconds * 1000:.2f}"
+        )
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+# 모든 Engine(동기 / async 의 sync_engine)의 커서 실행을 계측
+# 시작 시각은 실행마다 새로 만들어지는 context 에 저장 (실패한 문장의 값이 다음 문장으로 넘어가지 않음)
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_stats.get() is not None:
+        context.query_stats_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    start = getattr(context, "query_stats_start", None)
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+
+class QueryStatsMiddleware:
+    """요청마다 SQL 실행 횟수 / DB 시간 / 반복 문장을 집계하는 ASGI 미들웨어
+
+    Server-Timing 헤더로 응답에 싣고, route 별 히스토그램을 /metrics 로 노출한다.
+    sync 라우터는 threadpool 에서 실행되지만 ContextVar 가 복사되므로 같은 집계 객체에 기록된다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing(time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._observe(route_label(scope), stats, time.perf_counter() - start)
+
+    def _observe(self, route: str, stats: RequestQueryStats, elapsed: float):
+        REQUEST_DB_QUERIES.observe(stats.count, route=route)
+        REQUEST_DB_SECONDS.observe(stats.db_seconds, route=route)
+        REQUEST_SECONDS.observe(elapsed, route=route)
+
+        if SQL_REPEAT_WARN_THRESHOLD > 0 and stats.statements:
+            statement, repeats = stats.statements.most_common(1)[0]
+            if repeats > SQL_REPEAT_WARN_THRESHOLD:
+                REPEATED_STATEMENT_WARNINGS.inc(route=route)
+                logger.warning("Repeated SQL statement (possible N+1)", extra={
+                    "route": route,
+                    "repeats": repeats,
+                    "statement": statement[:200]
+                })
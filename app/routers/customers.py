@@ -1,11 +1,20 @@
+import logging
 from fastapi import APIRouter
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Query, Response, status
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 
-from app.auth.auth import get_current_user
-from ..database import get_db
+from app.auth.auth import get_token_claims, require_role
+from app.delivery_status import RECEIVED
+from app.delivery_view import add_delivery_view_rows
+from app.catalog import etag_matches, get_cached_catalog, product_search_condition, sqlite_fts_available
+from app.pagination import decode_cursor, encode_cursor
+from ..database import AsyncDBSession, engine, get_async_db, get_db
 from app.models.models import User, Address, Order, Product, DeliveryInfo
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(
@@ -16,36 +25,103 @@ router = APIRouter(
 class BoughtList(BaseModel):
     name: str
     phone_number: str
+    after_order_id: Optional[int] = None  # 이전 페이지의 마지막 order_id (keyset 커서)
+    limit: int = Field(default=50, ge=1, le=200)
+
+# 한 번의 일괄 구매로 생성할 수 있는 최대 주문 수
+MAX_BATCH_ORDERS = 100
+
+class BuyBatchItem(BaseModel):
+    product_id: int
+    quantity: int = Field(default=1, ge=1)
+
+class BuyBatchRequest(BaseModel):
+    items: List[BuyBatchItem]
 
 
 @router.get("/product_list")
-def get_product(db: Session = Depends(get_db)):
+async def get_product(
+    db: AsyncDBSession = Depends(get_async_db),
+    if_none_match: Optional[str] = Header(default=None),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    min_price: Optional[int] = Query(default=None, ge=0),
+    max_price: Optional[int] = Query(default=None, ge=0),
+    seller_id: Optional[int] = None,
+    q: Optional[str] = Query(default=None, max_length=100)
+):
     try:
-        products = db.query(Product).all()
-        if not products:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No products found")
-        # JSON 형식으로 데이터를 묶어서 반환
-        product_list = [
-            {
-                "product_id": product.product_id,
-                "name": product.name,
-                "description": product.description,
-                "price": product.price
+        # 커서: 이전 페이지 마지막 product_id
+        decoded = decode_cursor(cursor, 1)
+        after_product_id = decoded[0] if decoded else None
+        if after_product_id is not None and not isinstance(after_product_id, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        search = q.strip() if q else None
+        filtered = any(value is not None for value in (min_price, max_price, seller_id)) or bool(search)
+
+        async def build_catalog():
+            query = select(Product.product_id, Product.name, Product.description, Product.price)
+            if after_product_id is not None:
+                query = query.where(Product.product_id > after_product_id)
+            if min_price is not None:
+                query = query.where(Product.price >= min_price)
+            if max_price is not None:
+                query = query.where(Product.price <= max_price)
+            if seller_id is not None:
+                query = query.where(Product.user_id == seller_id)
+            if search:
+                dialect_name = engine.dialect.name
+                fts_available = dialect_name == "sqlite" and await sqlite_fts_available(db)
+                query = query.where(product_search_condition(search, dialect_name, fts_available))
+
+            # product_id 기준 keyset 페이지네이션 (다음 페이지 존재 여부 확인을 위해 limit + 1 개 조회)
+            result = await db.execute(query.order_by(Product.product_id).limit(limit + 1))
+            products = result.all()
+            # 필터 없이 첫 페이지가 비어 있는 경우에만 404 (필터 결과가 없으면 빈 목록)
+            if not products and cursor is None and not filtered:
+                return None
+            has_more = len(products) > limit
+            products = products[:limit]
+            # JSON 형식으로 데이터를 묶어서 반환
+            product_list = [
+                {
+                    "product_id": product.product_id,
+                    "name": product.name,
+                    "description": product.description,
+                    "price": product.price
+                }
+                for product in products
+            ]
+            return {
+                "products": product_list,
+                "next_cursor": encode_cursor([product_list[-1]["product_id"]]) if has_more else None
             }
-            for product in products
-        ]
-        return {"products": product_list}
+
+        # 직렬화된 응답 본문을 카탈로그 버전 단위로 캐시 (캐시 적중 시 DB 조회 없음)
+        cache_key = f"list:{limit}:{after_product_id}:{min_price}:{max_price}:{seller_id}:{search}"
+        cached = await get_cached_catalog(cache_key, build_catalog)
+        if cached is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No products found")
+
+        body, etag = cached
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
     
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception:
+        logger.exception("Unhandled exception")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 @router.get("/purchased_products")
-def get_purchased_products(db: Session = Depends(get_db), user_id: int = Depends(get_current_user)):
+async def get_purchased_products(user_id: int = Depends(require_role("CUSTOMER")), db: AsyncDBSession = Depends(get_async_db)):
     try:
         # 1. Order 테이블에서 user_id로 주문된 product_id 조회
-        orders = db.query(Order.product_id).filter(Order.customer_id == user_id).all()
+        result = await db.execute(select(Order.product_id).where(Order.customer_id == user_id))
+        orders = result.all()
         
         # 주문이 없을 경우 빈 리스트 반환
         if not orders:
@@ -55,7 +131,8 @@ def get_purchased_products(db: Session = Depends(get_db), user_id: int = Depends
         product_ids = [order.product_id for order in orders]
 
         # 3. Product 테이블에서 product_id로 관련 상품 정보 조회
-        products = db.query(Product).filter(Product.product_id.in_(product_ids)).all()
+        result = await db.execute(select(Product).where(Product.product_id.in_(product_ids)))
+        products = result.scalars().all()
 
         # 4. 응답 데이터 구성
         response = [
@@ -70,126 +147,225 @@ def get_purchased_products(db: Session = Depends(get_db), user_id: int = Depends
 
         return {"user_id": user_id, "purchased_products": response}
 
-    except Exception as e:
-        print(f"Error: {e}")
+    except Exception:
+        logger.exception("Unhandled exception")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-@router.post("/buy")
-def buy_product(product_id: int, db: Session = Depends(get_db), user_id: int = Depends(get_current_user)):
-    try:
-        # 고객 정보 조회 (user_id 확인)
-        customer = db.query(User).filter(User.user_id == user_id).first()
+def _resolve_address_id(db: Session, user_id: int, claims: dict) -> int:
+    # 배송 주소는 토큰 클레임에서 사용 (클레임이 없는 경우에만 User 조회)
+    address_id = claims.get("address_id")
+    if address_id is None:
+        customer = db.query(User.address_id).filter(User.user_id == user_id).first()
         if not customer:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized user")
+        address_id = customer.address_id
+
+    # 주소 ID가 없는 유저에 대한 처리
+    if not address_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User has no address")
+    return address_id
+
+
+def _add_order(db: Session, user_id: int, product_id: int, address_id: int) -> Order:
+    # 주문과 배송 정보를 관계로 묶어 같은 flush 에서 함께 INSERT
+    new_order = Order(
+        customer_id=user_id,
+        product_id=product_id,
+        address_id=address_id
+    )
+    new_delivery = DeliveryInfo(
+        info_order=new_order,
+        tracking_number=None,
+        delivery_status=RECEIVED,
+        delivery_address=address_id,
+        driver_id=None,
+        logistic_id=None
+    )
+    db.add(new_delivery)
+    return new_order
+
 
-        # 제품 정보 조회
-        product = db.query(Product).filter(Product.product_id == product_id).first()
+@router.post("/buy")
+def buy_product(
+    product_id: int,
+    user_id: int = Depends(require_role("CUSTOMER")),
+    claims: dict = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    try:
+        address_id = _resolve_address_id(db, user_id, claims)
+
+        # 제품 존재 여부 확인
+        product = db.query(Product.product_id).filter(Product.product_id == product_id).first()
         if not product:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
 
-        # 주소 ID가 없는 유저에 대한 처리
-        if not customer.address_id:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User has no address")
-
-        # 주문 생성
-        new_order = Order(
-            customer_id=user_id,
-            product_id=product_id,
-            address_id=customer.address_id
-        )
-        db.add(new_order)
-        db.commit()
-        db.refresh(new_order)
-
-        # DeliveryInfo 생성
-        new_delivery = DeliveryInfo(
-            order_id=new_order.order_id,
-            tracking_number=None,
-            delivery_status="Received",
-            delivery_address=new_order.address_id,
-            driver_id=None,
-            logistic_id=None
-        )
-        db.add(new_delivery)
+        # 주문 + DeliveryInfo 를 하나의 트랜잭션으로 생성 (PK 는 INSERT ... RETURNING 으로 수신)
+        new_order = _add_order(db, user_id, product_id, address_id)
+        db.flush()
+        order_id = new_order.order_id
+        add_delivery_view_rows(db, [order_id])
         db.commit()
-        db.refresh(new_delivery)
 
         return {
             "msg": "Order created successfully",
-            "order_id": new_order.order_id
+            "order_id": order_id
+        }
+
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception:
+        db.rollback()
+        logger.exception("Unhandled exception")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/buy_batch")
+def buy_products(
+    request: BuyBatchRequest,
+    user_id: int = Depends(require_role("CUSTOMER")),
+    claims: dict = Depends(get_token_claims),
+    db: Session = Depends(get_db)
+):
+    try:
+        if not request.items:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No items to buy")
+        if sum(item.quantity for item in request.items) > MAX_BATCH_ORDERS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many orders in one batch (max {MAX_BATCH_ORDERS})"
+            )
+
+        address_id = _resolve_address_id(db, user_id, claims)
+
+        # 모든 제품 존재 여부를 한 번의 쿼리로 확인
+        product_ids = {item.product_id for item in request.items}
+        found_ids = {
+            row.product_id
+            for row in db.query(Product.product_id).filter(Product.product_id.in_(product_ids)).all()
+        }
+        missing_ids = sorted(product_ids - found_ids)
+        if missing_ids:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Products not found: {missing_ids}")
+
+        # 주문을 multi-row INSERT ... RETURNING 한 번으로 생성
+        order_rows = [
+            {"customer_id": user_id, "product_id": item.product_id, "address_id": address_id}
+            for item in request.items
+            for _ in range(item.quantity)
+        ]
+        order_ids = sorted(db.execute(insert(Order).values(order_rows).returning(Order.order_id)).scalars().all())
+
+        # 배송 정보도 multi-row INSERT 한 번으로 생성 (같은 트랜잭션)
+        db.execute(insert(DeliveryInfo).values([
+            {
+                "order_id": order_id,
+                "tracking_number": None,
+                "delivery_status": RECEIVED,
+                "delivery_address": address_id
+            }
+            for order_id in order_ids
+        ]))
+        add_delivery_view_rows(db, order_ids)
+        db.commit()
+
+        return {
+            "msg": "Orders created successfully",
+            "order_ids": order_ids
         }
 
     except HTTPException as http_exc:
         raise http_exc
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except Exception:
+        db.rollback()
+        logger.exception("Unhandled exception")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 @router.post("/bought_list")
-def get_bought_list(bought: BoughtList, db: Session = Depends(get_db)):
+async def get_bought_list(bought: BoughtList, db: AsyncDBSession = Depends(get_async_db)):
     try:
         # Step 1: name과 phone_number를 이용해 User 테이블에서 user_id 조회
-        customer = db.query(User).filter(
-            User.name == bought.name,
-            User.phone_number == bought.phone_number
-        ).first()
+        result = await db.execute(
+            select(User.user_id, User.name, User.phone_number)
+            .where(User.name == bought.name, User.phone_number == bought.phone_number)
+            .limit(1)
+        )
+        customer = result.first()
         
         if not customer:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Customer not found")
         
-        # Step 2: user_id를 기준으로 Order 테이블에서 해당 고객의 주문 조회
-        orders = db.query(Order).filter(Order.customer_id == customer.user_id).all()
+        # Step 2: Order ⋈ Product ⋈ Address 를 한 번의 쿼리로 조회 (order_id 기준 keyset 페이지네이션)
+        query = (
+            select(
+                Order.order_id,
+                Product.name.label("product_name"),
+                Product.price.label("product_price"),
+                Address.city,
+                Address.town,
+                Address.village
+            )
+            .join(Product, Product.product_id == Order.product_id)
+            .join(Address, Address.address_id == Order.address_id)
+            .where(Order.customer_id == customer.user_id)
+        )
+        if bought.after_order_id is not None:
+            query = query.where(Order.order_id > bought.after_order_id)
+
+        # 다음 페이지 존재 여부 확인을 위해 limit + 1 개 조회
+        result = await db.execute(query.order_by(Order.order_id).limit(bought.limit + 1))
+        rows = result.all()
         
-        if not orders:
+        if not rows and bought.after_order_id is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No orders found for this customer")
+
+        has_more = len(rows) > bought.limit
+        rows = rows[:bought.limit]
         
-        # Step 3: 각 주문에 대해 product_id와 address_id를 사용하여 관련 정보 조회
-        order_list = []
-        for order in orders:
-            # Product 정보 조회
-            product = db.query(Product).filter(Product.product_id == order.product_id).first()
-            if not product:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Product not found for product_id {order.product_id}")
-            
-            # Address 정보 조회
-            address = db.query(Address).filter(Address.address_id == order.address_id).first()
-            if not address:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Address not found for address_id {order.address_id}")
-            
-            # 주문 정보에 추가
-            order_list.append({
-                "order_id": order.order_id,
-                "product_name": product.name,
-                "product_price": product.price,
+        # Step 3: 응답 데이터 구성
+        order_list = [
+            {
+                "order_id": row.order_id,
+                "product_name": row.product_name,
+                "product_price": row.product_price,
                 "customer_name": customer.name,
                 "customer_phone_number": customer.phone_number,
-                "city": address.city,
-                "town": address.town,
-                "village": address.village
-            })
+                "city": row.city,
+                "town": row.town,
+                "village": row.village
+            }
+            for row in rows
+        ]
         
-        return {"orders": order_list}
+        return {
+            "orders": order_list,
+            "next_after_order_id": order_list[-1]["order_id"] if has_more else None
+        }
     
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception:
+        logger.exception("Unhandled exception")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 @router.get("/delivery_status")
-def get_delivery_status(db: Session = Depends(get_db), user_id: int = Depends(get_current_user)):
+async def get_delivery_status(user_id: int = Depends(require_role("CUSTOMER")), db: AsyncDBSession = Depends(get_async_db)):
     try:
         # Order에서 user_id에 해당하는 주문 ID 조회
-        orders = db.query(Order.order_id).filter(Order.customer_id == user_id).all()
+        result = await db.execute(select(Order.order_id).where(Order.customer_id == user_id))
+        orders = result.all()
         if not orders:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No orders found for this customer")
 
         # 주문 ID를 통해 deliveryinfo의 delivery_status 조회
         order_ids = [order.order_id for order in orders]
-        delivery_statuses = db.query(DeliveryInfo.order_id, DeliveryInfo.delivery_status).filter(
-            DeliveryInfo.order_id.in_(order_ids)
-        ).all()
+        result = await db.execute(
+            select(DeliveryInfo.order_id, DeliveryInfo.delivery_status).where(DeliveryInfo.order_id.in_(order_ids))
+        )
+        delivery_statuses = result.all()
 
         if not delivery_statuses:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No delivery info found for these orders")
@@ -202,6 +378,8 @@ def get_delivery_status(db: Session = Depends(get_db), user_id: int = Depends(ge
                 for status in delivery_statuses
             ],
         }
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception:
+        logger.exception("Unhandled exception")
         raise HTTPException(status_code=500, detail="Internal Server Error")
\ No newline at end of file
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import delete, tuple_
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
 from app.database import get_db
-from app.models.models import DriverDeliveryInfo, DeliveryInfo
-from app.auth.auth import get_current_user
+from app.models.models import DeliveryView, DriverDeliveryInfo, DeliveryInfo
+from app.auth.auth import require_role
+from app.delivery_status import DELIVERED, SHIPPED, commit_transitions, ensure_status, transition_delivery
+from app.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(
@@ -13,104 +20,144 @@ router = APIRouter(
 
 class UpdateDeliveryStatusRequest(BaseModel):
     delivery_id: int
+    version: Optional[int] = None  # 지정 시 해당 version 일 때만 변경 (낙관적 동시성 제어)
+
+# sort_by 별 ORDER BY 컬럼 (마지막 delivery_id 는 keyset 페이지네이션의 동률 해소용)
+SORT_COLUMNS = {
+    "delivery_id": (DeliveryView.delivery_id,),
+    "customer_name": (DeliveryView.customer_name, DeliveryView.delivery_id),
+    "detailed_address": (DeliveryView.city, DeliveryView.town, DeliveryView.village, DeliveryView.delivery_id),
+}
+
+# 커서에 담는 응답 행의 컬럼 (SORT_COLUMNS 와 같은 순서)
+CURSOR_KEYS = {
+    "delivery_id": ("delivery_id",),
+    "customer_name": ("customer_name", "delivery_id"),
+    "detailed_address": ("city", "town", "village", "delivery_id"),
+}
+
+# 커서 값의 타입 (CURSOR_KEYS 와 같은 순서, bool 은 int 로 인정하지 않음)
+CURSOR_TYPES = {
+    "delivery_id": (int,),
+    "customer_name": (str, int),
+    "detailed_address": (str, str, str, int),
+}
+
 
 @router.get("/deliveries")
 def get_driver_deliveries(
+    driver_id: int = Depends(require_role("DRIVER")),
     db: Session = Depends(get_db),
-    driver_id: int = Depends(get_current_user),
-    sort_by: str = "delivery_id"
+    sort_by: Literal["delivery_id", "customer_name", "detailed_address"] = "delivery_id",
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=200)
 ):
     try:
-        # driver_id로 driverdeliveryinfo 조회
-        driver_deliveries = (
-            db.query(DriverDeliveryInfo)
-            .options(joinedload(DriverDeliveryInfo.driver_interface))  # DeliveryInfo와 조인
-            .filter(DriverDeliveryInfo.driver_id == driver_id)
-            .all()
+        sort_columns = SORT_COLUMNS[sort_by]
+        after = decode_cursor(cursor, len(sort_columns))
+        # 다른 sort_by 로 만든 커서나 변조된 값은 DB 비교 전에 거절
+        if after is not None and any(type(value) is not expected for value, expected in zip(after, CURSOR_TYPES[sort_by])):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+        # delivery_view 단일 테이블 조회: 배정 기록(driverdeliveryinfo)이 남아 있는 배송 = 해당 운전자의 Shipped 배송
+        query = (
+            db.query(
+                DeliveryView.delivery_id,
+                DeliveryView.order_id,
+                DeliveryView.tracking_number,
+                DeliveryView.delivery_status,
+                DeliveryView.product_name,
+                DeliveryView.customer_name,
+                DeliveryView.customer_phone,
+                DeliveryView.city,
+                DeliveryView.town,
+                DeliveryView.village
+            )
+            .filter(DeliveryView.driver_id == driver_id, DeliveryView.delivery_status == SHIPPED)
         )
+        if after is not None:
+            query = query.filter(tuple_(*sort_columns) > tuple_(*after))
+
+        # 정렬 기준에 따라 DB 에서 정렬 (다음 페이지 존재 여부 확인을 위해 limit + 1 개 조회)
+        rows = query.order_by(*sort_columns).limit(limit + 1).all()
 
-        if not driver_deliveries:
-            return {"driver_id": driver_id, "deliveries": []}
+        has_more = len(rows) > limit
+        rows = rows[:limit]
 
         # 응답 데이터 구성
-        response = []
-        for driver_delivery in driver_deliveries:
-            delivery = driver_delivery.driver_interface
-
-            # 배송 정보가 없는 경우 무시
-            if not delivery:
-                continue
-
-            # Address 정보
-            address = delivery.info_address
-            detailed_address = f"{address.city}, {address.town}, {address.village}" if address else "Unknown Address"
-
-            # Product 정보
-            product = delivery.info_order.order_product if delivery.info_order else None
-            product_name = product.name if product else "Unknown Product"
-
-            # Customer 정보
-            customer = delivery.info_order.order_customer if delivery.info_order else None
-            customer_name = customer.name if customer else "Unknown Customer"
-            customer_phone = customer.phone_number if customer else "Unknown Phone"
-
-            # 응답 데이터 추가
-            response.append({
-                "delivery_id": delivery.delivery_id,
-                "order_id": delivery.order_id,
-                "tracking_number": delivery.tracking_number,
-                "delivery_status": delivery.delivery_status,
-                "product_name": product_name,
-                "customer_name": customer_name,
-                "customer_phone": customer_phone,
-                "detailed_address": detailed_address
-            })
-
-        # 정렬 기준에 따라 정렬
-        if sort_by == "customer_name":
-            response = sorted(response, key=lambda x: x["customer_name"])
-        elif sort_by == "detailed_address":
-            response = sorted(response, key=lambda x: x["detailed_address"])
-        else:  # 기본 정렬: delivery_id
-            response = sorted(response, key=lambda x: x["delivery_id"])
-
-        return {"driver_id": driver_id, "deliveries": response}
-
-    except Exception as e:
-        print(f"Error: {str(e)}")
+        response = [
+            {
+                "delivery_id": row.delivery_id,
+                "order_id": row.order_id,
+                "tracking_number": row.tracking_number,
+                "delivery_status": row.delivery_status,
+                "product_name": row.product_name,
+                "customer_name": row.customer_name,
+                "customer_phone": row.customer_phone,
+                "detailed_address": f"{row.city}, {row.town}, {row.village}"
+            }
+            for row in rows
+        ]
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor([getattr(last, key) for key in CURSOR_KEYS[sort_by]])
+
+        return {"driver_id": driver_id, "deliveries": response, "next_cursor": next_cursor}
+
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception:
+        logger.exception("Unhandled exception")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 @router.post("/mark_delivered")
-def mark_delivered(request: UpdateDeliveryStatusRequest, db: Session = Depends(get_db)):
+def mark_delivered(
+    request: UpdateDeliveryStatusRequest,
+    driver_id: int = Depends(require_role("DRIVER")),
+    db: Session = Depends(get_db)
+):
     try:
         # 1. delivery_id로 DeliveryInfo 조회
-        delivery = db.query(DeliveryInfo).filter(DeliveryInfo.delivery_id == request.delivery_id).first()
+        delivery = (
+            db.query(DeliveryInfo.driver_id, DeliveryInfo.delivery_status)
+            .filter(DeliveryInfo.delivery_id == request.delivery_id)
+            .first()
+        )
         if not delivery:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Delivery not found")
 
-        # 2. delivery_status를 Delivered로 업데이트
-        delivery.delivery_status = "Delivered"
+        # 본인에게 배정된 배송만 완료 처리 가능
+        if delivery.driver_id != driver_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Delivery is not assigned to this driver")
+
+        # 2. Shipped -> Delivered 조건부 UPDATE (배송 중이 아니면 409)
+        ensure_status(delivery.delivery_status, SHIPPED)
+        version = transition_delivery(
+            db, request.delivery_id, SHIPPED, DELIVERED,
+            DeliveryInfo.driver_id == driver_id,
+            expected_version=request.version
+        )
 
         # 3. driverdeliveryinfo에서 해당 delivery_id 삭제
-        driver_delivery = db.query(DriverDeliveryInfo).filter(DriverDeliveryInfo.delivery_id == request.delivery_id).first()
-        if driver_delivery:
-            db.delete(driver_delivery)
+        db.execute(delete(DriverDeliveryInfo).where(DriverDeliveryInfo.delivery_id == request.delivery_id))
 
-        # 4. 변경 사항 커밋
-        db.commit()
-        db.refresh(delivery)
+        # 4. 변경 사항 커밋 (구독 중인 고객/판매자에게 상태 변경 발행)
+        commit_transitions(db)
 
         # 성공 응답 반환
         return {
             "msg": "Delivery marked as delivered and driver record removed",
-            "delivery_id": delivery.delivery_id,
-            "delivery_status": delivery.delivery_status
+            "delivery_id": request.delivery_id,
+            "delivery_status": DELIVERED,
+            "version": version
         }
 
     except HTTPException as http_exc:
         raise http_exc
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except Exception:
+        logger.exception("Unhandled exception")
         db.rollback()
         raise HTTPException(status_code=500, detail="Internal Server Error")
\ No newline at end of file
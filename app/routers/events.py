@@ -0,0 +1,45 @@
+import asyncio
+import json
+import os
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.auth.auth import require_role
+from app.events import delivery_events, event_hub
+
+# 연결 유지를 위한 주석(heartbeat) 전송 간격 (프록시 idle timeout 보다 짧게)
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"]
+)
+
+
+@router.get("/deliveries")
+async def stream_delivery_events(user_id: int = Depends(require_role("CUSTOMER", "SELLER"))):
+    # 본인 주문(고객) / 본인 상품 주문(판매자)의 배송 상태 변경을 Server-Sent Events 로 전달
+    await delivery_events.start()
+
+    async def event_stream():
+        async with event_hub.subscribe(user_id) as queue:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                # 처리가 밀려 구독이 끊긴 경우: 클라이언트는 재접속 후 현재 상태를 다시 조회
+                if event is None:
+                    break
+                yield f"event: delivery_status\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
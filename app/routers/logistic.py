@@ -1,11 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel, Field
+from sqlalchemy import and_, case, func, insert
 from sqlalchemy.orm import Session
-from app.auth.auth import get_current_user
+from typing import Dict, List, Literal, Optional, Set
+from app.auth.auth import require_role
 from app.database import get_db
-from app.models.models import Address, DeliveryInfo, DriverDeliveryInfo, Order, User
+from app.dispatch import plan_dispatch
+from app.delivery_status import PROCESSING, SHIPPED, commit_transitions, ensure_status, transition_deliveries, transition_delivery
+from app.export import stream_export
+from app.models.models import Address, DeliveryInfo, DeliveryView, DriverDeliveryInfo, User
 from collections import defaultdict
-from sqlalchemy.orm import joinedload
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(
@@ -16,61 +23,152 @@ router = APIRouter(
 class AssignDriverRequest(BaseModel):
     delivery_id: int
     driver_id: int
+    version: Optional[int] = None  # 지정 시 해당 version 일 때만 변경 (낙관적 동시성 제어)
+
+class AssignDriversRequest(BaseModel):
+    assignments: List[AssignDriverRequest]
+
+# 한 번의 일괄 배정 요청에서 처리할 수 있는 최대 건수
+MAX_BULK_ASSIGNMENTS = 1000
+
+# bulk UPDATE/INSERT 한 문장에 담는 배정 건수 (DB 바인드 파라미터 한도 대비)
+ASSIGNMENT_CHUNK_SIZE = 1000
+
+class AutoDispatchRequest(BaseModel):
+    max_load_per_driver: Optional[int] = Field(default=None, ge=1)  # driver 당 진행 중 배송 수 상한
+
+
+LOGISTIC_DELIVERY_EXPORT_COLUMNS = (
+    "delivery_id", "order_id", "tracking_number", "delivery_status",
+    "product_name", "customer_name", "customer_phone",
+    "city", "town", "village"
+)
+
+
+def _logistic_export_query(db: Session, logistic_id: int, city: Optional[str] = None, after_delivery_id: Optional[int] = None):
+    # 평탄화된 delivery_view 를 (logistic_id, city, delivery_id) 인덱스 순서로 조회
+    query = (
+        db.query(
+            DeliveryView.delivery_id,
+            DeliveryView.order_id,
+            DeliveryView.tracking_number,
+            DeliveryView.delivery_status,
+            DeliveryView.product_name,
+            DeliveryView.customer_name,
+            DeliveryView.customer_phone,
+            DeliveryView.city,
+            DeliveryView.town,
+            DeliveryView.village
+        )
+        .filter(DeliveryView.logistic_id == logistic_id)
+    )
+    # city drill-down: 한 도시의 배송만 delivery_id 기준 keyset 으로 조회
+    if city is not None:
+        query = query.filter(DeliveryView.city == city)
+    if after_delivery_id is not None:
+        query = query.filter(DeliveryView.delivery_id > after_delivery_id)
+    return query.order_by(DeliveryView.city, DeliveryView.delivery_id)
+
+
+def _serialize_delivery(row) -> dict:
+    return {
+        "delivery_id": row.delivery_id,
+        "order_id": row.order_id,
+        "tracking_number": row.tracking_number,
+        "delivery_status": row.delivery_status,
+        "product_name": row.product_name or "Unknown Product",
+        "customer_name": row.customer_name or "Unknown Customer",
+        "customer_phone": row.customer_phone or "Unknown Phone",
+        "detailed_address": f"{row.town}, {row.village}" if row.city is not None else "Unknown Address",
+    }
+
+
+def _delivery_summary(db: Session, logistic_id: int) -> dict:
+    # city / delivery_status 별 건수를 delivery_view 의 covering 인덱스만으로 집계 (address 조인 없음)
+    rows = (
+        db.query(DeliveryView.city, DeliveryView.delivery_status, func.count().label("count"))
+        .filter(DeliveryView.logistic_id == logistic_id)
+        .group_by(DeliveryView.city, DeliveryView.delivery_status)
+        .order_by(DeliveryView.city, DeliveryView.delivery_status)
+        .all()
+    )
+
+    cities = {}
+    for row in rows:
+        city = row.city if row.city is not None else "Unknown City"
+        summary = cities.setdefault(city, {"city": city, "total": 0, "statuses": {}})
+        summary["statuses"][row.delivery_status] = summary["statuses"].get(row.delivery_status, 0) + row.count
+        summary["total"] += row.count
+
+    return {
+        "logistic_id": logistic_id,
+        "total": sum(summary["total"] for summary in cities.values()),
+        "cities": list(cities.values())
+    }
 
 
 @router.get("/deliveries")
-def get_deliveries_for_logistic(db: Session = Depends(get_db), logistic_id: int = Depends(get_current_user)):
+def get_deliveries_for_logistic(
+    logistic_id: int = Depends(require_role("LOGISTIC")),
+    db: Session = Depends(get_db),
+    export_format: Optional[Literal["ndjson", "csv"]] = Query(default=None, alias="format"),
+    summary: bool = False,
+    city: Optional[str] = None,
+    after_delivery_id: Optional[int] = None,
+    limit: int = Query(default=100, ge=1, le=1000)
+):
     try:
-        # logistic_id로 배송 정보 조회
-        deliveries = (
-            db.query(DeliveryInfo)
-            .options(
-                joinedload(DeliveryInfo.info_address),   # Address 조인
-                joinedload(DeliveryInfo.info_order).joinedload(Order.order_product),  # Product 조인
-                joinedload(DeliveryInfo.info_order).joinedload(Order.order_customer)  # Customer 조인
+        # format 지정 시 전체 배송 목록(manifest)을 스트리밍
+        if export_format:
+            return stream_export(
+                lambda session: _logistic_export_query(session, logistic_id),
+                LOGISTIC_DELIVERY_EXPORT_COLUMNS,
+                export_format,
+                filename=f"logistic_{logistic_id}_deliveries"
             )
-            .filter(DeliveryInfo.logistic_id == logistic_id)
-            .all()
-        )
 
-        if not deliveries:
+        # summary 모드: 도시별 / 상태별 건수만 반환 (대시보드용)
+        if summary:
+            return _delivery_summary(db, logistic_id)
+
+        # city 지정 시: 해당 도시의 배송만 페이지 단위로 반환
+        if city is not None:
+            # 다음 페이지 존재 여부 확인을 위해 limit + 1 개 조회
+            rows = _logistic_export_query(db, logistic_id, city, after_delivery_id).limit(limit + 1).all()
+            has_more = len(rows) > limit
+            deliveries = [_serialize_delivery(row) for row in rows[:limit]]
+            return {
+                "logistic_id": logistic_id,
+                "city": city,
+                "deliveries": deliveries,
+                "next_after_delivery_id": deliveries[-1]["delivery_id"] if has_more else None
+            }
+
+        # 기본 모드: 한 번의 평탄화된 조인 쿼리로 조회 (city 순으로 정렬되어 있어 순서대로 그룹화)
+        rows = _logistic_export_query(db, logistic_id).all()
+
+        if not rows:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No deliveries found for this logistic")
 
-        # city를 기준으로 그룹화
         grouped_deliveries = defaultdict(list)
-        for delivery in deliveries:
-            # Address 정보
-            city = delivery.info_address.city if delivery.info_address else "Unknown City"
-            detailed_address = f"{delivery.info_address.town}, {delivery.info_address.village}" if delivery.info_address else "Unknown Address"
-
-            # Order, Product, Customer 정보
-            product_name = delivery.info_order.order_product.name if delivery.info_order and delivery.info_order.order_product else "Unknown Product"
-            customer_name = delivery.info_order.order_customer.name if delivery.info_order and delivery.info_order.order_customer else "Unknown Customer"
-            customer_phone = delivery.info_order.order_customer.phone_number if delivery.info_order and delivery.info_order.order_customer else "Unknown Phone"
-
-            # 배송 정보 그룹화
-            grouped_deliveries[city].append({
-                "delivery_id": delivery.delivery_id,
-                "order_id": delivery.order_id,
-                "tracking_number": delivery.tracking_number,
-                "delivery_status": delivery.delivery_status,
-                "product_name": product_name,
-                "customer_name": customer_name,
-                "customer_phone": customer_phone,
-                "detailed_address": detailed_address,
-            })
+        for row in rows:
+            city_name = row.city if row.city is not None else "Unknown City"
+            grouped_deliveries[city_name].append(_serialize_delivery(row))
+
         # 응답 구성
         response = [
             {
-                "city": city,
+                "city": city_name,
                 "deliveries": deliveries
             }
-            for city, deliveries in grouped_deliveries.items()
+            for city_name, deliveries in grouped_deliveries.items()
         ]
         return {"logistic_id": logistic_id, "grouped_deliveries": response}
 
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception:
+        logger.exception("Unhandled exception")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
@@ -100,27 +198,43 @@ def get_drivers_by_city(city: str, db: Session = Depends(get_db)):
         ]
         return {"city": city, "drivers": response}
 
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except Exception:
+        logger.exception("Unhandled exception")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 @router.post("/assign_driver")
-def assign_driver(request: AssignDriverRequest, db: Session = Depends(get_db)):
+def assign_driver(
+    request: AssignDriverRequest,
+    logistic_id: int = Depends(require_role("LOGISTIC")),
+    db: Session = Depends(get_db)
+):
     try:
-        # 1. delivery_id로 DeliveryInfo 조회
-        delivery = db.query(DeliveryInfo).filter(DeliveryInfo.delivery_id == request.delivery_id).first()
+        # 1. delivery_id로 DeliveryInfo 조회 + driver_id 검증을 한 번의 쿼리로 수행
+        delivery = (
+            db.query(DeliveryInfo.logistic_id, DeliveryInfo.delivery_status, User.user_id.label("valid_driver_id"))
+            .outerjoin(User, and_(User.user_id == request.driver_id, User.role == "DRIVER"))
+            .filter(DeliveryInfo.delivery_id == request.delivery_id)
+            .first()
+        )
         if not delivery:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Delivery not found")
 
-        # 2. driver_id로 Driver 조회 및 검증
-        driver = db.query(User).filter(User.user_id == request.driver_id, User.role == "DRIVER").first()
-        if not driver:
+        if delivery.logistic_id != logistic_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Delivery is not handled by this logistic")
+
+        # 2. Driver 검증
+        if delivery.valid_driver_id is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Driver not found or invalid role")
 
-        # 3. DeliveryInfo 업데이트
-        delivery.driver_id = request.driver_id
-        delivery.delivery_status = "Shipped"
+        # 3. Processing -> Shipped 조건부 UPDATE (다른 배정이 먼저 반영됐으면 409)
+        ensure_status(delivery.delivery_status, PROCESSING)
+        version = transition_delivery(
+            db, request.delivery_id, PROCESSING, SHIPPED,
+            DeliveryInfo.logistic_id == logistic_id,
+            expected_version=request.version,
+            driver_id=request.driver_id
+        )
 
         driver_delivery = DriverDeliveryInfo(
             delivery_id=request.delivery_id,
@@ -128,21 +242,192 @@ def assign_driver(request: AssignDriverRequest, db: Session = Depends(get_db)):
         )
         db.add(driver_delivery)
 
-        # 4. 변경 사항 커밋
-        db.commit()
-        db.refresh(delivery)
+        # 4. 변경 사항 커밋 (구독 중인 고객/판매자에게 상태 변경 발행)
+        commit_transitions(db)
 
         # 성공 응답 반환
         return {
             "msg": "Driver assigned successfully",
-            "delivery_id": delivery.delivery_id,
-            "driver_id": delivery.driver_id,
-            "delivery_status": delivery.delivery_status
+            "delivery_id": request.delivery_id,
+            "driver_id": request.driver_id,
+            "delivery_status": SHIPPED,
+            "version": version
+        }
+
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception:
+        logger.exception("Unhandled exception")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+def apply_driver_assignments(db: Session, assignments: Dict[int, int], logistic_id: int) -> Set[int]:
+    """delivery_id -> driver_id 배정을 청크마다 bulk UPDATE 한 번 + multi-row INSERT 한 번으로 반영
+
+    실제로 갱신된 delivery_id 집합을 반환하며, 커밋은 호출한 쪽에서 commit_transitions 로 수행한다.
+    """
+    updated_ids = set()
+    items = list(assignments.items())
+    for start in range(0, len(items), ASSIGNMENT_CHUNK_SIZE):
+        chunk = dict(items[start:start + ASSIGNMENT_CHUNK_SIZE])
+
+        # Processing 상태인 배송만 Shipped 로 전이 (이미 배정된 배송은 제외됨)
+        chunk_updated = transition_deliveries(
+            db, chunk.keys(), PROCESSING, SHIPPED,
+            DeliveryInfo.logistic_id == logistic_id,
+            driver_id=case(chunk, value=DeliveryInfo.delivery_id)
+        )
+
+        if chunk_updated:
+            db.execute(insert(DriverDeliveryInfo).values([
+                {"delivery_id": delivery_id, "driver_id": chunk[delivery_id]}
+                for delivery_id in sorted(chunk_updated)
+            ]))
+        updated_ids.update(chunk_updated)
+    return updated_ids
+
+
+@router.post("/assign_drivers")
+def assign_drivers(
+    request: AssignDriversRequest,
+    logistic_id: int = Depends(require_role("LOGISTIC")),
+    db: Session = Depends(get_db)
+):
+    try:
+        if len(request.assignments) > MAX_BULK_ASSIGNMENTS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many assignments in one request (max {MAX_BULK_ASSIGNMENTS})"
+            )
+
+        delivery_ids = {item.delivery_id for item in request.assignments}
+        driver_ids = {item.driver_id for item in request.assignments}
+
+        # 1. 요청에 포함된 모든 driver 를 한 번의 쿼리로 검증
+        valid_drivers = {
+            row.user_id
+            for row in db.query(User.user_id).filter(User.user_id.in_(driver_ids), User.role == "DRIVER").all()
+        }
+
+        # 2. 요청에 포함된 모든 배송을 한 번의 쿼리로 조회
+        deliveries = {
+            row.delivery_id: row
+            for row in db.query(DeliveryInfo.delivery_id, DeliveryInfo.logistic_id, DeliveryInfo.delivery_status)
+            .filter(DeliveryInfo.delivery_id.in_(delivery_ids))
+            .all()
+        }
+
+        # 3. 항목별 검증
+        results = []
+        assignments = {}
+        seen = set()
+        for item in request.assignments:
+            if item.delivery_id in seen:
+                error = "Duplicate delivery in request"
+            elif item.delivery_id not in deliveries:
+                error = "Delivery not found"
+            elif deliveries[item.delivery_id].logistic_id != logistic_id:
+                error = "Delivery is not handled by this logistic"
+            elif deliveries[item.delivery_id].delivery_status != PROCESSING:
+                error = f"Delivery status is {deliveries[item.delivery_id].delivery_status}, expected {PROCESSING}"
+            elif item.driver_id not in valid_drivers:
+                error = "Driver not found or invalid role"
+            else:
+                error = None
+                assignments[item.delivery_id] = item.driver_id
+            seen.add(item.delivery_id)
+            results.append({
+                "delivery_id": item.delivery_id,
+                "driver_id": item.driver_id,
+                "success": error is None,
+                "detail": error
+            })
+
+        # 4. 유효한 항목을 한 트랜잭션으로 일괄 반영
+        updated_ids = apply_driver_assignments(db, assignments, logistic_id)
+        commit_transitions(db)
+
+        for result in results:
+            if result["success"] and result["delivery_id"] not in updated_ids:
+                result["success"] = False
+                result["detail"] = "Delivery was modified concurrently"
+
+        succeeded = sum(1 for result in results if result["success"])
+        return {
+            "msg": "Drivers assigned",
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "results": results
         }
 
     except HTTPException as http_exc:
         raise http_exc
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except Exception:
+        logger.exception("Unhandled exception")
         db.rollback()
-        raise HTTPException(status_code=500, detail="Internal Server Error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/auto_dispatch")
+def auto_dispatch(
+    request: AutoDispatchRequest,
+    logistic_id: int = Depends(require_role("LOGISTIC")),
+    db: Session = Depends(get_db)
+):
+    try:
+        # 1. driver 가 배정되지 않은 배송과 배송지 도시
+        deliveries = (
+            db.query(DeliveryInfo.delivery_id, Address.city)
+            .join(Address, Address.address_id == DeliveryInfo.delivery_address)
+            .filter(
+                DeliveryInfo.logistic_id == logistic_id,
+                DeliveryInfo.driver_id.is_(None),
+                DeliveryInfo.delivery_status == PROCESSING
+            )
+            .order_by(DeliveryInfo.delivery_id)
+            .all()
+        )
+        if not deliveries:
+            return {"logistic_id": logistic_id, "assigned": 0, "driver_loads": {}, "unassigned_delivery_ids": []}
+
+        # 2. 전체 driver 와 거주 도시
+        drivers = (
+            db.query(User.user_id, Address.city)
+            .join(Address, Address.address_id == User.address_id)
+            .filter(User.role == "DRIVER")
+            .all()
+        )
+
+        # 3. driver 별 진행 중인 배송 수
+        loads = dict(
+            db.query(DriverDeliveryInfo.driver_id, func.count(DriverDeliveryInfo.id))
+            .group_by(DriverDeliveryInfo.driver_id)
+            .all()
+        )
+
+        # 4. 메모리에서 도시별 최소 부하 driver 에게 배정
+        assignments, unassigned = plan_dispatch(deliveries, drivers, loads, request.max_load_per_driver)
+
+        # 5. 배정 결과를 bulk 로 반영
+        updated_ids = apply_driver_assignments(db, assignments, logistic_id)
+        commit_transitions(db)
+
+        driver_loads = defaultdict(int)
+        for delivery_id in updated_ids:
+            driver_loads[assignments[delivery_id]] += 1
+        unassigned.extend(delivery_id for delivery_id in assignments if delivery_id not in updated_ids)
+
+        return {
+            "logistic_id": logistic_id,
+            "assigned": len(updated_ids),
+            "driver_loads": driver_loads,
+            "unassigned_delivery_ids": sorted(unassigned)
+        }
+
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception:
+        logger.exception("Unhandled exception")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Internal Server Error")
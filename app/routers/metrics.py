@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.metrics import render_metrics
+
+
+router = APIRouter(
+    tags=["metrics"]
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    # Prometheus 수집용 메트릭 (text exposition format)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -1,12 +1,19 @@
+import logging
 from fastapi import APIRouter
 from pydantic import BaseModel
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-import random
 
-from app.auth.auth import get_current_user
+from app.auth.auth import require_role
+from app.delivery_status import PROCESSING, RECEIVED, commit_transitions, ensure_status, transition_delivery
+from app.export import stream_export
+from app.tracking import MAX_TRACKING_BATCH, lookup_delivery_statuses, tracking_allocator
 from ..database import get_db
-from app.models.models import Order, Product, DeliveryInfo
-from fastapi import Depends, HTTPException, status
+from app.models.models import Order, Product, DeliveryInfo, DeliveryView, User
+from fastapi import Depends, HTTPException, Query, status
+from typing import List, Literal, Optional
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
 	prefix="/seller",
@@ -15,110 +22,180 @@ router = APIRouter(
 
 class SelectLogisticRequest(BaseModel):
     order_id: int
+    logistic_id: int
+    version: Optional[int] = None  # 지정 시 해당 version 일 때만 변경 (낙관적 동시성 제어)
 
 class TrackingNumberRequest(BaseModel):
     tracking_number: int
 
+class TrackingNumbersRequest(BaseModel):
+    tracking_numbers: List[int]
+
+
+SELLER_ORDER_EXPORT_COLUMNS = (
+    "order_id", "customer_id", "logistic_id", "address_id",
+    "product_id", "product_name", "product_description", "product_price",
+    "tracking_number", "delivery_status"
+)
+
+
+def _seller_orders_query(db: Session, user_id: int, delivery_status: Optional[str], after_order_id: Optional[int]):
+    # delivery_view 를 (seller_id, order_id) 인덱스 순서로 조회 (order_id 기준 keyset 페이지네이션)
+    query = (
+        db.query(
+            DeliveryView.order_id,
+            DeliveryView.customer_id,
+            DeliveryView.logistic_id,
+            DeliveryView.address_id,
+            DeliveryView.product_id,
+            DeliveryView.product_name,
+            DeliveryView.product_description,
+            DeliveryView.product_price,
+            DeliveryView.tracking_number,
+            DeliveryView.delivery_status
+        )
+        .filter(DeliveryView.seller_id == user_id)
+    )
+    if delivery_status is not None:
+        query = query.filter(DeliveryView.delivery_status == delivery_status)
+    if after_order_id is not None:
+        query = query.filter(DeliveryView.order_id > after_order_id)
+    return query.order_by(DeliveryView.order_id)
+
 
 @router.get("/orders")
-def get_seller_orders(db: Session = Depends(get_db), user_id: int = Depends(get_current_user)):
+def get_seller_orders(
+    user_id: int = Depends(require_role("SELLER")),
+    db: Session = Depends(get_db),
+    after_order_id: Optional[int] = None,
+    limit: int = Query(default=50, ge=1, le=200),
+    delivery_status: Optional[str] = None,
+    export_format: Optional[Literal["ndjson", "csv"]] = Query(default=None, alias="format")
+):
     try:
-        # 1. 해당 사용자가 등록한 제품 조회
-        products = db.query(Product).filter(Product.user_id == user_id).all()
-        if not products:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No products found for this user")
+        # format 지정 시 페이지 구분 없이 전체 주문 목록을 스트리밍
+        if export_format:
+            return stream_export(
+                lambda session: _seller_orders_query(session, user_id, delivery_status, after_order_id),
+                SELLER_ORDER_EXPORT_COLUMNS,
+                export_format,
+                filename=f"seller_{user_id}_orders"
+            )
 
-        # 2. 등록된 제품의 product_id로 관련 주문 조회
-        product_ids = [product.product_id for product in products]
-        orders = db.query(Order).filter(Order.product_id.in_(product_ids)).all()
+        query = _seller_orders_query(db, user_id, delivery_status, after_order_id)
 
-        if not orders:
+        # 다음 페이지 존재 여부 확인을 위해 limit + 1 개 조회
+        rows = query.limit(limit + 1).all()
+
+        if not rows and after_order_id is None and delivery_status is None:
+            # 결과가 없을 때만 제품 등록 여부를 확인하여 기존 오류 메시지 유지
+            has_products = db.query(Product.product_id).filter(Product.user_id == user_id).first()
+            if not has_products:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No products found for this user")
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No orders found for this seller's products")
 
-        # 3. JSON 형식으로 데이터 구성
-        response = []
-        for order in orders:
-            # 주문에 해당하는 제품 조회
-            product = next((p for p in products if p.product_id == order.product_id), None)
-            if not product:
-                continue
-
-            # 주문에 해당하는 배송 정보 조회
-            delivery_info = db.query(DeliveryInfo).filter(DeliveryInfo.order_id == order.order_id).first()
-            tracking_number = delivery_info.tracking_number if delivery_info else None
-
-            # 응답 데이터 추가
-            response.append({
-                "order_id": order.order_id,
-                "customer_id": order.customer_id,
-                "logistic_id": order.logistic_id,
-                "address_id": order.address_id,
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # JSON 형식으로 데이터 구성
+        response = [
+            {
+                "order_id": row.order_id,
+                "customer_id": row.customer_id,
+                "logistic_id": row.logistic_id,
+                "address_id": row.address_id,
                 "product": {
-                    "product_id": product.product_id,
-                    "name": product.name,
-                    "description": product.description,
-                    "price": product.price
+                    "product_id": row.product_id,
+                    "name": row.product_name,
+                    "description": row.product_description,
+                    "price": row.product_price
                 },
-                "tracking_number": tracking_number
-            })
+                "tracking_number": row.tracking_number
+            }
+            for row in rows
+        ]
 
-        return {"seller_id": user_id, "orders": response}
+        return {
+            "seller_id": user_id,
+            "orders": response,
+            "next_after_order_id": response[-1]["order_id"] if has_more else None
+        }
 
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception:
+        logger.exception("Unhandled exception")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
 
-def generate_unique_tracking_number(db: Session) -> int:
-    while True:
-        tracking_number = random.randint(100000, 999999)  # 6자리 난수 생성
-        existing_tracking = db.query(DeliveryInfo).filter(DeliveryInfo.tracking_number == tracking_number).first()
-        if not existing_tracking:
-            return tracking_number
-
 @router.post("/select_logistic")
-def select_logistic(request: SelectLogisticRequest, db: Session = Depends(get_db)):
+def select_logistic(
+    request: SelectLogisticRequest,
+    user_id: int = Depends(require_role("SELLER")),
+    db: Session = Depends(get_db)
+):
     try:
-        # deliveryinfo에서 order_id로 해당 데이터 조회
-        delivery = db.query(DeliveryInfo).filter(DeliveryInfo.order_id == request.order_id).first()
+        # deliveryinfo에서 order_id로 해당 데이터와 주문 상품의 판매자 조회
+        delivery = (
+            db.query(
+                DeliveryInfo.delivery_id,
+                DeliveryInfo.delivery_status,
+                DeliveryInfo.tracking_number,
+                Product.user_id.label("seller_id")
+            )
+            .join(Order, Order.order_id == DeliveryInfo.order_id)
+            .join(Product, Product.product_id == Order.product_id)
+            .filter(DeliveryInfo.order_id == request.order_id)
+            .first()
+        )
         if not delivery:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found in delivery info")
 
-        # Order 테이블에서 order_id로 해당 데이터 조회
-        order = db.query(Order).filter(Order.order_id == request.order_id).first()
-        if not order:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found in order table")
+        # 본인 상품의 주문만 물류사 지정 가능
+        if delivery.seller_id != user_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Order is not for this seller's product")
 
-        # logistic_id와 delivery_status 업데이트
-        delivery.logistic_id = 15  # 임의의 값 지정
-        delivery.delivery_status = "Processing"
+        # Received 상태의 배송만 물류사 지정 가능
+        ensure_status(delivery.delivery_status, RECEIVED)
 
-        # Order 테이블의 logistic_id 업데이트
-        order.logistic_id = delivery.logistic_id
+        # 요청한 물류사가 LOGISTIC 사용자인지 확인
+        logistic_id = request.logistic_id
+        logistic = db.query(User.user_id).filter(User.user_id == logistic_id, User.role == "LOGISTIC").first()
+        if not logistic:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Logistic not found")
 
-        # tracking_number가 없을 경우 새로 생성
-        if not delivery.tracking_number:
-            delivery.tracking_number = generate_unique_tracking_number(db)
+        # tracking_number가 없을 경우 새로 발급 (DB 조회 없이 예약된 블록에서 할당)
+        tracking_number = delivery.tracking_number or tracking_allocator.allocate()
 
-        # 데이터베이스에 변경 사항 적용
-        db.commit()
-        db.refresh(delivery)
-        db.refresh(order)
+        # Received -> Processing 조건부 UPDATE (동시에 다른 요청이 먼저 바꿨으면 409)
+        version = transition_delivery(
+            db, delivery.delivery_id, RECEIVED, PROCESSING,
+            expected_version=request.version,
+            logistic_id=logistic_id,
+            tracking_number=tracking_number
+        )
+
+        # Order 테이블의 logistic_id 업데이트
+        db.execute(update(Order).where(Order.order_id == request.order_id).values(logistic_id=logistic_id))
+
+        # 데이터베이스에 변경 사항 적용 (구독 중인 고객/판매자에게 상태 변경 발행)
+        commit_transitions(db)
 
         # 성공 응답 반환
         return {
             "msg": "Logistic updated successfully",
             "order_id": request.order_id,
-            "logistic_id": delivery.logistic_id,
-            "delivery_status": delivery.delivery_status,
-            "tracking_number": delivery.tracking_number
+            "logistic_id": logistic_id,
+            "delivery_status": PROCESSING,
+            "tracking_number": tracking_number,
+            "version": version
         }
 
     except HTTPException as http_exc: 
         raise http_exc  # HTTPException은 그대로 반환
-    except Exception as e:
-        print(f"Error: {str(e)}")
+    except Exception:
+        logger.exception("Unhandled exception")
         db.rollback()
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
@@ -126,10 +203,11 @@ def select_logistic(request: SelectLogisticRequest, db: Session = Depends(get_db
 @router.post("/get_delivery_status")
 def get_delivery_status(request: TrackingNumberRequest, db: Session = Depends(get_db)):
     try:
-        # DeliveryInfo에서 tracking_number로 데이터 조회
-        delivery_info = db.query(DeliveryInfo).filter(DeliveryInfo.tracking_number == request.tracking_number).first()
+        # 캐시 → (tracking_number, delivery_status) 두 컬럼만 조회
+        tracking_number = str(request.tracking_number)
+        delivery_status = lookup_delivery_statuses(db, [tracking_number]).get(tracking_number)
         
-        if not delivery_info:
+        if delivery_status is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No delivery found for tracking number {request.tracking_number}"
@@ -137,12 +215,43 @@ def get_delivery_status(request: TrackingNumberRequest, db: Session = Depends(ge
 
         # 배송 상태 반환
         return {
-            "tracking_number": delivery_info.tracking_number,
-            "delivery_status": delivery_info.delivery_status
+            "tracking_number": tracking_number,
+            "delivery_status": delivery_status
         }
 
     except HTTPException as http_exc:
         raise http_exc  # HTTPException을 그대로 반환
-    except Exception as e:
-        print(f"Unhandled exception: {e}")
-        raise HTTPException(status_code=500, detail="Internal Server Error")
\ No newline at end of file
+    except Exception:
+        logger.exception("Unhandled exception")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@router.post("/get_delivery_statuses")
+def get_delivery_statuses(request: TrackingNumbersRequest, db: Session = Depends(get_db)):
+    try:
+        if not request.tracking_numbers:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No tracking numbers given")
+        if len(request.tracking_numbers) > MAX_TRACKING_BATCH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many tracking numbers in one request (max {MAX_TRACKING_BATCH})"
+            )
+
+        # 여러 운송장을 한 번의 쿼리로 조회 (캐시에 있는 번호는 DB 조회 생략)
+        tracking_numbers = [str(number) for number in request.tracking_numbers]
+        statuses = lookup_delivery_statuses(db, tracking_numbers)
+
+        return {
+            "delivery_statuses": [
+                {"tracking_number": number, "delivery_status": statuses[number]}
+                for number in dict.fromkeys(tracking_numbers)
+                if number in statuses
+            ],
+            "not_found": [number for number in dict.fromkeys(tracking_numbers) if number not in statuses]
+        }
+
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception:
+        logger.exception("Unhandled exception")
+        raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -1,3 +1,4 @@
+import logging
 from fastapi import APIRouter
 from fastapi import Depends, HTTPException
 from sqlalchemy.orm import Session
@@ -5,7 +6,11 @@ from ..database import get_db
 from app.models.models import User, Address
 from pydantic import BaseModel
 from fastapi.security import OAuth2PasswordBearer
-from ..auth.auth import authenticate_user, create_access_token, get_password_hash
+from starlette.concurrency import run_in_threadpool
+from ..auth.auth import authenticate_user, build_user_claims, create_access_token, get_password_hash
+from ..auth.password import PasswordPoolBusy
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
 	prefix="/users",
@@ -32,44 +37,60 @@ class LoginRequest(BaseModel):
 
 
 # 회원가입 API 
+def _validate_signup(db: Session, user: UserCreate):
+    # login_id 중복 확인
+    existing_user = db.query(User).filter(User.login_id == user.login_id).first()
+    if existing_user:
+        raise HTTPException(status_code=400, detail="Login ID already exists")
+
+    # address_id 유효성 확인
+    address = db.query(Address).filter(Address.address_id == user.address_id).first()
+    if not address:
+        raise HTTPException(status_code=400, detail="Invalid address_id")
+
+    # 해싱 동안 DB 커넥션을 점유하지 않도록 세션 반환
+    db.close()
+
+
+def _create_user(db: Session, user: UserCreate, hashed_password: str) -> int:
+    # 새로운 사용자 생성
+    new_user = User(
+        name=user.name, 
+        phone_number=user.phone_number, 
+        role=user.role,
+        address_id=user.address_id,
+        login_id=user.login_id,
+        password=hashed_password
+    )
+    db.add(new_user) 
+    db.commit()
+    db.refresh(new_user)
+    return new_user.user_id
+
+
 @router.post("/signup")
-def signup(user: UserCreate, db: Session = Depends(get_db)):
+async def signup(user: UserCreate, db: Session = Depends(get_db)):
     try:
-        # login_id 중복 확인
-        existing_user = db.query(User).filter(User.login_id == user.login_id).first()
-        if existing_user:
-            raise HTTPException(status_code=400, detail="Login ID already exists")
-
-        # address_id 유효성 확인
-        address = db.query(Address).filter(Address.address_id == user.address_id).first()
-        if not address:
-            raise HTTPException(status_code=400, detail="Invalid address_id")
-        
-        # 비밀번호 해싱
-        hashed_password = get_password_hash(user.password)
-
-        # 새로운 사용자 생성
-        new_user = User(
-            name=user.name, 
-            phone_number=user.phone_number, 
-            role=user.role,
-            address_id=user.address_id,
-            login_id=user.login_id,
-            password=hashed_password
-        )
-        db.add(new_user) 
-        db.commit()
-        db.refresh(new_user)
+        await run_in_threadpool(_validate_signup, db, user)
+
+        # 비밀번호 해싱 (전용 워커 풀)
+        hashed_password = await get_password_hash(user.password)
+
+        user_id = await run_in_threadpool(_create_user, db, user, hashed_password)
 
         return {
             "msg": "User created successfully",
-            "user_id": new_user.user_id,
+            "user_id": user_id,
         }
 
-    except Exception as e:
+    except HTTPException as http_exc:
+        raise http_exc
+    except PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry", headers={"Retry-After": "1"})
+    except Exception:
         # 에러 발생 시 트랜잭션 롤백
-        db.rollback()
-        print(f"Exception occurred during signup processing: {e}")
+        await run_in_threadpool(db.rollback)
+        logger.exception("Signup failed")
         raise HTTPException(status_code=500, detail="Failed to process signup")
 
 
@@ -101,17 +122,20 @@ def signup(user: AddressCreate, db: Session = Depends(get_db)):
             "address_id": new_address.address_id,
         }
 
-    except Exception as e:
+    except Exception:
         # 에러 발생 시 트랜잭션 롤백
         db.rollback()
-        print(f"Exception occurred during address processing: {e}")
+        logger.exception("Address registration failed")
         raise HTTPException(status_code=500, detail="Failed to process address")
 
 # 로그인 엔드포인트
 @router.post("/login")
-def login(user_data: LoginRequest, db: Session = Depends(get_db)):
-    # 사용자 인증
-    user = authenticate_user(db, user_data.login_id, user_data.password)
+async def login(user_data: LoginRequest, db: Session = Depends(get_db)):
+    # 사용자 인증 (bcrypt 검증은 전용 워커 풀에서 수행)
+    try:
+        user = await authenticate_user(db, user_data.login_id, user_data.password)
+    except PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Server is busy, please retry", headers={"Retry-After": "1"})
     if not user:
         raise HTTPException(
             status_code=401,
@@ -120,7 +144,7 @@ def login(user_data: LoginRequest, db: Session = Depends(get_db)):
         )
     
     # JWT 생성
-    access_token = create_access_token({"user_id": user.user_id})
+    access_token = create_access_token(build_user_claims(user))
     return {
         "access_token": access_token, 
         "token_type": "bearer",
@@ -0,0 +1,154 @@
+import os
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import event, insert, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, object_session
+
+from app.cache import TTLCache
+from app.database import engine
+from app.models.models import DeliveryInfo, TrackingNumberCounter
+
+# 워커가 한 번에 예약하는 일련번호 개수 (DB 왕복은 블록당 1회)
+TRACKING_BLOCK_SIZE = int(os.getenv("TRACKING_BLOCK_SIZE", "100"))
+
+# 기존 6자리 난수 번호(100000~999999)와 겹치지 않도록 7자리 일련번호부터 시작
+TRACKING_SERIAL_START = 1_000_000
+
+COUNTER_ROW_ID = 1
+
+# tracking_number -> delivery_status 조회 캐시 (상태 변경 commit 시 무효화)
+TRACKING_STATUS_CACHE_TTL_SECONDS = float(os.getenv("TRACKING_STATUS_CACHE_TTL_SECONDS", "5"))
+TRACKING_STATUS_CACHE_MAX_SIZE = int(os.getenv("TRACKING_STATUS_CACHE_MAX_SIZE", "100000"))
+
+# 한 번의 일괄 조회에서 처리할 수 있는 최대 운송장 수
+MAX_TRACKING_BATCH = 100
+
+tracking_status_cache = TTLCache(maxsize=TRACKING_STATUS_CACHE_MAX_SIZE, ttl=TRACKING_STATUS_CACHE_TTL_SECONDS)
+
+
+def luhn_check_digit(serial: int) -> int:
+    total = 0
+    for index, char in enumerate(reversed(str(serial))):
+        digit = int(char)
+        if index % 2 == 0:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return (10 - total % 10) % 10
+
+
+def format_tracking_number(serial: int) -> str:
+    # 일련번호 + Luhn 체크 디지트
+    return f"{serial}{luhn_check_digit(serial)}"
+
+
+def is_valid_tracking_number(tracking_number: str) -> bool:
+    if not tracking_number.isdigit() or len(tracking_number) < 2:
+        return False
+    return luhn_check_digit(int(tracking_number[:-1])) == int(tracking_number[-1])
+
+
+class TrackingNumberAllocator:
+    """DB 카운터에서 일련번호 블록을 예약하고 프로세스 안에서 하나씩 나눠주는 할당기
+
+    블록 예약은 단일 UPDATE ... RETURNING 이므로 여러 워커가 동시에 예약해도 구간이 겹치지 않고,
+    요청 처리 중에는 DB 조회 없이 O(1) 로 번호를 발급한다.
+    """
+
+    def __init__(self, bind: Engine, block_size: int = TRACKING_BLOCK_SIZE):
+        self.bind = bind
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def _reserve_block(self) -> Tuple[int, int]:
+        table = TrackingNumberCounter.__table__
+        while True:
+            # 요청 트랜잭션과 분리된 짧은 트랜잭션으로 예약 (카운터 행 잠금을 오래 잡지 않음)
+            with self.bind.begin() as connection:
+                end = connection.execute(
+                    update(table)
+                    .where(table.c.id == COUNTER_ROW_ID)
+                    .values(next_serial=table.c.next_serial + self.block_size)
+                    .returning(table.c.next_serial)
+                ).scalar()
+            if end is not None:
+                return end - self.block_size, end
+
+            # 카운터 행이 없는 새 DB: 첫 블록을 직접 생성 (동시 생성 시 한쪽은 UPDATE 로 재시도)
+            try:
+                with self.bind.begin() as connection:
+                    connection.execute(
+                        insert(table).values(id=COUNTER_ROW_ID, next_serial=TRACKING_SERIAL_START + self.block_size)
+                    )
+                return TRACKING_SERIAL_START, TRACKING_SERIAL_START + self.block_size
+            except IntegrityError:
+                continue
+
+    def allocate(self) -> str:
+        with self._lock:
+            if self._next >= self._end:
+                self._next, self._end = self._reserve_block()
+            serial = self._next
+            self._next += 1
+        return format_tracking_number(serial)
+
+
+tracking_allocator = TrackingNumberAllocator(engine)
+
+
+def mark_tracking_status_changed(session: Session, tracking_numbers: Iterable[str]):
+    # commit 이후에 캐시에서 제거 (commit 전에 지우면 다른 요청이 이전 상태를 다시 캐시할 수 있음)
+    pending = session.info.setdefault("tracking_status_changed", set())
+    pending.update(number for number in tracking_numbers if number)
+
+
+# ORM 으로 수정된 배송 정보는 자동으로 표시 (벌크 UPDATE 는 mark_tracking_status_changed 를 직접 호출)
+@event.listens_for(DeliveryInfo, "after_update")
+@event.listens_for(DeliveryInfo, "after_delete")
+def _mark_delivery_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        mark_tracking_status_changed(session, [target.tracking_number])
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_tracking_statuses_on_commit(session):
+    for tracking_number in session.info.pop("tracking_status_changed", ()):
+        tracking_status_cache.pop(tracking_number)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_tracking_status_changes(session):
+    session.info.pop("tracking_status_changed", None)
+
+
+def lookup_delivery_statuses(db: Session, tracking_numbers: List[str]) -> Dict[str, str]:
+    """tracking_number -> delivery_status (없는 번호는 결과에서 제외)
+
+    캐시에 없는 번호만 (tracking_number, delivery_status) 두 컬럼을 한 번의 IN 쿼리로 조회한다.
+    """
+    statuses = {}
+    missing = []
+    for tracking_number in dict.fromkeys(tracking_numbers):
+        cached = tracking_status_cache.get(tracking_number)
+        if cached is None:
+            missing.append(tracking_number)
+        else:
+            statuses[tracking_number] = cached
+
+    if missing:
+        rows = (
+            db.query(DeliveryInfo.tracking_number, DeliveryInfo.delivery_status)
+            .filter(DeliveryInfo.tracking_number.in_(missing))
+            .all()
+        )
+        for row in rows:
+            tracking_status_cache.set(row.tracking_number, row.delivery_status)
+            statuses[row.tracking_number] = row.delivery_status
+    return statuses
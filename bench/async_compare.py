@@ -0,0 +1,87 @@
+"""sync 라우트 vs DATABASE_ASYNC=true 처리량 비교
+
+같은 bench.runner 시나리오(기본: customer 읽기 요청 = AsyncSession 으로 옮긴 라우트)를 DATABASE_ASYNC=false 와 true 로
+별도 프로세스에서 실행하고(설정은 import 시점에 읽음), sync 결과를 --compare 기준으로 주어 p95 변화를 함께 출력한다.
+카탈로그 캐시는 DB 조회를 비교하기 위해 기본으로 끈다. bench.datagen 으로 생성한 DB 가 필요하다.
+
+    python -m bench.async_compare --url sqlite:////tmp/bench.db --concurrency 16,64
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sync and DATABASE_ASYNC=true throughput on the same scenario")
+    parser.add_argument("--url", default=os.getenv("SQLALCHEMY_DATABASE_URL"), help="database seeded by bench.datagen")
+    parser.add_argument("--scenario", default="customer")
+    parser.add_argument("--include-writes", action="store_true", help="also run the scenario's write endpoints")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", default="16,64", help="comma separated concurrency levels")
+    parser.add_argument("--catalog-cache", action="store_true", help="keep the product_list cache enabled")
+    args = parser.parse_args(argv)
+    if not args.url:
+        parser.error("--url or SQLALCHEMY_DATABASE_URL is required")
+    args.concurrency = [int(value) for value in args.concurrency.split(",")]
+    return args
+
+
+def run_mode(args, use_async: bool, concurrency: int, output: str, compare: str = None) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_ASYNC="true" if use_async else "false",
+        CATALOG_CACHE_ENABLED="true" if args.catalog_cache else "false"
+    )
+    command = [
+        sys.executable, "-m", "bench.runner",
+        "--url", args.url,
+        "--scenario", args.scenario,
+        "--requests", str(args.requests),
+        "--concurrency", str(concurrency),
+        "--output", output
+    ]
+    if not args.include_writes:
+        command.append("--read-only")
+    if compare:
+        # sync 대비 엔드포인트별 p95 변화 표는 stderr 로 출력됨
+        command += ["--compare", compare]
+    subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+    with open(output) as f:
+        report = json.load(f)
+
+    return {
+        "mode": "async" if use_async else "sync",
+        "concurrency": concurrency,
+        "rps": report["success_rps"],
+        "p50_ms": report["overall"]["p50_ms"],
+        "p95_ms": report["overall"]["p95_ms"],
+        "status_codes": report["status_codes"]
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for concurrency in args.concurrency:
+            sync_path = os.path.join(directory, f"sync_{concurrency}.json")
+            print(f"-- concurrency {concurrency}", file=sys.stderr)
+            sync = run_mode(args, False, concurrency, sync_path)
+            result = run_mode(args, True, concurrency, os.path.join(directory, f"async_{concurrency}.json"), compare=sync_path)
+            result["rps_vs_sync"] = round(result["rps"] / sync["rps"], 2) if sync["rps"] else None
+            results += [sync, result]
+
+    print(json.dumps({
+        "scenario": args.scenario,
+        "read_only": not args.include_writes,
+        "catalog_cache": args.catalog_cache,
+        "requests": args.requests,
+        "results": results
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""카탈로그 캐시 on/off 에 따른 GET /customers/product_list 처리량 비교
+
+CATALOG_CACHE_ENABLED=false 와 true 로 bench.runner 의 catalog 시나리오를 별도 프로세스에서 차례로 실행하고
+(설정은 import 시점에 읽음), 캐시 off 결과를 --compare 기준으로 주어 엔드포인트별 p95 변화를 함께 출력한다.
+bench.datagen 으로 생성한 DB 가 필요하다.
+
+    python -m bench.catalog_cache --url sqlite:////tmp/bench.db --requests 2000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare product_list throughput with the catalog cache on and off")
+    parser.add_argument("--url", default=os.getenv("SQLALCHEMY_DATABASE_URL"), help="database seeded by bench.datagen")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output-dir", default=None, help="keep the off/on runner reports in this directory")
+    args = parser.parse_args(argv)
+    if not args.url:
+        parser.error("--url or SQLALCHEMY_DATABASE_URL is required")
+    return args
+
+
+def run_mode(args, enabled: bool, output: str, compare: str = None) -> dict:
+    env = dict(os.environ, CATALOG_CACHE_ENABLED="true" if enabled else "false")
+    command = [
+        sys.executable, "-m", "bench.runner",
+        "--url", args.url,
+        "--scenario", "catalog",
+        "--requests", str(args.requests),
+        "--concurrency", str(args.concurrency),
+        "--output", output
+    ]
+    if compare:
+        # 캐시 off 대비 p95 변화 표는 stderr 로 출력됨
+        command += ["--compare", compare]
+    subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL)
+    with open(output) as f:
+        report = json.load(f)
+
+    endpoint = report["endpoints"].get("GET /customers/product_list", {})
+    return {
+        "cache": "on" if enabled else "off",
+        "rps": report["success_rps"],
+        "p50_ms": endpoint.get("p50_ms"),
+        "p95_ms": endpoint.get("p95_ms"),
+        "queries_per_request": endpoint.get("queries_per_request"),
+        "status_codes": report["status_codes"]
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        directory = args.output_dir or directory
+        off_path = os.path.join(directory, "catalog_cache_off.json")
+        off = run_mode(args, False, off_path)
+        on = run_mode(args, True, os.path.join(directory, "catalog_cache_on.json"), compare=off_path)
+
+    print(json.dumps({
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "results": [off, on],
+        "rps_speedup": round(on["rps"] / off["rps"], 2) if off["rps"] else None
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
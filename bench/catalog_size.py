@@ -0,0 +1,140 @@
+"""상품 수에 따른 GET /customers/product_list 지연시간: keyset 페이지네이션 vs 이전 전체 조회
+
+상품 수(기본 1만 / 10만 / 100만)마다 alembic upgrade head + bench.datagen 으로 DB 를 만들고, 별도 프로세스에서
+카탈로그 캐시를 끈 채(CATALOG_CACHE_ENABLED=false) 첫 페이지 / 깊은 커서(90% 지점) / 검색 첫 페이지 요청과
+페이지네이션 이전 방식(전체 상품 조회 + 직렬화)의 지연시간을 측정한다.
+
+    python -m bench.catalog_size --sizes 10000,100000,1000000 --data-dir /tmp/catalog
+    python -m bench.catalog_size --url-template postgresql://user:pw@localhost/catalog_{size}
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.runner import percentile
+
+# 상품 외 데이터는 최소로 적재 (주문 수 기준으로 사용자 수가 정해짐)
+SEED_ORDERS = 1000
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure product_list latency as the catalog grows")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma separated product counts")
+    parser.add_argument("--data-dir", help="SQLite files are kept here and reused (default: temporary directory)")
+    parser.add_argument("--url-template", help="database URL per size with a {size} placeholder (empty databases)")
+    parser.add_argument("--repeat", type=int, default=50, help="requests per case")
+    parser.add_argument("--full-scan-repeat", type=int, default=5, help="full catalog loads per size")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)  # 내부용: 주어진 URL 에서 측정만 수행
+    args = parser.parse_args(argv)
+    args.sizes = [int(value) for value in args.sizes.split(",")]
+    return args
+
+
+def seed(url: str, products: int):
+    # alembic 으로 스키마를 만들어야 SQLite FTS5 검색 테이블 / 트리거까지 생성됨
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URL=url)
+    subprocess.run(["alembic", "upgrade", "head"], cwd=root, env=env, check=True, capture_output=True)
+    # app.database 는 import 시점의 URL 로 엔진을 만들므로 크기마다 새 프로세스에서 적재
+    subprocess.run(
+        [sys.executable, "-m", "bench.datagen", "--url", url, "--orders", str(SEED_ORDERS), "--products", str(products)],
+        cwd=root, env=env, check=True, stdout=subprocess.DEVNULL
+    )
+
+
+def _summary(latencies_ms) -> dict:
+    return {
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3)
+    }
+
+
+async def measure(args) -> dict:
+    import httpx
+    from sqlalchemy import func
+
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models.models import Product
+    from app.pagination import encode_cursor
+
+    db = SessionLocal()
+    try:
+        products = db.query(func.count(Product.product_id)).scalar()
+        deep_after = db.query(Product.product_id).order_by(Product.product_id).offset(int(products * 0.9)).limit(1).scalar()
+
+        # 페이지네이션 이전 get_product: 전체 상품 조회 후 목록 구성 / 직렬화
+        full_scan = []
+        for _ in range(args.full_scan_repeat):
+            start = time.perf_counter()
+            json.dumps([
+                {"product_id": product.product_id, "name": product.name, "description": product.description, "price": product.price}
+                for product in db.query(Product).all()
+            ])
+            full_scan.append((time.perf_counter() - start) * 1000)
+            db.expunge_all()
+    finally:
+        db.close()
+
+    cases = {
+        "first_page": {"limit": 50},
+        "deep_cursor": {"limit": 50, "cursor": encode_cursor([deep_after])},
+        "search_first_page": {"limit": 50, "q": "lamp"},
+    }
+    report = {"products": products, "full_scan": _summary(full_scan)}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, params in cases.items():
+                latencies = []
+                for index in range(args.repeat + 5):
+                    start = time.perf_counter()
+                    response = await client.get("/customers/product_list", params=params)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    response.raise_for_status()
+                    if index >= 5:  # 처음 5회는 warmup
+                        latencies.append(elapsed)
+                report[name] = _summary(latencies)
+    return report
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.measure:
+        os.environ["SQLALCHEMY_DATABASE_URL"] = args.measure
+        print(json.dumps(asyncio.run(measure(args))))
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_dir = args.data_dir or temp_dir
+        os.makedirs(data_dir, exist_ok=True)
+        results = []
+        for size in args.sizes:
+            if args.url_template:
+                url = args.url_template.format(size=size)
+                seed(url, size)
+            else:
+                path = os.path.join(data_dir, f"catalog_{size}.db")
+                url = f"sqlite:///{path}"
+                if not os.path.exists(path):
+                    seed(url, size)
+
+            # 엔진 / 캐시 설정은 import 시점에 읽으므로 크기마다 새 프로세스에서 측정
+            env = dict(os.environ, SQLALCHEMY_DATABASE_URL=url, CATALOG_CACHE_ENABLED="false", LOG_LEVEL="WARNING")
+            output = subprocess.run(
+                [sys.executable, "-m", "bench.catalog_size", "--measure", url,
+                 "--repeat", str(args.repeat), "--full-scan-repeat", str(args.full_scan_repeat)],
+                env=env, check=True, capture_output=True, text=True
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(json.dumps({"repeat": args.repeat, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""벤치마크용 합성 배송 데이터 생성기
+
+주소 / 모든 역할의 사용자 / 상품 / 주문 / 배송 정보 / 운전자 배정을 지정한 규모로 빈 DB 에 적재한다.
+같은 --seed 이면 같은 데이터가 생성되므로 커밋 간 벤치마크 결과를 비교할 수 있다.
+
+    python -m bench.datagen --url sqlite:////tmp/bench.db --create-schema --orders 100000
+    python -m bench.datagen --url postgresql://user:pw@localhost/bench --orders 10000000
+
+PostgreSQL(psycopg / psycopg2)은 COPY, 그 외에는 executemany 로 배치 적재한다.
+모든 사용자의 비밀번호는 --password 값이며 login_id 는 customer1, seller1, logistic1, driver1 ... 형식이다.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+
+# 상태별 배송 비율 (Received, Processing, Shipped, Delivered)
+STATUS_WEIGHTS = (0.3, 0.3, 0.25, 0.15)
+
+TOWNS_PER_CITY = 20
+VILLAGES_PER_TOWN = 10
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed a synthetic delivery dataset for benchmarks")
+    parser.add_argument("--url", default=os.getenv("SQLALCHEMY_DATABASE_URL"), help="target database URL")
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--customers", type=int, help="default: orders / 10")
+    parser.add_argument("--sellers", type=int, help="default: orders / 1000 (min 5)")
+    parser.add_argument("--logistics", type=int, default=5)
+    parser.add_argument("--drivers", type=int, help="default: orders / 500 (min 10)")
+    parser.add_argument("--products", type=int, help="default: orders / 10")
+    parser.add_argument("--cities", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--create-schema", action="store_true", help="create tables with metadata.create_all")
+    args = parser.parse_args(argv)
+
+    if not args.url:
+        parser.error("--url or SQLALCHEMY_DATABASE_URL is required")
+    args.customers = args.customers or max(args.orders // 10, 10)
+    args.sellers = args.sellers or max(args.orders // 1000, 5)
+    args.drivers = args.drivers or max(args.orders // 500, 10)
+    args.products = args.products or max(args.orders // 10, 10)
+    return args
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Loader:
+    """테이블 단위 배치 적재 (PostgreSQL 은 COPY, 그 외 executemany)"""
+
+    def __init__(self, engine, batch_size):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.dialect = engine.dialect.name
+        self.counts = {}
+
+    def load(self, table, rows):
+        columns = [column.name for column in table.columns]
+        for chunk in _chunks(rows, self.batch_size):
+            with self.engine.begin() as connection:
+                if self.dialect == "postgresql":
+                    self._copy(connection, table.name, columns, chunk)
+                else:
+                    connection.execute(table.insert(), chunk)
+            self.counts[table.name] = self.counts.get(table.name, 0) + len(chunk)
+
+    def _copy(self, connection, table_name, columns, chunk):
+        cursor = connection.connection.dbapi_connection.cursor()
+        column_list = ", ".join(columns)
+        if hasattr(cursor, "copy"):
+            # psycopg 3
+            with cursor.copy(f"COPY {table_name} ({column_list}) FROM STDIN") as copy:
+                for row in chunk:
+                    copy.write_row([row.get(column) for column in columns])
+        else:
+            # psycopg2: CSV 의 따옴표 없는 빈 값은 NULL
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in chunk:
+                writer.writerow(["" if row.get(column) is None else row.get(column) for column in columns])
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {table_name} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def generate(args):
+    # app 모듈은 import 시점에 접속 URL 을 읽으므로 인자 처리 후 import
+    os.environ["SQLALCHEMY_DATABASE_URL"] = args.url
+    from sqlalchemy import func, select, text
+
+    from app.auth.password import pwd_context
+    from app.database import Base, engine
+    from app.delivery_view import rebuild_delivery_view
+    from app.models.models import Address, DeliveryInfo, DeliveryView, DriverDeliveryInfo, Order, Product, TrackingNumberCounter, User
+    from app.tracking import TRACKING_SERIAL_START, format_tracking_number
+
+    if args.create_schema:
+        Base.metadata.create_all(engine)
+
+    with engine.connect() as connection:
+        if connection.execute(select(func.count()).select_from(User.__table__)).scalar():
+            sys.exit("Target database is not empty; seed into a fresh database")
+        if engine.dialect.name == "sqlite":
+            connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+    rng = random.Random(args.seed)
+    loader = Loader(engine, args.batch_size)
+    password = pwd_context.hash(args.password)  # 모든 사용자가 같은 해시 사용 (생성 시간 단축)
+
+    # 1. 주소: 도시 x 구 x 동
+    cities = [f"City{index:02d}" for index in range(1, args.cities + 1)]
+    addresses = [
+        (city, f"Town{town:02d}", f"Village{village:02d}")
+        for city in cities
+        for town in range(1, TOWNS_PER_CITY + 1)
+        for village in range(1, VILLAGES_PER_TOWN + 1)
+    ]
+    loader.load(Address.__table__, (
+        {"address_id": address_id, "city": city, "town": town, "village": village}
+        for address_id, (city, town, village) in enumerate(addresses, start=1)
+    ))
+    address_count = len(addresses)
+    addresses_per_city = TOWNS_PER_CITY * VILLAGES_PER_TOWN
+
+    # 2. 사용자: 역할별로 연속된 user_id 구간
+    roles = [
+        ("CUSTOMER", "customer", args.customers),
+        ("SELLER", "seller", args.sellers),
+        ("LOGISTIC", "logistic", args.logistics),
+        ("DRIVER", "driver", args.drivers),
+    ]
+    user_ranges = {}
+    user_address = {}
+    next_user_id = 1
+
+    def user_rows():
+        nonlocal next_user_id
+        for role, prefix, count in roles:
+            user_ranges[role] = (next_user_id, next_user_id + count - 1)
+            for index in range(1, count + 1):
+                if role == "DRIVER":
+                    # 모든 도시에 운전자가 있도록 도시를 순환 배정
+                    address_id = (index - 1) % len(cities) * addresses_per_city + rng.randint(1, addresses_per_city)
+                else:
+                    address_id = rng.randint(1, address_count)
+                if role == "CUSTOMER":
+                    user_address[next_user_id] = address_id
+                yield {
+                    "user_id": next_user_id,
+                    "name": f"{prefix} {index}",
+                    "phone_number": f"010{next_user_id:08d}"[:15],
+                    "role": role,
+                    "address_id": address_id,
+                    "login_id": f"{prefix}{index}",
+                    "password": password
+                }
+                next_user_id += 1
+
+    loader.load(User.__table__, user_rows())
+
+    # 3. 상품
+    seller_first, seller_last = user_ranges["SELLER"]
+    loader.load(Product.__table__, (
+        {
+            "product_id": product_id,
+            "user_id": rng.randint(seller_first, seller_last),
+            "name": f"product {product_id} {rng.choice(['red', 'blue', 'green', 'black'])} {rng.choice(['widget', 'gadget', 'box', 'lamp'])}",
+            "description": f"description of product {product_id}",
+            "price": rng.randint(1, 1000) * 100
+        }
+        for product_id in range(1, args.products + 1)
+    ))
+
+    # 4. 주문 / 배송 정보 / 운전자 배정 (배치 단위로 생성하여 메모리 사용량을 일정하게 유지)
+    customer_first, customer_last = user_ranges["CUSTOMER"]
+    logistic_first, logistic_last = user_ranges["LOGISTIC"]
+    driver_first, driver_last = user_ranges["DRIVER"]
+    statuses = ("Received", "Processing", "Shipped", "Delivered")
+    serial = TRACKING_SERIAL_START
+
+    for start in range(1, args.orders + 1, args.batch_size):
+        orders, deliveries, driver_deliveries = [], [], []
+        for order_id in range(start, min(start + args.batch_size, args.orders + 1)):
+            customer_id = rng.randint(customer_first, customer_last)
+            address_id = user_address[customer_id]
+            delivery_status = rng.choices(statuses, STATUS_WEIGHTS)[0]
+            logistic_id = rng.randint(logistic_first, logistic_last) if delivery_status != "Received" else None
+            driver_id = rng.randint(driver_first, driver_last) if delivery_status in ("Shipped", "Delivered") else None
+            tracking_number = None
+            if logistic_id is not None:
+                tracking_number = format_tracking_number(serial)
+                serial += 1
+
+            orders.append({
+                "order_id": order_id,
+                "customer_id": customer_id,
+                "logistic_id": logistic_id,
+                "product_id": rng.randint(1, args.products),
+                "address_id": address_id
+            })
+            deliveries.append({
+                "delivery_id": order_id,
+                "order_id": order_id,
+                "driver_id": driver_id,
+                "logistic_id": logistic_id,
+                "tracking_number": tracking_number,
+                "delivery_status": delivery_status,
+                "delivery_address": address_id,
+                "version": statuses.index(delivery_status) + 1
+            })
+            # 배송 완료(Delivered)는 mark_delivered 와 같이 배정 기록이 삭제된 상태
+            if delivery_status == "Shipped":
+                driver_deliveries.append({"id": order_id, "driver_id": driver_id, "delivery_id": order_id})
+
+        loader.load(Order.__table__, orders)
+        loader.load(DeliveryInfo.__table__, deliveries)
+        loader.load(DriverDeliveryInfo.__table__, driver_deliveries)
+
+    # 5. 운송장 카운터 / 시퀀스 정리
+    with engine.begin() as connection:
+        counter = TrackingNumberCounter.__table__
+        connection.execute(counter.delete())
+        connection.execute(counter.insert().values(id=1, next_serial=serial))
+
+        if engine.dialect.name == "postgresql":
+            for table, column in (
+                ("address", "address_id"), ("users", "user_id"), ("products", "product_id"),
+                ("orders", "order_id"), ("deliveryinfo", "delivery_id"), ("driverdeliveryinfo", "id"),
+            ):
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+                    f"COALESCE((SELECT MAX({column}) FROM {table}), 1))"
+                ))
+    # 6. 목록 조회용 delivery_view 를 적재된 데이터로 구성
+    with engine.begin() as connection:
+        loader.counts[DeliveryView.__tablename__] = rebuild_delivery_view(connection)
+
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE"))
+        connection.commit()
+
+    return loader.counts
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    counts = generate(args)
+    print(json.dumps({
+        "seed": args.seed,
+        "rows": counts,
+        "seconds": round(time.perf_counter() - start, 2)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
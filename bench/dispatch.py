@@ -0,0 +1,67 @@
+"""자동 배차(plan_dispatch) 계획 시간 측정
+
+도시별로 흩어진 미배정 배송과 운전자를 만들어 plan_dispatch 한 번에 걸리는 시간을 측정한다.
+DB 조회 / UPDATE 를 제외한 배정 계산만 측정하며, --max-seconds 를 넘으면 종료 코드 1 로 끝난다.
+
+    python -m bench.dispatch --deliveries 50000 --drivers 1000 --max-seconds 1
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from app.dispatch import plan_dispatch
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure plan_dispatch planning time")
+    parser.add_argument("--deliveries", type=int, default=50_000)
+    parser.add_argument("--drivers", type=int, default=1_000)
+    parser.add_argument("--cities", type=int, default=20)
+    parser.add_argument("--max-load", type=int, help="per-driver cap (default: no cap)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-seconds", type=float, help="exit 1 if the best run is slower than this")
+    return parser.parse_args(argv)
+
+
+def build_inputs(deliveries: int, drivers: int, cities: int, seed: int):
+    rng = random.Random(seed)
+    names = [f"City{index:02d}" for index in range(1, cities + 1)]
+    delivery_rows = [(delivery_id, rng.choice(names)) for delivery_id in range(1, deliveries + 1)]
+    # datagen 과 같이 모든 도시에 운전자가 있도록 순환 배정
+    driver_rows = [(driver_id, names[(driver_id - 1) % cities]) for driver_id in range(1, drivers + 1)]
+    loads = {driver_id: rng.randint(0, 20) for driver_id, _ in driver_rows}
+    return delivery_rows, driver_rows, loads
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    deliveries, drivers, loads = build_inputs(args.deliveries, args.drivers, args.cities, args.seed)
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        assignments, unassigned = plan_dispatch(deliveries, drivers, loads, args.max_load)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(json.dumps({
+        "deliveries": args.deliveries,
+        "drivers": args.drivers,
+        "cities": args.cities,
+        "max_load": args.max_load,
+        "assigned": len(assignments),
+        "unassigned": len(unassigned),
+        "best_seconds": round(best, 4),
+        "median_seconds": round(sorted(timings)[len(timings) // 2], 4),
+        "deliveries_per_second": round(args.deliveries / best)
+    }, indent=2))
+
+    if args.max_seconds is not None and best > args.max_seconds:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
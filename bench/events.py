@@ -0,0 +1,142 @@
+"""배송 이벤트(SSE) fan-out 측정
+
+프로세스 내 EventHub 에 구독자 --subscribers 개를 만들고, 요청 스레드처럼 별도 스레드에서 hub.publish 로
+이벤트를 발행하여 발행 -> 구독자 큐 수신까지의 지연시간과 초당 전달 건수를 출력한다. DB 는 사용하지 않는다.
+
+targeted: 구독자마다 다른 사용자, 이벤트는 주문의 고객 / 판매자(구독자 2개)에게 전달
+broadcast: 모든 구독자가 한 사용자(예: 여러 탭을 연 판매자), 이벤트 하나가 모든 구독자에게 전달
+
+    python -m bench.events --subscribers 10000 --events 200 --rate 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure SSE event fan-out latency")
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--events", type=int, default=200, help="events per case")
+    parser.add_argument("--rate", type=float, default=50, help="published events per second")
+    parser.add_argument("--queue-size", type=int, default=100, help="per-subscriber queue size (EVENTS_QUEUE_SIZE)")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for delivery")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args(argv)
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+async def run_case(args, name: str) -> dict:
+    from app.events import EventHub
+
+    hub = EventHub(queue_size=args.queue_size)
+    broadcast = name == "broadcast"
+    user_ids = [0] * args.subscribers if broadcast else list(range(args.subscribers))
+    subscribers_per_user = args.subscribers if broadcast else 1
+
+    latencies_ms = []
+    state = {"received": 0, "disconnected": 0, "expected": None}
+    done = asyncio.Event()
+    ready = asyncio.Event()
+    subscribed = 0
+
+    async def consume(user_id):
+        nonlocal subscribed
+        async with hub.subscribe(user_id) as queue:
+            subscribed += 1
+            if subscribed == args.subscribers:
+                ready.set()
+            while True:
+                event = await queue.get()
+                if event is None:
+                    # 큐가 가득 차 끊긴 구독자
+                    state["disconnected"] += 1
+                    return
+                if event.get("stop"):
+                    return
+                latencies_ms.append((time.perf_counter() - event["published_at"]) * 1000)
+                state["received"] += 1
+                if state["received"] == state["expected"]:
+                    done.set()
+
+    consumers = [asyncio.create_task(consume(user_id)) for user_id in user_ids]
+    await ready.wait()
+
+    rng = random.Random(args.seed)
+    half = max(args.subscribers // 2, 1)
+    events = []
+    for index in range(args.events):
+        if broadcast:
+            customer_id, seller_id = 0, 0
+        else:
+            customer_id, seller_id = rng.randrange(half), half + rng.randrange(max(args.subscribers - half, 1))
+        events.append({"delivery_id": index, "delivery_status": "Shipped", "customer_id": customer_id, "seller_id": seller_id})
+    state["expected"] = sum(
+        subscribers_per_user * len({event["customer_id"], event["seller_id"]}) for event in events
+    )
+
+    def publish():
+        # 요청 처리 스레드에서 발행하는 것과 같은 경로 (call_soon_threadsafe)
+        interval = 1 / args.rate
+        start = time.perf_counter()
+        for index, event in enumerate(events):
+            delay = start + index * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            hub.publish(dict(event, published_at=time.perf_counter()))
+
+    start = time.perf_counter()
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    try:
+        await asyncio.wait_for(done.wait(), args.timeout)
+        timed_out = False
+    except asyncio.TimeoutError:
+        timed_out = True
+    elapsed = time.perf_counter() - start
+    publisher.join()
+
+    for user_id in set(user_ids):
+        hub.dispatch({"stop": True, "customer_id": user_id, "seller_id": user_id})
+    await asyncio.gather(*consumers)
+
+    report = {
+        "subscribers": args.subscribers,
+        "events": args.events,
+        "expected_deliveries": state["expected"],
+        "deliveries": state["received"],
+        "disconnected_subscribers": state["disconnected"],
+        "timed_out": timed_out,
+        "seconds": round(elapsed, 2),
+        "deliveries_per_sec": round(state["received"] / elapsed, 1)
+    }
+    if latencies_ms:
+        report["latency_ms"] = {
+            "p50": round(_percentile(latencies_ms, 50), 3),
+            "p95": round(_percentile(latencies_ms, 95), 3),
+            "p99": round(_percentile(latencies_ms, 99), 3),
+            "max": round(max(latencies_ms), 3)
+        }
+    return report
+
+
+async def run(args) -> dict:
+    return {name: await run_case(args, name) for name in ("targeted", "broadcast")}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # app.events 는 import 시점에 DB 엔진을 만들므로 URL 이 없으면 메모리 DB 사용 (실제 접속은 하지 않음)
+    os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite://")
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""hot path 인덱스 revision 적용 전/후 실행 계획과 쿼리 시간 비교
+
+빈 DB 를 alembic upgrade head 로 만들고 bench.datagen 으로 데이터를 적재한 뒤, 라우터가 사용하는 필터 / 조인
+쿼리를 head 와 인덱스 revision 직전(downgrade <revision>-1)에서 각각 EXPLAIN 하고 실행 시간을 측정한다.
+SQLite 는 EXPLAIN QUERY PLAN, PostgreSQL 은 EXPLAIN ANALYZE 결과를 출력한다.
+
+    python -m bench.explain --url sqlite:////tmp/explain.db --orders 100000
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+from bench import datagen
+
+# 인덱스를 추가한 revision (alembic/versions/3be34a1953d8_add_hot_path_indexes.py)
+INDEX_REVISION = "3be34a1953d8"
+
+# (이름, SQL, 파라미터 이름) - 파라미터 값은 적재된 데이터에서 선택
+HOT_QUERIES = (
+    ("orders by customer_id", "SELECT order_id, product_id FROM orders WHERE customer_id = :customer_id", "customer_id"),
+    ("orders by product_id", "SELECT order_id FROM orders WHERE product_id = :product_id", "product_id"),
+    ("products by seller", "SELECT product_id, name, price FROM products WHERE user_id = :seller_id", "seller_id"),
+    ("delivery by order_id", "SELECT delivery_id, delivery_status FROM deliveryinfo WHERE order_id = :order_id", "order_id"),
+    ("deliveries by logistic", "SELECT delivery_id FROM deliveryinfo WHERE logistic_id = :logistic_id", "logistic_id"),
+    (
+        "delivery by tracking_number",
+        "SELECT delivery_status FROM deliveryinfo WHERE tracking_number = :tracking_number",
+        "tracking_number"
+    ),
+    ("assignments by driver", "SELECT delivery_id FROM driverdeliveryinfo WHERE driver_id = :driver_id", "driver_id"),
+    ("user by login_id", "SELECT user_id, password FROM users WHERE login_id = :login_id", "login_id"),
+    (
+        "drivers by city",
+        "SELECT u.user_id FROM users u JOIN address a ON a.address_id = u.address_id "
+        "WHERE u.role = 'DRIVER' AND a.city = :city",
+        "city"
+    ),
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN hot filters before and after the index revision")
+    parser.add_argument("--url", default=os.getenv("SQLALCHEMY_DATABASE_URL"), help="empty target database URL")
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20, help="executions per query (median is reported)")
+    parser.add_argument("--revision", default=INDEX_REVISION, help="revision whose effect is measured")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="also write the full report as JSON")
+    args = parser.parse_args(argv)
+    if not args.url:
+        parser.error("--url or SQLALCHEMY_DATABASE_URL is required")
+    return args
+
+
+def _sample_params(connection) -> dict:
+    from sqlalchemy import text
+
+    def scalar(sql):
+        return connection.execute(text(sql)).scalar()
+
+    return {
+        "customer_id": scalar("SELECT customer_id FROM orders ORDER BY order_id LIMIT 1"),
+        "product_id": scalar("SELECT product_id FROM orders ORDER BY order_id LIMIT 1"),
+        "seller_id": scalar("SELECT user_id FROM products ORDER BY product_id LIMIT 1"),
+        "order_id": scalar("SELECT MAX(order_id) / 2 FROM orders"),
+        "logistic_id": scalar("SELECT user_id FROM users WHERE role = 'LOGISTIC' ORDER BY user_id LIMIT 1"),
+        "tracking_number": scalar(
+            "SELECT tracking_number FROM deliveryinfo WHERE logistic_id IS NOT NULL ORDER BY delivery_id DESC LIMIT 1"
+        ),
+        "driver_id": scalar("SELECT driver_id FROM driverdeliveryinfo ORDER BY id LIMIT 1"),
+        "login_id": scalar("SELECT login_id FROM users ORDER BY user_id DESC LIMIT 1"),
+        "city": scalar("SELECT city FROM address ORDER BY address_id LIMIT 1"),
+    }
+
+
+def measure(engine, params: dict, repeat: int) -> dict:
+    from sqlalchemy import text
+
+    postgres = engine.dialect.name == "postgresql"
+    results = {}
+    with engine.connect() as connection:
+        connection.execute(text("ANALYZE"))
+        for name, sql, param in HOT_QUERIES:
+            bind = {param: params[param]}
+            if postgres:
+                plan = [row[0] for row in connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), bind)]
+            else:
+                plan = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), bind)]
+
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                connection.execute(text(sql), bind).fetchall()
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = {"plan": plan, "median_ms": round(statistics.median(timings), 3)}
+        connection.rollback()
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # app / alembic env 는 import 시점에 접속 URL 을 읽으므로 인자 처리 후 import
+    os.environ["SQLALCHEMY_DATABASE_URL"] = args.url
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import text
+
+    from app.database import engine
+
+    config = Config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini"))
+    command.upgrade(config, "head")
+    datagen.generate(datagen.parse_args(["--url", args.url, "--orders", str(args.orders), "--seed", str(args.seed)]))
+
+    # 인덱스 revision 이전 스키마는 tracking_number NOT NULL 이므로, 양쪽 측정 데이터가 같도록 먼저 임시 번호를 채움
+    with engine.begin() as connection:
+        connection.execute(text(
+            "UPDATE deliveryinfo SET tracking_number = 'PENDING-' || delivery_id WHERE tracking_number IS NULL"
+        ))
+    with engine.connect() as connection:
+        params = _sample_params(connection)
+
+    after = measure(engine, params, args.repeat)
+    engine.dispose()
+    command.downgrade(config, f"{args.revision}-1")
+    before = measure(engine, params, args.repeat)
+    engine.dispose()
+    command.upgrade(config, "head")
+
+    report = {"dialect": engine.dialect.name, "orders": args.orders, "revision": args.revision, "queries": {}}
+    for name, _, _ in HOT_QUERIES:
+        report["queries"][name] = {
+            "before": before[name],
+            "after": after[name],
+            "speedup": round(before[name]["median_ms"] / max(after[name]["median_ms"], 0.001), 1)
+        }
+        print(f"== {name}: {before[name]['median_ms']} ms -> {after[name]['median_ms']} ms "
+              f"(x{report['queries'][name]['speedup']})")
+        width = max(len(line) for line in before[name]["plan"] + ["before"])
+        print(f"  {'before'.ljust(width)} | after")
+        for index in range(max(len(before[name]["plan"]), len(after[name]["plan"]))):
+            left = before[name]["plan"][index] if index < len(before[name]["plan"]) else ""
+            right = after[name]["plan"][index] if index < len(after[name]["plan"]) else ""
+            print(f"  {left.ljust(width)} | {right}")
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
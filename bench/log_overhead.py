@@ -0,0 +1,80 @@
+"""요청 로그 방식별 호출 비용 비교
+
+요청 처리 스레드에서 매 요청 print 하는 방식과 app.log 의 큐 기반 JSON 로거(샘플링 / 전체 기록)를
+같은 스레드 수로 실행하여 초당 처리 가능한 로그 호출 수를 비교한다.
+stdout 을 실제 운영과 같은 대상(파이프, 파일, 터미널)으로 보내고 실행해야 의미 있는 값이 나온다.
+
+    python -m bench.log_overhead --threads 16 --calls 20000 > /tmp/log_overhead.out
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare print-per-request with the queue-backed logger")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--calls", type=int, default=20_000, help="log calls per thread")
+    parser.add_argument("--sample-rate", type=float, default=0.01)
+    return parser.parse_args(argv)
+
+
+def _measure(threads: int, calls: int, emit) -> float:
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for index in range(calls):
+            emit(index)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * calls / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # 로거 설정은 import 시점에 환경 변수를 읽음
+    os.environ["LOG_SUCCESS_SAMPLE_RATE"] = str(args.sample_rate)
+    from app import log
+
+    log.setup_logging()
+    logger = logging.getLogger("app.request")
+    route = "GET /customers/product_list"
+
+    def print_per_request(index):
+        print("DB Connection Success")
+
+    def logger_all(index):
+        logger.info("request", extra={"route": route, "status": 200, "duration_ms": 1.0})
+
+    def logger_sampled(index):
+        # RequestLoggingMiddleware 와 같은 판단 (샘플링에서 빠지면 레코드를 만들지 않음)
+        if random.random() < log.ROUTE_SAMPLE_RATES.get(route, log.LOG_SUCCESS_SAMPLE_RATE):
+            logger_all(index)
+
+    results = {}
+    for name, emit in (("print", print_per_request), ("logger_all", logger_all), ("logger_sampled", logger_sampled)):
+        results[name] = round(_measure(args.threads, args.calls, emit))
+        sys.stdout.flush()
+
+    print(json.dumps({
+        "threads": args.threads,
+        "calls_per_thread": args.calls,
+        "sample_rate": args.sample_rate,
+        "calls_per_second": results
+    }, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
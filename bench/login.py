@@ -0,0 +1,83 @@
+"""로그인 처리량 vs 비밀번호 워커 수 측정
+
+PASSWORD_POOL_WORKERS 를 바꿔가며 bench.runner 의 users 시나리오(POST /users/login)를 별도 프로세스로 실행하고
+워커 수별 성공 로그인 처리량(success_rps)과 지연시간을 비교한다. 워커 풀 설정은 import 시점에 읽으므로
+실행마다 새 프로세스를 사용한다. bench.datagen 으로 생성한 DB 가 필요하다.
+
+    python -m bench.login --url sqlite:////tmp/bench.db --workers 1,2,4,8 --kind process
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+
+def parse_args(argv=None):
+    # 1, 2, 4 ... 코어 수
+    cpus = os.cpu_count() or 1
+    default_workers = sorted({2 ** power for power in range(cpus.bit_length())} | {cpus})
+    parser = argparse.ArgumentParser(description="Measure login throughput against password pool size")
+    parser.add_argument("--url", default=os.getenv("SQLALCHEMY_DATABASE_URL"), help="database seeded by bench.datagen")
+    parser.add_argument("--workers", default=",".join(map(str, default_workers)), help="comma separated pool sizes")
+    parser.add_argument("--kind", default="process", choices=("process", "thread"))
+    parser.add_argument("--requests", type=int, default=200, help="logins per pool size")
+    parser.add_argument("--concurrency-per-worker", type=int, default=2,
+                        help="concurrent logins per pool worker (keep below the pool's max pending)")
+    parser.add_argument("--password", default="bench")
+    args = parser.parse_args(argv)
+    if not args.url:
+        parser.error("--url or SQLALCHEMY_DATABASE_URL is required")
+    args.workers = [int(value) for value in args.workers.split(",")]
+    return args
+
+
+def run_pool_size(args, workers: int) -> dict:
+    env = dict(os.environ, PASSWORD_POOL_WORKERS=str(workers), PASSWORD_POOL_KIND=args.kind)
+    with tempfile.NamedTemporaryFile(suffix=".json") as output:
+        subprocess.run(
+            [
+                sys.executable, "-m", "bench.runner",
+                "--url", args.url,
+                "--scenario", "users",
+                "--requests", str(args.requests),
+                "--warmup", str(workers * 2),
+                "--concurrency", str(workers * args.concurrency_per_worker),
+                "--password", args.password,
+                "--output", output.name
+            ],
+            env=env, check=True, stdout=subprocess.DEVNULL
+        )
+        report = json.load(output)
+
+    endpoint = report["endpoints"].get("POST /users/login", {})
+    return {
+        "workers": workers,
+        "concurrency": report["concurrency"],
+        "success_rps": report["success_rps"],
+        "status_codes": report["status_codes"],
+        "p50_ms": endpoint.get("p50_ms"),
+        "p95_ms": endpoint.get("p95_ms")
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = [run_pool_size(args, workers) for workers in args.workers]
+
+    # 워커 1개 대비 확장 효율 (1.0 이면 워커 수에 비례)
+    base = results[0]["success_rps"] / results[0]["workers"] if results and results[0]["success_rps"] else None
+    for result in results:
+        result["scaling_efficiency"] = round(result["success_rps"] / (base * result["workers"]), 2) if base else None
+
+    print(json.dumps({
+        "cpu_count": os.cpu_count(),
+        "pool_kind": args.kind,
+        "bcrypt_rounds": int(os.getenv("BCRYPT_ROUNDS", "12")),
+        "results": results
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""주문 생성 처리량: 단건 POST /customers/buy vs 일괄 POST /customers/buy_batch
+
+bench.runner 로 단건 주문과 batch 크기별 일괄 주문을 차례로 실행하고 초당 생성된 주문 수를 비교한다.
+주문을 실제로 생성하므로 bench.datagen 으로 만든 벤치마크 전용 DB 에서 실행한다.
+
+    python -m bench.orders --url sqlite:////tmp/bench.db --batch-sizes 10,50,100
+"""
+import argparse
+import asyncio
+import json
+import os
+
+from bench import runner
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare single and batch order placement throughput")
+    parser.add_argument("--url", default=os.getenv("SQLALCHEMY_DATABASE_URL"), help="database seeded by bench.datagen")
+    parser.add_argument("--batch-sizes", default="10,50,100", help="comma separated orders per buy_batch request")
+    parser.add_argument("--requests", type=int, default=300, help="requests per run")
+    parser.add_argument("--concurrency", type=int, default=4, help="SQLite allows one writer at a time; raise for PostgreSQL")
+    args = parser.parse_args(argv)
+    if not args.url:
+        parser.error("--url or SQLALCHEMY_DATABASE_URL is required")
+    args.batch_sizes = [int(value) for value in args.batch_sizes.split(",")]
+    return args
+
+
+def measure(args, name: str, build, batch_size: int) -> dict:
+    run_args = runner.parse_args([
+        "--url", args.url, "--requests", str(args.requests), "--concurrency", str(args.concurrency), "--warmup", "20"
+    ])
+    run_args.scenario = name
+    run_args.batch_size = batch_size
+    report = asyncio.run(runner.run(run_args, [(build, 1, True)]))
+    endpoint = next(iter(report["endpoints"].values()))
+    return {
+        "endpoint": name,
+        "orders_per_request": batch_size,
+        "requests_per_second": report["success_rps"],
+        "orders_per_second": round(report["success_rps"] * batch_size, 2),
+        "p50_ms": endpoint["p50_ms"],
+        "p95_ms": endpoint["p95_ms"],
+        "queries_per_request": endpoint["queries_per_request"],
+        "status_codes": report["status_codes"]
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = [measure(args, "POST /customers/buy", runner.customer_buy, 1)]
+    results += [
+        measure(args, "POST /customers/buy_batch", runner.customer_buy_batch, batch_size)
+        for batch_size in args.batch_sizes
+    ]
+    print(json.dumps({"requests": args.requests, "concurrency": args.concurrency, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
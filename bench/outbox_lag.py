@@ -0,0 +1,123 @@
+"""아웃박스 이벤트 처리 지연(lag) 측정
+
+요청 스레드처럼 이벤트를 기록 + commit + notify 하고, 같은 프로세스의 OutboxWorker 가 처리하기까지 걸린
+시간(created_at -> processed_at)의 분포를 출력한다. 빈 DB 에 실행한다.
+
+    python -m bench.outbox_lag --url sqlite:////tmp/outbox.db --create-schema --events 2000 --rate 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure outbox insert-to-handled lag")
+    parser.add_argument("--url", default=os.getenv("SQLALCHEMY_DATABASE_URL"), help="target database URL")
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--rate", type=float, default=200, help="events per second")
+    parser.add_argument("--per-commit", type=int, default=1, help="events written per transaction")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--create-schema", action="store_true", help="create tables with metadata.create_all")
+    args = parser.parse_args(argv)
+    if not args.url:
+        parser.error("--url or SQLALCHEMY_DATABASE_URL is required")
+    return args
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percent / 100), len(ordered) - 1)]
+
+
+async def run(args):
+    from starlette.concurrency import run_in_threadpool
+
+    from app.database import SessionLocal
+    from app.models.models import OutboxEvent
+    from app.outbox import DONE, OutboxWorker, enqueue_events, outbox_handler
+
+    @outbox_handler("bench_lag")
+    def _handle(db, payload):
+        pass
+
+    run_id = uuid.uuid4().hex
+
+    def write(first):
+        db = SessionLocal()
+        try:
+            enqueue_events(db, "bench_lag", [
+                (f"bench_lag:{run_id}:{index}", {"index": index})
+                for index in range(first, min(first + args.per_commit, args.events))
+            ])
+            db.commit()
+        finally:
+            db.close()
+
+    worker = OutboxWorker(poll_interval=args.poll_interval)
+    worker.start()
+    try:
+        interval = args.per_commit / args.rate
+        start = time.perf_counter()
+        for batch, first in enumerate(range(0, args.events, args.per_commit)):
+            # 목표 속도에 맞춰 기록
+            delay = start + batch * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await run_in_threadpool(write, first)
+            worker.notify()
+
+        def remaining():
+            db = SessionLocal()
+            try:
+                return db.query(OutboxEvent).filter(
+                    OutboxEvent.idempotency_key.like(f"bench_lag:{run_id}:%"), OutboxEvent.status != DONE
+                ).count()
+            finally:
+                db.close()
+
+        while await run_in_threadpool(remaining):
+            await asyncio.sleep(0.05)
+        elapsed = time.perf_counter() - start
+    finally:
+        await worker.stop()
+
+    db = SessionLocal()
+    try:
+        rows = db.query(OutboxEvent.created_at, OutboxEvent.processed_at).filter(
+            OutboxEvent.idempotency_key.like(f"bench_lag:{run_id}:%")
+        ).all()
+    finally:
+        db.close()
+
+    lags_ms = [(processed_at - created_at).total_seconds() * 1000 for created_at, processed_at in rows]
+    return {
+        "events": len(lags_ms),
+        "target_rate": args.rate,
+        "per_commit": args.per_commit,
+        "seconds": round(elapsed, 2),
+        "lag_ms": {
+            "p50": round(_percentile(lags_ms, 50), 2),
+            "p95": round(_percentile(lags_ms, 95), 2),
+            "p99": round(_percentile(lags_ms, 99), 2),
+            "max": round(max(lags_ms), 2)
+        }
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # app 모듈은 import 시점에 접속 URL 을 읽으므로 인자 처리 후 import
+    os.environ["SQLALCHEMY_DATABASE_URL"] = args.url
+    if args.create_schema:
+        from app.database import Base, engine
+        from app.models import models  # noqa: F401 - 테이블 등록
+
+        Base.metadata.create_all(engine)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,496 @@
+"""인프로세스 벤치마크 러너
+
+httpx ASGITransport 로 app.main.app 을 직접 호출하여 역할별 시나리오를 실행하고,
+엔드포인트별 p50 / p95 / p99 지연시간, 처리량, 요청당 SQL 실행 수(Server-Timing)를 JSON 으로 기록한다.
+
+    python -m bench.runner --url sqlite:////tmp/bench.db --scenario mixed --requests 5000 --output after.json
+    python -m bench.runner --url sqlite:////tmp/bench.db --scenario mixed --compare before.json
+
+--compare 로 이전 결과를 주면 엔드포인트별 p95 / 쿼리 수 변화를 출력하고,
+--fail-threshold 를 넘는 p95 회귀가 있으면 종료 코드 1 을 반환한다.
+
+쓰기 시나리오(writes, dispatch)는 상태 전이 대상 배송을 미리 골라 요청마다 한 번씩만 사용하므로
+커밋 간 비교는 같은 --seed 로 새로 생성한 DB 에서 실행해야 한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+# 사용자 샘플 크기 (역할별로 토큰을 미리 발급)
+USER_SAMPLE_SIZE = 200
+TRACKING_SAMPLE_SIZE = 1000
+
+# 일괄 요청 한 번에 담는 건수
+BUY_BATCH_MAX_ITEMS = 5
+ASSIGN_BATCH_SIZE = 20
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run in-process API benchmarks")
+    parser.add_argument("--url", default=os.getenv("SQLALCHEMY_DATABASE_URL"), help="database seeded by bench.datagen")
+    parser.add_argument("--scenario", default="mixed", choices=sorted(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=50, help="requests run before measuring")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--read-only", action="store_true", help="skip endpoints that write")
+    parser.add_argument("--password", default="bench", help="password of the seeded users (bench.datagen --password)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="orders per buy_batch / assignments per assign_drivers request (default: varied / 20)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--fail-threshold", type=float, default=None,
+                        help="exit 1 if any endpoint's p95 regresses by more than this percent")
+    args = parser.parse_args(argv)
+    if not args.url:
+        parser.error("--url or SQLALCHEMY_DATABASE_URL is required")
+    return args
+
+
+class Fixture:
+    """시나리오에서 사용할 사용자 토큰 / 상품 / 도시 / 운송장 번호 / 상태 전이 대상 샘플"""
+
+    def __init__(self, rng: random.Random, password: str = "bench", batch_size: Optional[int] = None):
+        self.rng = rng
+        self.password = password
+        self.batch_size = batch_size
+        self.tokens: Dict[str, List[str]] = {}
+        self.user_ids: Dict[str, List[int]] = {}
+        self.user_tokens: Dict[int, str] = {}  # user_id -> token
+        self.login_ids: List[str] = []
+        self.customers: List[Tuple[str, str]] = []  # (name, phone_number)
+        self.product_ids: List[int] = []
+        self.cities: List[str] = []
+        self.tracking_numbers: List[int] = []
+        # 쓰기 요청 대상 (요청마다 하나씩 꺼내 같은 배송을 두 번 전이하지 않음)
+        self.received_orders: List[Tuple[int, int]] = []  # (seller_id, order_id)
+        self.processing: Dict[int, List[int]] = defaultdict(list)  # logistic_id -> delivery_id
+        self.shipped: List[Tuple[int, int]] = []  # (driver_id, delivery_id)
+
+    def load(self, pool_size: int):
+        from sqlalchemy.orm import joinedload
+
+        from app.auth.auth import build_user_claims, create_access_token
+        from app.database import SessionLocal
+        from app.delivery_status import PROCESSING, RECEIVED, SHIPPED
+        from app.models.models import Address, DeliveryInfo, Order, Product, User
+
+        db = SessionLocal()
+        try:
+            for role in ("CUSTOMER", "SELLER", "LOGISTIC", "DRIVER"):
+                users = (
+                    db.query(User)
+                    .options(joinedload(User.user_address))
+                    .filter(User.role == role)
+                    .order_by(User.user_id)
+                    .limit(USER_SAMPLE_SIZE)
+                    .all()
+                )
+                if not users:
+                    sys.exit(f"No {role} users found; seed the database with bench.datagen first")
+                self.tokens[role] = [create_access_token(build_user_claims(user)) for user in users]
+                self.user_ids[role] = [user.user_id for user in users]
+                self.user_tokens.update(zip(self.user_ids[role], self.tokens[role]))
+                self.login_ids.extend(user.login_id for user in users)
+                if role == "CUSTOMER":
+                    self.customers = [(user.name, user.phone_number) for user in users]
+
+            self.product_ids = [row.product_id for row in db.query(Product.product_id).limit(USER_SAMPLE_SIZE)]
+            self.cities = [row.city for row in db.query(Address.city).distinct()]
+            self.tracking_numbers = [
+                int(row.tracking_number)
+                for row in db.query(DeliveryInfo.tracking_number)
+                .filter(DeliveryInfo.tracking_number.isnot(None))
+                .limit(TRACKING_SAMPLE_SIZE)
+            ]
+
+            self.received_orders = [
+                (row.seller_id, row.order_id)
+                for row in db.query(Product.user_id.label("seller_id"), Order.order_id)
+                .join(DeliveryInfo, DeliveryInfo.order_id == Order.order_id)
+                .join(Product, Product.product_id == Order.product_id)
+                .filter(DeliveryInfo.delivery_status == RECEIVED, Product.user_id.in_(self.user_ids["SELLER"]))
+                .order_by(Order.order_id)
+                .limit(pool_size)
+            ]
+            for row in (
+                db.query(DeliveryInfo.logistic_id, DeliveryInfo.delivery_id)
+                .filter(
+                    DeliveryInfo.delivery_status == PROCESSING,
+                    DeliveryInfo.logistic_id.in_(self.user_ids["LOGISTIC"])
+                )
+                .order_by(DeliveryInfo.delivery_id)
+                .limit(pool_size * (self.batch_size or ASSIGN_BATCH_SIZE))
+            ):
+                self.processing[row.logistic_id].append(row.delivery_id)
+            self.shipped = [
+                (row.driver_id, row.delivery_id)
+                for row in db.query(DeliveryInfo.driver_id, DeliveryInfo.delivery_id)
+                .filter(DeliveryInfo.delivery_status == SHIPPED, DeliveryInfo.driver_id.in_(self.user_ids["DRIVER"]))
+                .order_by(DeliveryInfo.delivery_id)
+                .limit(pool_size)
+            ]
+        finally:
+            db.close()
+
+        self.rng.shuffle(self.received_orders)
+        self.rng.shuffle(self.shipped)
+
+    def headers(self, role: str) -> dict:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens[role])}"}
+
+    def user_headers(self, user_id: int) -> dict:
+        return {"Authorization": f"Bearer {self.user_tokens[user_id]}"}
+
+    def take(self, pool: list, what: str):
+        if not pool:
+            sys.exit(f"Ran out of {what}; reseed the database or lower --requests")
+        return pool.pop()
+
+    def take_processing(self, count: int) -> Tuple[int, List[int]]:
+        # 한 물류사의 Processing 배송을 최대 count 건
+        logistic_ids = [logistic_id for logistic_id, deliveries in self.processing.items() if deliveries]
+        if not logistic_ids:
+            sys.exit("Ran out of Processing deliveries; reseed the database or lower --requests")
+        logistic_id = self.rng.choice(logistic_ids)
+        deliveries = self.processing[logistic_id]
+        taken = [deliveries.pop() for _ in range(min(count, len(deliveries)))]
+        return logistic_id, taken
+
+
+# 요청 하나 = (이름, method, url, kwargs)
+Request = Tuple[str, str, str, dict]
+
+
+def customer_product_list(f: Fixture) -> Request:
+    params = {"limit": 50}
+    if f.rng.random() < 0.3:
+        params["q"] = f.rng.choice(["red", "blue", "widget", "lamp"])
+    return "GET /customers/product_list", "GET", "/customers/product_list", {"params": params}
+
+
+def customer_purchased_products(f: Fixture) -> Request:
+    return "GET /customers/purchased_products", "GET", "/customers/purchased_products", {"headers": f.headers("CUSTOMER")}
+
+
+def customer_delivery_status(f: Fixture) -> Request:
+    return "GET /customers/delivery_status", "GET", "/customers/delivery_status", {"headers": f.headers("CUSTOMER")}
+
+
+def customer_bought_list(f: Fixture) -> Request:
+    name, phone_number = f.rng.choice(f.customers)
+    return "POST /customers/bought_list", "POST", "/customers/bought_list", {
+        "json": {"name": name, "phone_number": phone_number}
+    }
+
+
+def customer_buy(f: Fixture) -> Request:
+    return "POST /customers/buy", "POST", "/customers/buy", {
+        "params": {"product_id": f.rng.choice(f.product_ids)}, "headers": f.headers("CUSTOMER")
+    }
+
+
+def customer_buy_batch(f: Fixture) -> Request:
+    if f.batch_size:
+        # 주문 수를 고정 (orders/sec 비교용)
+        items = [{"product_id": f.rng.choice(f.product_ids), "quantity": 1} for _ in range(f.batch_size)]
+    else:
+        items = [
+            {"product_id": f.rng.choice(f.product_ids), "quantity": f.rng.randint(1, 3)}
+            for _ in range(f.rng.randint(1, BUY_BATCH_MAX_ITEMS))
+        ]
+    return "POST /customers/buy_batch", "POST", "/customers/buy_batch", {
+        "json": {"items": items}, "headers": f.headers("CUSTOMER")
+    }
+
+
+def users_login(f: Fixture) -> Request:
+    return "POST /users/login", "POST", "/users/login", {
+        "json": {"login_id": f.rng.choice(f.login_ids), "password": f.password}
+    }
+
+
+def seller_orders(f: Fixture) -> Request:
+    return "GET /seller/orders", "GET", "/seller/orders", {"headers": f.headers("SELLER")}
+
+
+def seller_delivery_statuses(f: Fixture) -> Request:
+    numbers = f.rng.sample(f.tracking_numbers, min(20, len(f.tracking_numbers)))
+    return "POST /seller/get_delivery_statuses", "POST", "/seller/get_delivery_statuses", {
+        "json": {"tracking_numbers": numbers}
+    }
+
+
+def seller_select_logistic(f: Fixture) -> Request:
+    seller_id, order_id = f.take(f.received_orders, "Received orders")
+    return "POST /seller/select_logistic", "POST", "/seller/select_logistic", {
+        "json": {"order_id": order_id, "logistic_id": f.rng.choice(f.user_ids["LOGISTIC"])},
+        "headers": f.user_headers(seller_id)
+    }
+
+
+def logistic_summary(f: Fixture) -> Request:
+    return "GET /logistic/deliveries?summary", "GET", "/logistic/deliveries", {
+        "params": {"summary": "true"}, "headers": f.headers("LOGISTIC")
+    }
+
+
+def logistic_city(f: Fixture) -> Request:
+    return "GET /logistic/deliveries?city", "GET", "/logistic/deliveries", {
+        "params": {"city": f.rng.choice(f.cities), "limit": 100}, "headers": f.headers("LOGISTIC")
+    }
+
+
+def logistic_by_city(f: Fixture) -> Request:
+    return "GET /logistic/by_city", "GET", "/logistic/by_city", {"params": {"city": f.rng.choice(f.cities)}}
+
+
+def logistic_assign_driver(f: Fixture) -> Request:
+    logistic_id, (delivery_id,) = f.take_processing(1)
+    return "POST /logistic/assign_driver", "POST", "/logistic/assign_driver", {
+        "json": {"delivery_id": delivery_id, "driver_id": f.rng.choice(f.user_ids["DRIVER"])},
+        "headers": f.user_headers(logistic_id)
+    }
+
+
+def logistic_assign_drivers(f: Fixture) -> Request:
+    logistic_id, delivery_ids = f.take_processing(f.batch_size or ASSIGN_BATCH_SIZE)
+    assignments = [{"delivery_id": delivery_id, "driver_id": f.rng.choice(f.user_ids["DRIVER"])} for delivery_id in delivery_ids]
+    return "POST /logistic/assign_drivers", "POST", "/logistic/assign_drivers", {
+        "json": {"assignments": assignments}, "headers": f.user_headers(logistic_id)
+    }
+
+
+def logistic_auto_dispatch(f: Fixture) -> Request:
+    # 첫 호출이 물류사의 미배정 배송을 모두 배정하므로 이후 호출은 조회 비용 위주
+    return "POST /logistic/auto_dispatch", "POST", "/logistic/auto_dispatch", {
+        "json": {"max_load_per_driver": 100}, "headers": f.headers("LOGISTIC")
+    }
+
+
+def driver_deliveries(f: Fixture) -> Request:
+    return "GET /driver/deliveries", "GET", "/driver/deliveries", {"headers": f.headers("DRIVER")}
+
+
+def driver_mark_delivered(f: Fixture) -> Request:
+    driver_id, delivery_id = f.take(f.shipped, "Shipped deliveries")
+    return "POST /driver/mark_delivered", "POST", "/driver/mark_delivered", {
+        "json": {"delivery_id": delivery_id}, "headers": f.user_headers(driver_id)
+    }
+
+
+# 시나리오: (요청 생성 함수, 가중치, 쓰기 여부)
+Operation = Tuple[Callable[[Fixture], Request], float, bool]
+
+SCENARIOS: Dict[str, List[Operation]] = {
+    "customer": [
+        (customer_product_list, 50, False),
+        (customer_purchased_products, 15, False),
+        (customer_delivery_status, 15, False),
+        (customer_bought_list, 10, False),
+        (customer_buy, 7, True),
+        (customer_buy_batch, 3, True),
+    ],
+    "seller": [
+        (seller_orders, 60, False),
+        (seller_delivery_statuses, 40, False),
+    ],
+    "logistic": [
+        (logistic_summary, 30, False),
+        (logistic_city, 50, False),
+        (logistic_by_city, 20, False),
+    ],
+    "driver": [
+        (driver_deliveries, 100, False),
+    ],
+    # 로그인 (bcrypt 검증 워커 풀)
+    "users": [
+        (users_login, 100, False),
+    ],
+    # 모든 쓰기 경로 (배송 상태 전이 포함)
+    "writes": [
+        (customer_buy, 15, True),
+        (customer_buy_batch, 15, True),
+        (seller_select_logistic, 20, True),
+        (logistic_assign_driver, 20, True),
+        (logistic_assign_drivers, 10, True),
+        (driver_mark_delivered, 20, True),
+    ],
+    "dispatch": [
+        (logistic_auto_dispatch, 100, True),
+    ],
+}
+# delivery_view 를 읽는 목록 조회 엔드포인트만 (읽기 모델 변경 전후 비교용)
+SCENARIOS["listing"] = [
+    (driver_deliveries, 40, False),
+    (seller_orders, 30, False),
+    (logistic_city, 20, False),
+    (logistic_summary, 10, False),
+]
+# 공개 상품 목록만 (카탈로그 캐시 on/off 비교용)
+SCENARIOS["catalog"] = [
+    (customer_product_list, 1, False),
+]
+# 실제 트래픽 비율: 고객 > 판매자 > 운전자 > 물류
+SCENARIOS["mixed"] = (
+    [(build, weight * 0.6, writes) for build, weight, writes in SCENARIOS["customer"]]
+    + [(build, weight * 0.2, writes) for build, weight, writes in SCENARIOS["seller"]]
+    + [(build, weight * 0.1, writes) for build, weight, writes in SCENARIOS["driver"]]
+    + [(build, weight * 0.1, writes) for build, weight, writes in SCENARIOS["logistic"]]
+)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    # nearest-rank
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def summarize(samples: List[Tuple[float, int, Optional[int]]]) -> dict:
+    latencies = [latency * 1000 for latency, _, _ in samples]
+    queries = [count for _, _, count in samples if count is not None]
+    return {
+        "count": len(samples),
+        "errors": sum(1 for _, status_code, _ in samples if status_code >= 500),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None
+    }
+
+
+async def run(args, operations: Optional[List[Operation]] = None) -> dict:
+    """args.scenario 의 요청(또는 직접 지정한 operations)을 실행하고 보고서를 반환 (다른 bench 스크립트에서도 사용)"""
+    os.environ["SQLALCHEMY_DATABASE_URL"] = args.url
+    import httpx
+
+    from app.main import app
+
+    rng = random.Random(args.seed)
+    fixture = Fixture(rng, args.password, args.batch_size)
+    fixture.load(args.warmup + args.requests)
+
+    if operations is None:
+        operations = SCENARIOS[args.scenario]
+    operations = [op for op in operations if not (args.read_only and op[2])]
+    builders = [build for build, _, _ in operations]
+    weights = [weight for _, weight, _ in operations]
+    plan = [rng.choices(builders, weights)[0](fixture) for _ in range(args.warmup + args.requests)]
+
+    samples: Dict[str, List[Tuple[float, int, Optional[int]]]] = defaultdict(list)
+    status_codes: Dict[int, int] = defaultdict(int)
+    position = 0
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            async def worker(requests: List[Request], record: bool):
+                nonlocal position
+                while position < len(requests):
+                    name, method, url, kwargs = requests[position]
+                    position += 1
+                    start = time.perf_counter()
+                    response = await client.request(method, url, **kwargs)
+                    elapsed = time.perf_counter() - start
+                    if not record:
+                        continue
+                    match = SERVER_TIMING_QUERIES.search(response.headers.get("server-timing", ""))
+                    samples[name].append((elapsed, response.status_code, int(match.group(1)) if match else None))
+                    status_codes[response.status_code] += 1
+
+            async def run_phase(requests: List[Request], record: bool):
+                nonlocal position
+                position = 0
+                await asyncio.gather(*(worker(requests, record) for _ in range(args.concurrency)))
+
+            await run_phase(plan[:args.warmup], record=False)
+            start = time.perf_counter()
+            await run_phase(plan[args.warmup:], record=True)
+            duration = time.perf_counter() - start
+
+    all_samples = [sample for endpoint in samples.values() for sample in endpoint]
+    return {
+        "commit": git_commit(),
+        "database": app_dialect(),
+        "scenario": args.scenario,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "batch_size": args.batch_size,
+        "seed": args.seed,
+        "duration_seconds": round(duration, 3),
+        "throughput_rps": round(args.requests / duration, 2) if duration else None,
+        # 503(부하 차단) 등을 제외한 성공 응답 처리량
+        "success_rps": round(sum(
+            count for code, count in status_codes.items() if 200 <= code < 300
+        ) / duration, 2) if duration else None,
+        "status_codes": {str(code): count for code, count in sorted(status_codes.items())},
+        "overall": summarize(all_samples),
+        "endpoints": {name: summarize(endpoint) for name, endpoint in sorted(samples.items())}
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def app_dialect() -> str:
+    from app.database import engine
+    return engine.dialect.name
+
+
+def compare(report: dict, baseline: dict, fail_threshold: Optional[float]) -> bool:
+    """엔드포인트별 p95 / 쿼리 수 변화를 출력하고 회귀 여부를 반환"""
+    regressed = False
+    print(f"{'endpoint':45} {'p95 before':>11} {'p95 after':>11} {'change':>8} {'queries':>15}", file=sys.stderr)
+    rows = [("overall", baseline.get("overall"), report["overall"])]
+    rows += [(name, baseline.get("endpoints", {}).get(name), current) for name, current in report["endpoints"].items()]
+    for name, before, after in rows:
+        if not before:
+            print(f"{name:45} {'-':>11} {after['p95_ms']:>11.2f}", file=sys.stderr)
+            continue
+        change = (after["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0.0
+        queries = f"{before['queries_per_request']} -> {after['queries_per_request']}"
+        print(f"{name:45} {before['p95_ms']:>11.2f} {after['p95_ms']:>11.2f} {change:>+7.1f}% {queries:>15}", file=sys.stderr)
+        if fail_threshold is not None and change > fail_threshold:
+            regressed = True
+    return regressed
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.fail_threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
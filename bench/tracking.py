@@ -0,0 +1,115 @@
+"""운송장 상태 조회 지연시간: 캐시 hit vs miss
+
+POST /seller/get_delivery_status(단건)와 POST /seller/get_delivery_statuses(100건 일괄)를 bench.runner 로 실행한다.
+miss 는 캐시 TTL 을 0 으로 두어 매 조회가 DB 로 가게 하고, hit 는 warmup 동안 캐시를 채운 같은 번호들을 조회한다.
+HTTP 를 거치지 않은 lookup_delivery_statuses 호출 자체의 지연시간도 함께 측정한다.
+
+    python -m bench.tracking --url sqlite:////tmp/bench.db --requests 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from bench import runner
+
+# 반복 조회하는 운송장 번호 수 (일괄 조회 한도와 같음)
+HOT_SET_SIZE = 100
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure tracking lookup latency for cache hits and misses")
+    parser.add_argument("--url", default=os.getenv("SQLALCHEMY_DATABASE_URL"), help="database seeded by bench.datagen")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per run")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--calls", type=int, default=5000, help="direct lookup_delivery_statuses calls per case")
+    args = parser.parse_args(argv)
+    if not args.url:
+        parser.error("--url or SQLALCHEMY_DATABASE_URL is required")
+    return args
+
+
+def single_lookup(f: runner.Fixture) -> runner.Request:
+    return "POST /seller/get_delivery_status", "POST", "/seller/get_delivery_status", {
+        "json": {"tracking_number": f.rng.choice(f.tracking_numbers[:HOT_SET_SIZE])}
+    }
+
+
+def batch_lookup(f: runner.Fixture) -> runner.Request:
+    return "POST /seller/get_delivery_statuses", "POST", "/seller/get_delivery_statuses", {
+        "json": {"tracking_numbers": f.tracking_numbers[:HOT_SET_SIZE]}
+    }
+
+
+def measure_http(args, cache_ttl: float) -> dict:
+    from app.tracking import tracking_status_cache
+
+    tracking_status_cache.clear()
+    tracking_status_cache.ttl = cache_ttl
+    run_args = runner.parse_args([
+        "--url", args.url, "--requests", str(args.requests), "--concurrency", str(args.concurrency), "--warmup", "200"
+    ])
+    report = asyncio.run(runner.run(run_args, [(single_lookup, 1, False), (batch_lookup, 1, False)]))
+    return {
+        name: {key: endpoint[key] for key in ("p50_ms", "p95_ms", "p99_ms", "queries_per_request")}
+        for name, endpoint in report["endpoints"].items()
+    }
+
+
+def measure_direct(args, tracking_numbers, cache_ttl: float) -> dict:
+    from app.database import SessionLocal
+    from app.tracking import lookup_delivery_statuses, tracking_status_cache
+
+    tracking_status_cache.clear()
+    tracking_status_cache.ttl = cache_ttl
+    results = {}
+    db = SessionLocal()
+    try:
+        for name, size in (("single", 1), ("batch_100", HOT_SET_SIZE)):
+            lookup_delivery_statuses(db, tracking_numbers[:size])  # hit 측정용 캐시 채우기
+            latencies = []
+            for index in range(args.calls):
+                numbers = tracking_numbers[index % HOT_SET_SIZE:][:1] if size == 1 else tracking_numbers[:size]
+                start = time.perf_counter()
+                lookup_delivery_statuses(db, numbers)
+                latencies.append((time.perf_counter() - start) * 1_000_000)
+            results[name] = {
+                "p50_us": round(runner.percentile(latencies, 50), 1),
+                "p99_us": round(runner.percentile(latencies, 99), 1)
+            }
+    finally:
+        db.close()
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ["SQLALCHEMY_DATABASE_URL"] = args.url
+    from app.database import SessionLocal
+    from app.models.models import DeliveryInfo
+
+    db = SessionLocal()
+    try:
+        tracking_numbers = [
+            row.tracking_number
+            for row in db.query(DeliveryInfo.tracking_number)
+            .filter(DeliveryInfo.tracking_number.isnot(None))
+            .limit(HOT_SET_SIZE)
+        ]
+    finally:
+        db.close()
+
+    # miss: TTL 0 이면 저장 즉시 만료되어 매 조회가 DB 로 감
+    report = {
+        "http": {"miss": measure_http(args, cache_ttl=0), "hit": measure_http(args, cache_ttl=3600)},
+        "direct": {
+            "miss": measure_direct(args, tracking_numbers, cache_ttl=0),
+            "hit": measure_direct(args, tracking_numbers, cache_ttl=3600)
+        }
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import itertools
+import os
+import tempfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+# app 모듈은 import 시점에 접속 URL 을 읽으므로 테스트 전용 SQLite 파일을 먼저 지정
+_db_dir = tempfile.mkdtemp(prefix="delivery-tests-")
+os.environ["SQLALCHEMY_DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", f"sqlite:///{_db_dir}/test.db")
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.delivery_view import add_delivery_view_rows  # noqa: E402
+from app.models.models import Address, DeliveryInfo, Order, Product, User  # noqa: E402
+
+_sequence = itertools.count(1)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def client(schema):
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def create_user(db, role: str, city: str = "Seoul") -> User:
+    index = next(_sequence)
+    address = Address(city=city, town=f"Town{index}", village=f"Village{index}")
+    db.add(address)
+    db.flush()
+    user = User(
+        name=f"{role.lower()} {index}",
+        phone_number=f"010{index:08d}",
+        role=role,
+        address_id=address.address_id,
+        login_id=f"{role.lower()}{index}",
+        password="unused"
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+@pytest.fixture
+def make_user(db):
+    def factory(role: str, city: str = "Seoul") -> User:
+        return create_user(db, role, city)
+
+    return factory
+
+
+@pytest.fixture
+def make_delivery(db):
+    """주문 1건과 배송 정보를 만들고 delivery_id 를 반환하는 팩토리"""
+
+    def factory(delivery_status: str = "Received", version: int = 1, **values) -> int:
+        customer = create_user(db, "CUSTOMER")
+        seller = create_user(db, "SELLER")
+        product = Product(user_id=seller.user_id, name="product", description="description", price=1000)
+        db.add(product)
+        db.flush()
+        order = Order(customer_id=customer.user_id, product_id=product.product_id, address_id=customer.address_id)
+        db.add(order)
+        db.flush()
+        delivery = DeliveryInfo(
+            order_id=order.order_id,
+            delivery_status=delivery_status,
+            delivery_address=customer.address_id,
+            version=version,
+            **values
+        )
+        db.add(delivery)
+        db.flush()
+        add_delivery_view_rows(db, [order.order_id])
+        db.commit()
+        return delivery.delivery_id
+
+    return factory
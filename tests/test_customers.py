@@ -0,0 +1,66 @@
+import re
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.models import Order, Product
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def _query_count(response) -> int:
+    return int(SERVER_TIMING_QUERIES.search(response.headers["server-timing"]).group(1))
+
+
+@pytest.fixture
+def customer_with_orders(db, make_user):
+    def factory(order_count: int):
+        customer = make_user("CUSTOMER")
+        seller = make_user("SELLER")
+        products = [
+            Product(user_id=seller.user_id, name=f"product {index}", description="description", price=100 * index)
+            for index in range(1, 6)
+        ]
+        db.add_all(products)
+        db.flush()
+        db.execute(insert(Order).values([
+            {
+                "customer_id": customer.user_id,
+                "product_id": products[index % len(products)].product_id,
+                "address_id": customer.address_id
+            }
+            for index in range(order_count)
+        ]))
+        db.commit()
+        return {"name": customer.name, "phone_number": customer.phone_number}
+
+    return factory
+
+
+def test_bought_list_query_count_is_constant_as_history_grows(client, customer_with_orders):
+    counts = {}
+    for order_count in (1, 10, 150):
+        response = client.post("/customers/bought_list", json=customer_with_orders(order_count))
+        assert response.status_code == 200
+        assert len(response.json()["orders"]) == min(order_count, 50)
+        counts[order_count] = _query_count(response)
+
+    # 사용자 조회 1회 + 주문 ⋈ 상품 ⋈ 주소 1회 (주문 수와 무관)
+    assert set(counts.values()) == {2}, counts
+
+
+def test_bought_list_pages_with_the_same_query_count(client, customer_with_orders):
+    customer = customer_with_orders(120)
+
+    order_ids, after_order_id, counts = [], None, []
+    while True:
+        response = client.post("/customers/bought_list", json={**customer, "after_order_id": after_order_id})
+        body = response.json()
+        order_ids += [order["order_id"] for order in body["orders"]]
+        counts.append(_query_count(response))
+        after_order_id = body["next_after_order_id"]
+        if after_order_id is None:
+            break
+
+    assert len(order_ids) == 120 and order_ids == sorted(set(order_ids))
+    assert set(counts) == {2}
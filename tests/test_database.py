@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app import database
+from app.database import SessionLocal, ThreadedSession
+
+
+def test_threaded_sessions_wait_for_a_slot_on_the_event_loop(monkeypatch):
+    monkeypatch.setattr(database, "DB_THREADPOOL_SLOTS", 2)
+
+    async def scenario():
+        first, second, third = (ThreadedSession(SessionLocal()) for _ in range(3))
+        await first.execute(text("SELECT 1"))
+        await second.execute(text("SELECT 1"))
+
+        # 슬롯 2개가 모두 점유되어 세 번째 세션은 스레드를 잡지 않고 루프에서 대기
+        waiting = asyncio.ensure_future(third.execute(text("SELECT 1")))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+
+        await first.close()
+        assert (await asyncio.wait_for(waiting, 5)).scalar() == 1
+        await second.close()
+        await third.close()
+
+        # 모든 슬롯이 반환되어 새 세션 2개가 바로 실행됨
+        again = [ThreadedSession(SessionLocal()) for _ in range(2)]
+        for session in again:
+            assert (await asyncio.wait_for(session.execute(text("SELECT 1")), 5)).scalar() == 1
+        for session in again:
+            await session.close()
+
+    asyncio.run(scenario())
+
+
+def test_threaded_session_releases_slot_after_failed_statement(monkeypatch):
+    monkeypatch.setattr(database, "DB_THREADPOOL_SLOTS", 1)
+
+    async def scenario():
+        session = ThreadedSession(SessionLocal())
+        with pytest.raises(Exception):
+            await session.execute(text("SELECT * FROM no_such_table"))
+        await session.close()
+
+        # 슬롯이 반환되었으므로 다음 세션이 바로 실행됨
+        other = ThreadedSession(SessionLocal())
+        assert (await asyncio.wait_for(other.execute(text("SELECT 1")), 5)).scalar() == 1
+        await other.close()
+
+    asyncio.run(scenario())
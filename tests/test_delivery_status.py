@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.database import SessionLocal
+from app.delivery_status import (
+    DELIVERED, PROCESSING, RECEIVED, SHIPPED, commit_transitions, transition_deliveries, transition_delivery
+)
+from app.models.models import DeliveryInfo, DeliveryView
+
+THREADS = 8
+
+
+def _race(delivery_id: int, from_status: str, to_status: str, **kwargs):
+    # 모든 스레드가 동시에 같은 배송을 전이 시도
+    barrier = threading.Barrier(THREADS)
+    results = []
+    lock = threading.Lock()
+
+    def attempt():
+        db = SessionLocal()
+        try:
+            barrier.wait()
+            try:
+                version = transition_delivery(db, delivery_id, from_status, to_status, **kwargs)
+                commit_transitions(db)
+                result = ("ok", version)
+            except HTTPException as e:
+                db.rollback()
+                result = ("error", e.status_code)
+        finally:
+            db.close()
+        with lock:
+            results.append(result)
+
+    threads = [threading.Thread(target=attempt) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_transition_has_single_winner(db, make_delivery):
+    delivery_id = make_delivery(SHIPPED, version=3)
+
+    results = _race(delivery_id, SHIPPED, DELIVERED)
+
+    assert [result for result in results if result[0] == "ok"] == [("ok", 4)]
+    assert results.count(("error", 409)) == THREADS - 1
+
+    delivery = db.get(DeliveryInfo, delivery_id)
+    assert (delivery.delivery_status, delivery.version) == (DELIVERED, 4)
+    view = db.get(DeliveryView, delivery_id)
+    assert (view.delivery_status, view.version) == (DELIVERED, 4)
+
+
+def test_concurrent_transition_with_expected_version(db, make_delivery):
+    delivery_id = make_delivery(SHIPPED, version=3)
+
+    results = _race(delivery_id, SHIPPED, DELIVERED, expected_version=3)
+
+    assert sum(1 for result in results if result[0] == "ok") == 1
+    assert results.count(("error", 409)) == THREADS - 1
+    assert db.get(DeliveryInfo, delivery_id).version == 4
+
+
+def test_stale_expected_version_conflicts(db, make_delivery):
+    delivery_id = make_delivery(SHIPPED, version=3)
+
+    with pytest.raises(HTTPException) as excinfo:
+        transition_delivery(db, delivery_id, SHIPPED, DELIVERED, expected_version=2)
+    db.rollback()
+
+    assert excinfo.value.status_code == 409
+    assert db.get(DeliveryInfo, delivery_id).version == 3
+
+
+@pytest.mark.parametrize("from_status, to_status", [
+    (DELIVERED, SHIPPED),
+    (SHIPPED, PROCESSING),
+    (RECEIVED, SHIPPED),
+    (RECEIVED, DELIVERED),
+    (DELIVERED, DELIVERED),
+])
+def test_invalid_transition_is_rejected(db, make_delivery, from_status, to_status):
+    delivery_id = make_delivery(from_status)
+
+    with pytest.raises(ValueError):
+        transition_delivery(db, delivery_id, from_status, to_status)
+    with pytest.raises(ValueError):
+        transition_deliveries(db, [delivery_id], from_status, to_status)
+
+    delivery = db.get(DeliveryInfo, delivery_id)
+    assert (delivery.delivery_status, delivery.version) == (from_status, 1)
+
+
+def test_transition_deliveries_skips_rows_in_other_states(db, make_delivery):
+    processing = [make_delivery(PROCESSING) for _ in range(3)]
+    received = make_delivery(RECEIVED)
+
+    changed = transition_deliveries(db, processing + [received], PROCESSING, SHIPPED)
+    commit_transitions(db)
+
+    assert sorted(changed) == sorted(processing)
+    assert db.get(DeliveryInfo, received).delivery_status == RECEIVED
+    for delivery_id in processing:
+        assert db.get(DeliveryView, delivery_id).delivery_status == SHIPPED
@@ -0,0 +1,91 @@
+from sqlalchemy import update
+
+from app.auth.auth import create_access_token
+from app.delivery_view import check_delivery_view, rebuild_delivery_view
+from app.models.models import DeliveryInfo, DeliveryView, Product
+
+
+def _headers(user) -> dict:
+    claims = {"user_id": user.user_id, "role": user.role, "address_id": user.address_id}
+    return {"Authorization": f"Bearer {create_access_token(claims)}"}
+
+
+def test_view_stays_consistent_through_every_write_path(client, db, make_user):
+    customer = make_user("CUSTOMER")
+    seller = make_user("SELLER")
+    logistic = make_user("LOGISTIC")
+    drivers = [make_user("DRIVER") for _ in range(2)]
+    products = [Product(user_id=seller.user_id, name=f"view {index}", description="description", price=1000) for index in range(2)]
+    db.add_all(products)
+    db.commit()
+
+    # 1. 주문 생성 (buy / buy_batch)
+    response = client.post("/customers/buy", params={"product_id": products[0].product_id}, headers=_headers(customer))
+    assert response.status_code == 200
+    order_ids = [response.json()["order_id"]]
+    response = client.post("/customers/buy_batch", headers=_headers(customer), json={
+        "items": [{"product_id": products[0].product_id}, {"product_id": products[1].product_id, "quantity": 2}]
+    })
+    assert response.status_code == 200
+    order_ids += response.json()["order_ids"]
+
+    # 2. Received -> Processing
+    for order_id in order_ids:
+        response = client.post(
+            "/seller/select_logistic",
+            json={"order_id": order_id, "logistic_id": logistic.user_id},
+            headers=_headers(seller)
+        )
+        assert response.status_code == 200
+
+    delivery_ids = sorted(
+        row.delivery_id for row in db.query(DeliveryInfo.delivery_id).filter(DeliveryInfo.order_id.in_(order_ids))
+    )
+
+    # 3. Processing -> Shipped (단건 / 일괄 배정)
+    response = client.post(
+        "/logistic/assign_driver",
+        json={"delivery_id": delivery_ids[0], "driver_id": drivers[0].user_id},
+        headers=_headers(logistic)
+    )
+    assert response.status_code == 200
+    response = client.post("/logistic/assign_drivers", headers=_headers(logistic), json={
+        "assignments": [
+            {"delivery_id": delivery_id, "driver_id": drivers[1].user_id} for delivery_id in delivery_ids[1:]
+        ]
+    })
+    assert response.status_code == 200
+
+    # 4. Shipped -> Delivered
+    response = client.post("/driver/mark_delivered", json={"delivery_id": delivery_ids[0]}, headers=_headers(drivers[0]))
+    assert response.status_code == 200
+
+    db.expire_all()
+    statuses = dict(
+        db.query(DeliveryView.delivery_id, DeliveryView.delivery_status).filter(DeliveryView.delivery_id.in_(delivery_ids))
+    )
+    assert statuses == {delivery_ids[0]: "Delivered", **{delivery_id: "Shipped" for delivery_id in delivery_ids[1:]}}
+    result = check_delivery_view(db)
+    assert result["consistent"], result
+
+
+def test_rebuild_repairs_corrupted_row(db, make_delivery):
+    delivery_id = make_delivery("Shipped", 3)
+    db.execute(
+        update(DeliveryView)
+        .where(DeliveryView.delivery_id == delivery_id)
+        .values(delivery_status="Received", customer_name="stale")
+    )
+    db.commit()
+
+    result = check_delivery_view(db)
+    assert not result["consistent"]
+    assert result["mismatched"] == {"count": 1, "delivery_ids": [delivery_id]}
+
+    rebuild_delivery_view(db)
+    db.commit()
+
+    row = db.query(DeliveryView).filter(DeliveryView.delivery_id == delivery_id).one()
+    assert row.delivery_status == "Shipped"
+    assert row.customer_name != "stale"
+    assert check_delivery_view(db)["consistent"]
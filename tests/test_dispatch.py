@@ -0,0 +1,68 @@
+from collections import Counter
+
+from app.dispatch import plan_dispatch
+from bench.dispatch import build_inputs
+
+
+def test_assigns_only_within_same_city():
+    deliveries = [(1, "Seoul"), (2, "Busan"), (3, "Seoul"), (4, "Incheon")]
+    drivers = [(10, "Seoul"), (20, "Busan")]
+
+    assignments, unassigned = plan_dispatch(deliveries, drivers, {})
+
+    assert assignments == {1: 10, 2: 20, 3: 10}
+    assert unassigned == [4]
+
+
+def test_picks_least_loaded_driver():
+    deliveries = [(1, "Seoul"), (2, "Seoul"), (3, "Seoul")]
+    drivers = [(10, "Seoul"), (11, "Seoul"), (12, "Busan")]
+    loads = {10: 5, 11: 3, 12: 0}
+
+    assignments, unassigned = plan_dispatch(deliveries, drivers, loads)
+
+    # 11(3건) -> 11(4건) -> 10 과 11 이 5건으로 같으면 driver_id 가 작은 10
+    assert assignments == {1: 11, 2: 11, 3: 10}
+    assert unassigned == []
+
+
+def test_spreads_load_evenly():
+    deliveries = [(delivery_id, "Seoul") for delivery_id in range(1, 31)]
+    drivers = [(10, "Seoul"), (11, "Seoul"), (12, "Seoul")]
+
+    assignments, _ = plan_dispatch(deliveries, drivers, {})
+
+    assert sorted(Counter(assignments.values()).values()) == [10, 10, 10]
+
+
+def test_max_load_caps_assignments():
+    deliveries = [(delivery_id, "Seoul") for delivery_id in range(1, 8)]
+    drivers = [(10, "Seoul"), (11, "Seoul")]
+    loads = {10: 1, 11: 2}
+
+    assignments, unassigned = plan_dispatch(deliveries, drivers, loads, max_load=3)
+
+    per_driver = Counter(assignments.values())
+    assert loads[10] + per_driver[10] == 3
+    assert loads[11] + per_driver[11] == 3
+    assert unassigned == [4, 5, 6, 7]
+
+
+def test_driver_already_at_max_load_gets_nothing():
+    assignments, unassigned = plan_dispatch([(1, "Seoul")], [(10, "Seoul")], {10: 4}, max_load=4)
+
+    assert assignments == {}
+    assert unassigned == [1]
+
+
+def test_large_plan_respects_cap_and_city():
+    deliveries, drivers, loads = build_inputs(50_000, 1_000, 20, seed=1)
+    driver_city = dict(drivers)
+    delivery_city = dict(deliveries)
+
+    assignments, unassigned = plan_dispatch(deliveries, drivers, loads, max_load=40)
+
+    assert len(assignments) + len(unassigned) == len(deliveries)
+    assert all(driver_city[driver_id] == delivery_city[delivery_id] for delivery_id, driver_id in assignments.items())
+    per_driver = Counter(assignments.values())
+    assert all(loads[driver_id] + count <= 40 for driver_id, count in per_driver.items())
@@ -0,0 +1,55 @@
+import pytest
+
+from app.auth.auth import create_access_token
+from app.pagination import encode_cursor
+
+
+@pytest.fixture
+def driver_deliveries(make_user, make_delivery):
+    driver = make_user("DRIVER")
+    delivery_ids = [make_delivery("Shipped", 3, driver_id=driver.user_id) for _ in range(5)]
+    headers = {"Authorization": f"Bearer {create_access_token({'user_id': driver.user_id, 'role': 'DRIVER'})}"}
+    return headers, delivery_ids
+
+
+@pytest.mark.parametrize("sort_by", ["delivery_id", "customer_name", "detailed_address"])
+def test_deliveries_pages_through_every_delivery_once(client, driver_deliveries, sort_by):
+    headers, delivery_ids = driver_deliveries
+
+    seen, cursor = [], None
+    while True:
+        params = {"sort_by": sort_by, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/driver/deliveries", params=params, headers=headers)
+        assert response.status_code == 200
+        body = response.json()
+        seen += [delivery["delivery_id"] for delivery in body["deliveries"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == delivery_ids
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.parametrize("sort_by, cursor", [
+    ("delivery_id", "not-a-cursor"),
+    ("delivery_id", encode_cursor(["1"])),
+    ("delivery_id", encode_cursor([True])),
+    ("delivery_id", encode_cursor([None])),
+    ("delivery_id", encode_cursor(["customer 1", 1])),
+    ("customer_name", encode_cursor([1])),
+    ("customer_name", encode_cursor([1, "customer 1"])),
+    ("customer_name", encode_cursor([{"name": "x"}, 1])),
+    ("detailed_address", encode_cursor(["Seoul", "Town1", "Village1"])),
+    ("detailed_address", encode_cursor(["Seoul", "Town1", 1, 1])),
+    ("detailed_address", encode_cursor(["Seoul", "Town1", "Village1", 1.5])),
+])
+def test_deliveries_rejects_malformed_cursor(client, driver_deliveries, sort_by, cursor):
+    headers, _ = driver_deliveries
+
+    response = client.get("/driver/deliveries", params={"sort_by": sort_by, "cursor": cursor}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
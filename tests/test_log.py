@@ -0,0 +1,71 @@
+import logging
+import queue
+
+import pytest
+
+from app.log import LOG_RECORDS_DROPPED, NonBlockingQueueHandler, _request_context
+
+
+@pytest.fixture
+def queue_logger():
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("app.test_log")
+    logger.handlers = [NonBlockingQueueHandler(log_queue, maxsize=2)]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger, log_queue
+    logger.handlers = []
+
+
+def _drain(log_queue):
+    records = []
+    while not log_queue.empty():
+        records.append(log_queue.get_nowait())
+    return records
+
+
+def _dropped():
+    return sum(LOG_RECORDS_DROPPED._values.values())
+
+
+def test_info_is_dropped_when_queue_is_full(queue_logger):
+    logger, log_queue = queue_logger
+    dropped = _dropped()
+
+    for index in range(5):
+        logger.info("request %d", index)
+
+    assert [record.msg for record in _drain(log_queue)] == ["request 0", "request 1"]
+    assert _dropped() - dropped == 3
+
+
+def test_warning_and_error_bypass_the_limit(queue_logger):
+    logger, log_queue = queue_logger
+    for index in range(2):
+        logger.info("request %d", index)
+    dropped = _dropped()
+
+    logger.warning("slow request")
+    logger.error("server error")
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.exception("failed")
+
+    records = _drain(log_queue)
+    assert [record.levelname for record in records[2:]] == ["WARNING", "ERROR", "ERROR"]
+    assert _dropped() == dropped
+    # traceback 은 요청 스레드에서 문자열로 확정
+    assert records[-1].exc_info is None and "RuntimeError: boom" in records[-1].exc_text
+
+
+def test_request_context_is_attached(queue_logger):
+    logger, log_queue = queue_logger
+    token = _request_context.set({"request_id": "abc", "method": "GET", "path": "/"})
+    try:
+        logger.info("inside request")
+    finally:
+        _request_context.reset(token)
+
+    record = _drain(log_queue)[0]
+    assert record.request_context["request_id"] == "abc"
@@ -0,0 +1,129 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import outbox
+from app.models.models import OutboxEvent
+from app.outbox import DONE, FAILED, PENDING, OutboxWorker, drain_outbox, enqueue_events, outbox_handler, prune_outbox
+
+handled = []
+
+
+@outbox_handler("test_ok")
+def _handle_ok(db, payload):
+    handled.append(payload["n"])
+
+
+@outbox_handler("test_fail")
+def _handle_fail(db, payload):
+    raise RuntimeError("boom")
+
+
+def _enqueue(db, event_type, count=1):
+    keys = [f"{event_type}:{uuid.uuid4().hex}" for _ in range(count)]
+    enqueue_events(db, event_type, [(key, {"n": index}) for index, key in enumerate(keys)])
+    db.commit()
+    return keys
+
+
+def _events(db, keys):
+    db.expire_all()
+    return db.query(OutboxEvent).filter(OutboxEvent.idempotency_key.in_(keys)).order_by(OutboxEvent.id).all()
+
+
+def test_drain_marks_events_done(db):
+    keys = _enqueue(db, "test_ok", count=3)
+    handled.clear()
+
+    drain_outbox()
+
+    events = _events(db, keys)
+    assert [event.status for event in events] == [DONE] * 3
+    assert all(event.processed_at >= event.created_at for event in events)
+    assert handled == [0, 1, 2]
+
+
+def test_duplicate_idempotency_key_is_rejected(db):
+    key = _enqueue(db, "test_ok")[0]
+
+    with pytest.raises(IntegrityError):
+        enqueue_events(db, "test_ok", [(key, {"n": 0})])
+        db.commit()
+    db.rollback()
+
+    assert len(_events(db, [key])) == 1
+
+
+def test_failed_event_is_retried_with_backoff_then_marked_failed(db, monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_ATTEMPTS", 2)
+    key = _enqueue(db, "test_fail")[0]
+
+    drain_outbox()
+    event = _events(db, [key])[0]
+    assert (event.status, event.attempts) == (PENDING, 1)
+    assert event.available_at > datetime.utcnow()
+    assert "boom" in event.last_error
+
+    # backoff 가 끝난 것으로 만들고 다시 처리
+    event.available_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    drain_outbox()
+
+    event = _events(db, [key])[0]
+    assert (event.status, event.attempts) == (FAILED, 2)
+
+
+def test_prune_deletes_only_expired_done_events(db):
+    now = datetime.utcnow()
+    old = now - timedelta(hours=48)
+
+    def add(status, processed_at):
+        key = f"prune:{uuid.uuid4().hex}"
+        db.add(OutboxEvent(
+            event_type="test_ok", payload={}, idempotency_key=key, status=status,
+            created_at=old, available_at=old, processed_at=processed_at
+        ))
+        return key
+
+    expired = [add(DONE, old) for _ in range(5)]
+    kept = [add(DONE, now - timedelta(hours=1)), add(FAILED, old), add(PENDING, None)]
+    db.commit()
+
+    # 여러 배치로 나눠 삭제되는지 확인
+    assert prune_outbox(retention_hours=24, batch_size=2) == 5
+
+    assert _events(db, expired) == []
+    assert len(_events(db, kept)) == 3
+
+
+def test_worker_handles_notified_event_before_poll_interval(db):
+    poll_interval = 30.0
+
+    async def scenario():
+        worker = OutboxWorker(poll_interval=poll_interval, prune_interval=3600)
+        worker.start()
+        try:
+            # 시작 직후의 첫 조회가 끝나 대기 상태가 될 때까지 기다림
+            await asyncio.sleep(0.2)
+            keys = _enqueue(db, "test_ok")
+            start = time.perf_counter()
+            worker.notify()
+            while time.perf_counter() - start < 5:
+                if _events(db, keys)[0].status == DONE:
+                    return keys, time.perf_counter() - start
+                await asyncio.sleep(0.01)
+            pytest.fail("notified outbox event was not handled")
+        finally:
+            await worker.stop()
+
+    keys, elapsed = asyncio.run(scenario())
+
+    event = _events(db, keys)[0]
+    lag = (event.processed_at - event.created_at).total_seconds()
+    # notify 로 깨웠으므로 poll_interval 을 기다리지 않고 처리
+    assert elapsed < poll_interval
+    assert 0 <= lag < 5
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database import engine
+from app.query_stats import RequestQueryStats, _current_stats, fingerprint
+
+
+@pytest.fixture
+def stats():
+    stats = RequestQueryStats()
+    token = _current_stats.set(stats)
+    yield stats
+    _current_stats.reset(token)
+
+
+def test_failed_statement_does_not_leak_start_time(stats):
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM missing_table"))
+        connection.rollback()
+        time.sleep(0.2)
+        connection.execute(text("SELECT 1"))
+
+        # 풀에 반환되어 재사용되는 커넥션에 실패한 문장의 시작 시각이 남지 않아야 함
+        assert not connection.info.get("query_stats_start")
+
+    # 실패한 문장의 시작 시각과 짝지어지면 대기 시간(0.2초)이 DB 시간으로 잡힘
+    assert stats.count == 1
+    assert stats.db_seconds < 0.1
+
+
+def test_counts_statements_per_template(stats):
+    with engine.connect() as connection:
+        for value in range(3):
+            connection.execute(text("SELECT :value"), {"value": value})
+
+    assert stats.count == 3
+    assert list(stats.statements.values()) == [3]
+
+
+def test_fingerprint_ignores_parameter_counts_and_literals():
+    assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?)") == fingerprint("SELECT * FROM t WHERE id IN (?)")
+    assert fingerprint("INSERT INTO t VALUES (?, ?), (?, ?)") == fingerprint("INSERT INTO t VALUES (?, ?)")
+    assert fingerprint("SELECT * FROM t LIMIT 10") == fingerprint("SELECT *  FROM t\nLIMIT 20")
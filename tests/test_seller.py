@@ -0,0 +1,82 @@
+import pytest
+
+from app.auth.auth import create_access_token
+from app.models.models import DeliveryInfo, DeliveryView, Order
+
+
+def _headers(user_id: int, role: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'user_id': user_id, 'role': role})}"}
+
+
+@pytest.fixture
+def received_order(db, make_delivery):
+    delivery_id = make_delivery("Received")
+    view = db.query(DeliveryView.order_id, DeliveryView.seller_id).filter(DeliveryView.delivery_id == delivery_id).one()
+    return view.order_id, view.seller_id
+
+
+def test_select_logistic_assigns_requested_logistic(client, db, make_user, received_order):
+    order_id, seller_id = received_order
+    logistic = make_user("LOGISTIC")
+    db.commit()
+
+    response = client.post(
+        "/seller/select_logistic",
+        json={"order_id": order_id, "logistic_id": logistic.user_id},
+        headers=_headers(seller_id, "SELLER")
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["logistic_id"] == logistic.user_id
+    assert body["delivery_status"] == "Processing"
+    db.expire_all()
+    assert db.query(Order.logistic_id).filter(Order.order_id == order_id).scalar() == logistic.user_id
+    assert db.query(DeliveryInfo.logistic_id).filter(DeliveryInfo.order_id == order_id).scalar() == logistic.user_id
+
+
+def test_select_logistic_rejects_other_sellers_order(client, db, make_user, received_order):
+    order_id, _ = received_order
+    other_seller = make_user("SELLER")
+    logistic = make_user("LOGISTIC")
+    db.commit()
+
+    response = client.post(
+        "/seller/select_logistic",
+        json={"order_id": order_id, "logistic_id": logistic.user_id},
+        headers=_headers(other_seller.user_id, "SELLER")
+    )
+
+    assert response.status_code == 403
+    db.expire_all()
+    assert db.query(DeliveryInfo.delivery_status).filter(DeliveryInfo.order_id == order_id).scalar() == "Received"
+
+
+def test_select_logistic_requires_seller_role(client, db, make_user, received_order):
+    order_id, _ = received_order
+    customer = make_user("CUSTOMER")
+    logistic = make_user("LOGISTIC")
+    db.commit()
+
+    response = client.post(
+        "/seller/select_logistic",
+        json={"order_id": order_id, "logistic_id": logistic.user_id},
+        headers=_headers(customer.user_id, "CUSTOMER")
+    )
+
+    assert response.status_code == 403
+
+
+def test_select_logistic_rejects_non_logistic_user(client, db, make_user, received_order):
+    order_id, seller_id = received_order
+    driver = make_user("DRIVER")
+    db.commit()
+
+    response = client.post(
+        "/seller/select_logistic",
+        json={"order_id": order_id, "logistic_id": driver.user_id},
+        headers=_headers(seller_id, "SELLER")
+    )
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Logistic not found"
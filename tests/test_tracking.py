@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from app.database import engine
+from app.tracking import (
+    TRACKING_SERIAL_START, TrackingNumberAllocator, format_tracking_number, is_valid_tracking_number, luhn_check_digit
+)
+
+THREADS = 8
+ALLOCATORS = 4
+PER_THREAD = 500
+
+
+def test_luhn_check_digit_known_value():
+    # Luhn 알고리즘 표준 예시 (7992739871 + 3)
+    assert luhn_check_digit(7992739871) == 3
+    assert format_tracking_number(7992739871) == "79927398713"
+
+
+@pytest.mark.parametrize("serial", [TRACKING_SERIAL_START, TRACKING_SERIAL_START + 1, 1234567, 9999999, 10_000_000])
+def test_format_round_trip(serial):
+    tracking_number = format_tracking_number(serial)
+
+    assert tracking_number[:-1] == str(serial)
+    assert is_valid_tracking_number(tracking_number)
+
+
+@pytest.mark.parametrize("serial", [TRACKING_SERIAL_START, 1234567, 9999999])
+def test_single_digit_corruption_is_rejected(serial):
+    tracking_number = format_tracking_number(serial)
+
+    for position, original in enumerate(tracking_number):
+        for digit in "0123456789":
+            if digit == original:
+                continue
+            corrupted = tracking_number[:position] + digit + tracking_number[position + 1:]
+            assert not is_valid_tracking_number(corrupted), corrupted
+
+
+@pytest.mark.parametrize("value", ["", "7", "12345a7", "-10000007", " 10000007"])
+def test_malformed_tracking_number_is_rejected(value):
+    assert not is_valid_tracking_number(value)
+
+
+def test_concurrent_allocators_never_issue_duplicates():
+    # 여러 워커 프로세스를 흉내 내어 할당기 4개를 스레드 8개가 나눠 사용 (작은 블록으로 예약 경합 유도)
+    allocators = [TrackingNumberAllocator(engine, block_size=7) for _ in range(ALLOCATORS)]
+    barrier = threading.Barrier(THREADS)
+    issued = [[] for _ in range(THREADS)]
+
+    def worker(index):
+        allocator = allocators[index % ALLOCATORS]
+        barrier.wait()
+        for _ in range(PER_THREAD):
+            issued[index].append(allocator.allocate())
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    numbers = [number for numbers in issued for number in numbers]
+    assert len(numbers) == THREADS * PER_THREAD
+    assert len(set(numbers)) == len(numbers)
+    assert all(is_valid_tracking_number(number) for number in numbers)
+    assert all(int(number[:-1]) >= TRACKING_SERIAL_START for number in numbers)